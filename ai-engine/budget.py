@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Speaking-duration budget for the Director's script.
+
+Runs between director.py and video_gen.py. Every extra second of script is
+paid again in ElevenLabs characters, TTS time and WaveSpeed render time, so
+an overlong script is cut down before those stages:
+
+1. compress: ask the Director model (Cerebras) to rewrite the longest sections
+   to a target word count;
+2. trim: otherwise (no API key / SDK, or still over budget) drop trailing
+   paragraphs of the lowest-priority sections, keeping each section's opening.
+
+final_5min_script.json gets a "budget" record (before/after duration, method,
+sections changed) and tts.txt / final_5min_script.md are rewritten to match.
+
+Usage:
+    python3 budget.py --max-seconds 330
+    python3 budget.py --mode trim --structure ../research_outputs/final_5min_script.json
+"""
+
+import argparse
+import os
+import sys
+
+from dotenv import load_dotenv
+
+from script_structure import count_words, load_structure, recount, save_structure, to_markdown, tts_text
+
+load_dotenv()
+
+STRUCTURE_FILE = "research_outputs/final_5min_script.json"
+TTS_FILE = "research_outputs/tts.txt"
+MARKDOWN_FILE = "research_outputs/final_5min_script.md"
+MAX_SECONDS = float(os.environ.get("SCRIPT_MAX_SECONDS", "330"))  # 5 min target + 10% slack
+
+# Trimmed first -> last; the hook and conclusion carry the story, so they go last
+SECTION_PRIORITY = {"Main": 0, "Twist": 1, "Conclusion": 2, "Hook": 3}
+MAX_COMPRESSED_SECTIONS = 2
+
+
+def compress_sections(structure, max_seconds):
+    """Rewrite the longest sections with the Director model; returns names of sections changed."""
+    api_key = os.environ.get("CEREBRAS_API_KEY")
+    if not api_key:
+        return []
+    try:
+        from cerebras.cloud.sdk import Cerebras
+    except ImportError:
+        return []
+    from director import MODEL_ID
+
+    client = Cerebras(api_key=api_key)
+    max_words = int(max_seconds * structure["words_per_minute"] / 60)
+    excess = structure["words"] - max_words
+    longest = sorted(structure["sections"], key=lambda s: s["words"], reverse=True)[:MAX_COMPRESSED_SECTIONS]
+    longest_words = sum(s["words"] for s in longest) or 1
+
+    changed = []
+    for section in longest:
+        # Each section gives up excess words in proportion to its size
+        target = max(30, int(section["words"] - excess * section["words"] / longest_words))
+        original = "\n\n".join(p["text"] for p in section["paragraphs"])
+        prompt = (
+            f"Shorten this '{section['name']}' section of a Veritasium-style narration to about {target} words. "
+            "Keep the key facts, the voice and the paragraph breaks. Return only the narration text, "
+            "no headings or commentary.\n\n" + original
+        )
+        print(f"✂️ Compressing {section['name']}: {section['words']} → ~{target} words")
+        try:
+            response = client.chat.completions.create(
+                model=MODEL_ID,
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=max(256, target * 3),
+                temperature=0.3,
+            )
+            text = response.choices[0].message.content or ""
+        except Exception as e:
+            print(f"⚠️ Compression of {section['name']} failed: {e}")
+            continue
+        paragraphs = [" ".join(p.split()) for p in text.split("\n\n") if p.strip()]
+        if paragraphs and count_words(" ".join(paragraphs)) < section["words"]:
+            section["paragraphs"] = [{"text": p} for p in paragraphs]
+            changed.append(section["name"])
+    recount(structure)
+    return changed
+
+
+def trim_by_priority(structure, max_seconds):
+    """Drop trailing paragraphs of low-priority sections until within budget; returns sections changed."""
+    changed = []
+    order = sorted(structure["sections"], key=lambda s: (SECTION_PRIORITY.get(s["name"], 0), -s["words"]))
+    for section in order:
+        while structure["seconds"] > max_seconds and len(section["paragraphs"]) > 1:
+            section["paragraphs"].pop()
+            recount(structure)
+            if section["name"] not in changed:
+                changed.append(section["name"])
+        if structure["seconds"] <= max_seconds:
+            break
+    return changed
+
+
+def enforce_budget(structure, max_seconds=MAX_SECONDS, mode="auto"):
+    """Bring `structure` within `max_seconds`; returns the budget record (structure is edited in place)."""
+    before = structure["seconds"]
+    record = {"max_seconds": max_seconds, "before_seconds": before, "before_words": structure["words"],
+              "method": "none", "sections_changed": []}
+    if before > max_seconds:
+        methods = []
+        if mode in ("auto", "compress"):
+            changed = compress_sections(structure, max_seconds)
+            if changed:
+                methods.append("compress")
+                record["sections_changed"] += changed
+        if structure["seconds"] > max_seconds and mode in ("auto", "trim"):
+            changed = trim_by_priority(structure, max_seconds)
+            if changed:
+                methods.append("trim")
+                record["sections_changed"] += [s for s in changed if s not in record["sections_changed"]]
+        record["method"] = "+".join(methods) or "none"
+    record["after_seconds"] = structure["seconds"]
+    record["after_words"] = structure["words"]
+    record["within_budget"] = structure["seconds"] <= max_seconds
+    structure["budget"] = record
+    return record
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Enforce a speaking-duration budget on the final script")
+    parser.add_argument("--structure", default=STRUCTURE_FILE, help="Structured script JSON from director.py")
+    parser.add_argument("--tts", default=TTS_FILE, help="TTS text file to rewrite")
+    parser.add_argument("--markdown", default=MARKDOWN_FILE, help="Markdown script to rewrite")
+    parser.add_argument("--max-seconds", type=float, default=MAX_SECONDS, help="Maximum estimated speaking time")
+    parser.add_argument("--mode", choices=["auto", "compress", "trim"], default="auto",
+                        help="auto: compress with the Director model, then trim if still over")
+    args = parser.parse_args()
+
+    try:
+        structure = load_structure(args.structure)
+    except (OSError, ValueError) as e:
+        print(f"❌ Could not read {args.structure}: {e}")
+        return 1
+
+    record = enforce_budget(structure, args.max_seconds, args.mode)
+    save_structure(structure, args.structure)
+    if record["method"] != "none":
+        with open(args.tts, "w", encoding="utf-8") as f:
+            f.write(tts_text(structure))
+        with open(args.markdown, "w", encoding="utf-8") as f:
+            f.write(to_markdown(structure))
+
+    status = "✅" if record["within_budget"] else "⚠️"
+    print(f"{status} Speaking time: {record['before_seconds']:.0f}s → {record['after_seconds']:.0f}s "
+          f"(max {record['max_seconds']:.0f}s, method: {record['method']})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -18,11 +18,17 @@ except ImportError:
     print(" Please run: pip install cerebras_cloud_sdk")
     exit(1)
 
+from research_context import load_research_context, pack_research_context
+from script_structure import parse_script, save_structure, tts_text
+from sentence_stream import SentenceSegmenter
+
 # Configuration
 MODEL_ID = "llama3.1-8b"
 KESTRA_OUTPUT = "research_outputs/kestra_output.json"  # Path from project root
 FINETUNED_SCRIPT = "research_outputs/finetuned_script.txt"  # Path from project root
 OUTPUT_SCRIPT = "research_outputs/final_5min_script.md"
+OUTPUT_STRUCTURE = "research_outputs/final_5min_script.json"  # sections/paragraphs/durations
+VIDEO_OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "video_output")
 
 def load_kestra_data(filepath):
     """Load and parse Kestra research data"""
@@ -65,10 +71,13 @@ def load_finetuned_script(filepath):
         print(" Please run generate_draft.py from the fine_tuned_model directory first.")
         raise
 
-def merge_with_director_agent(kestra_data, finetuned_script):
+def merge_with_director_agent(kestra_data, finetuned_script, research_context=None, on_token=None):
     """
     Use Cerebras API (Director Agent) to merge research and script
     Creates a cohesive 5-minute Veritasium-style video script
+
+    research_context: pre-packed context (see research_context.py); packed from kestra_data if omitted
+    on_token: if given, the completion is streamed and every text delta is passed to it as it arrives
     """
     print("\n🎬 Activating Director Agent (Cerebras AI)...")
   
@@ -82,15 +91,18 @@ def merge_with_director_agent(kestra_data, finetuned_script):
   
     client = Cerebras(api_key=api_key)
   
-    # Format the research data for the prompt
-    kestra_summary = json.dumps(kestra_data, indent=2)
+    # Format the research data for the prompt (compact: facts, posts and papers only)
+    if research_context is None:
+        research_context = pack_research_context(kestra_data)
+    kestra_summary = json.dumps(research_context, indent=2, ensure_ascii=False)
   
     # Create the director prompt (FIXED: Escaped braces, complete f-string)
     director_prompt = f"""You are a Director Agent for creating Veritasium-style educational video scripts.Your task: Merge research data from a multi-agent system (Kestra) with a draft script from a fine-tuned Llama model to create a polished, engaging 5-minute video script.
 
     **RESEARCH DATA (from Kestra Multi-Agent System):**
     ```json
-    {{kestra_summary}}
+    {kestra_summary}
+    ```
     DRAFT SCRIPT (from Fine-Tuned Veritasium Model):
     {finetuned_script}
 
@@ -125,8 +137,18 @@ def merge_with_director_agent(kestra_data, finetuned_script):
             max_tokens=2500,
             temperature=0.7,
             top_p=0.9,
+            stream=on_token is not None,
         )
-        final_script = response.choices[0].message.content
+        if on_token is None:
+            final_script = response.choices[0].message.content
+        else:
+            parts = []
+            for chunk in response:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    parts.append(delta)
+                    on_token(delta)
+            final_script = "".join(parts)
         print(f"✅ Generated {len(final_script)} characters of merged script")
         return final_script
     except Exception as e:
@@ -134,7 +156,7 @@ def merge_with_director_agent(kestra_data, finetuned_script):
         raise
 
 def save_final_script(script, filepath):
-    """Save the final merged script and create clean TTS text file"""
+    """Save the final merged script, its structured JSON and the clean TTS text file"""
     print(f"\n💾 Processing final script...")
 
     try:
@@ -146,78 +168,16 @@ def save_final_script(script, filepath):
             f.write(script)
         print(f"✅ Saved markdown script: {filepath}")
 
-        # Extract title and create clean TTS text
-        lines = script.split('\n')
-        title = ""
-        tts_content = []
-
-        # Find title (first line with **title** that doesn't contain timing info or colons)
-        for line in lines:
-            line_stripped = line.strip()
-            if (line_stripped.startswith('**') and line_stripped.endswith('**') and
-                not any(char in line_stripped for char in ['(', ')', ':00', ':30']) and
-                'Title:' not in line_stripped and 'title:' not in line_stripped):
-                title = line_stripped.strip('**').strip()
-                break
-
-        # Fallback: look for title in quotes if no clean title found
-        if not title:
-            for line in lines:
-                if '"' in line and ('Title' in line or 'title' in line):
-                    # Extract text between quotes
-                    start = line.find('"')
-                    end = line.find('"', start + 1)
-                    if start != -1 and end != -1:
-                        title = line[start+1:end]
-                        break
-
-        if not title:
-            title = "Veritasium_Script"
-
-        # Extract clean script content (skip headers and sources)
-        skip_sources = False
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-
-            # Stop processing when we reach sources section
-            if 'Sources' in line or 'sources' in line or '[1]' in line or 'Annals' in line:
-                skip_sources = True
-                continue
-
-            if skip_sources:
-                continue
-
-            # Skip title line
-            if line.startswith('**') and line.endswith('**') and not any(char in line for char in ['(', ')', ':00', ':30']):
-                continue
-
-            # Skip section headers (both ** and ### formats)
-            if (line.startswith('**') or line.startswith('###')) and (
-                'Hook' in line or 'Main Content' in line or 'Twist' in line or
-                'Conclusion' in line or 'Note:' in line
-            ):
-                continue
-
-            # Skip timing labels in parentheses
-            if ('0:00' in line or '0:30' in line or '4:00' in line or '4:30' in line or '5:00' in line):
-                continue
-
-            # Skip any remaining header-like lines
-            if line.startswith('### ') or line.startswith('**') or line.startswith('* ') or line.startswith('['):
-                continue
+        # Single-pass parse: title, sections, paragraphs, sources, word counts, durations
+        structure = parse_script(script)
+        save_structure(structure, OUTPUT_STRUCTURE)
+        print(f"✅ Saved structured script: {OUTPUT_STRUCTURE} ({len(structure['sections'])} sections, "
+              f"{structure['words']} words, ~{structure['seconds'] / 60:.1f} min)")
 
-            # Add actual content lines (skip very short lines)
-            if line and len(line) > 15:  # Only keep substantial content lines
-                tts_content.append(line)
-
-        # Create clean TTS text file
-        clean_script = '\n\n'.join(tts_content)
+        # Create clean TTS text file (one paragraph per block, in speaking order)
         tts_filepath = "research_outputs/tts.txt"
-
         with open(tts_filepath, 'w', encoding='utf-8') as f:
-            f.write(clean_script)
+            f.write(tts_text(structure))
 
         print(f"✅ Saved TTS-ready script: {tts_filepath}")
 
@@ -225,10 +185,51 @@ def save_final_script(script, filepath):
         print(f"❌ Error saving scripts: {e}")
         raise
 
+def merge_with_streaming_tts(kestra_data, finetuned_script, research_context, tts_engine):
+    """
+    Director merge with TTS running alongside: completed narration sentences go to the
+    TTS engine while the script is still streaming, and their audio is appended to
+    video_output/generated_tts/output.mp3 in order (see video_output/stream_tts.py).
+    """
+    sys.path.insert(0, VIDEO_OUTPUT_DIR)
+    from stream_tts import StreamingSynthesizer
+
+    synthesizer = StreamingSynthesizer(tts_engine=tts_engine)
+    segmenter = SentenceSegmenter()
+    print(f"🔊 Streaming narration to {tts_engine} as the script is written...")
+
+    def on_token(delta):
+        for sentence in segmenter.feed(delta):
+            synthesizer.submit(sentence)
+
+    error = None
+    try:
+        final_script = merge_with_director_agent(kestra_data, finetuned_script, research_context, on_token=on_token)
+        for sentence in segmenter.close():
+            synthesizer.submit(sentence)
+    except BaseException as e:
+        error = e  # the narration is incomplete, so its audio must not be reported as complete
+        raise
+    finally:
+        try:
+            manifest = synthesizer.close(error)
+        except RuntimeError as e:
+            # The script is still good; the manifest says "failed", so TTS runs again from tts.txt
+            print(f"⚠️ {e}")
+            manifest = None
+    if manifest:
+        print(f"✅ Streamed {len(manifest['chunks'])} sentences ({manifest['audio_seconds']:.1f}s of audio); "
+              f"first audio after {manifest['first_audio_seconds']}s, done after {manifest['wall_seconds']:.1f}s")
+    return final_script
+
+
 def main():
     """Main execution flow"""
     parser = argparse.ArgumentParser(description="Veritasium Director Agent")
     parser.add_argument("--topic", default="Default topic", help="Video topic for context")
+    parser.add_argument("--context", default=None, help="Pre-packed research context JSON (skips packing)")
+    parser.add_argument("--stream-tts", default=None, choices=["elevenlabs", "edge_tts"],
+                        help="Synthesize narration sentence by sentence while the script streams")
     args = parser.parse_args()
 
     print("=" * 60)
@@ -238,8 +239,14 @@ def main():
     print()
 
     try:
-        # Step 1: Load inputs
-        kestra_data = load_kestra_data(KESTRA_OUTPUT)
+        # Step 1: Load inputs (a pre-packed context replaces the full research file)
+        research_context = None
+        if args.context and os.path.exists(args.context):
+            print(f"♻️ Using pre-packed research context: {args.context}")
+            research_context = load_research_context(args.context)
+            kestra_data = None
+        else:
+            kestra_data = load_kestra_data(KESTRA_OUTPUT)
 
         # Check if finetuned_script.txt already exists
         if os.path.exists(FINETUNED_SCRIPT):
@@ -250,7 +257,10 @@ def main():
             generate_draft(args.topic)  # Runs generate_draft.py from fine_tuned_model directory
             finetuned_script = load_finetuned_script(FINETUNED_SCRIPT)  # Loads after generate_draft call
         # Step 2: Merge with Director Agent
-        final_script = merge_with_director_agent(kestra_data, finetuned_script)
+        if args.stream_tts:
+            final_script = merge_with_streaming_tts(kestra_data, finetuned_script, research_context, args.stream_tts)
+        else:
+            final_script = merge_with_director_agent(kestra_data, finetuned_script, research_context)
         # Step 3: Save output
         save_final_script(final_script, OUTPUT_SCRIPT)
         print("\n" + "=" * 60)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Compact research context for the Director prompt.
+
+The raw Kestra output carries cache/rate-limit stats, full abstracts and
+provider bookkeeping the Director does not need. pack_research_context()
+keeps only the facts, posts and papers (already relevance-ranked by the
+research script), trimmed to a fixed size, so the prompt is small and the
+same research always packs to the same context. The backend pre-computes it
+for pre-warmed topics; director.py packs on the fly otherwise.
+
+material_change() is the cheap diff the backend uses after a speculative
+Director run on partial research: it decides whether the late agent added
+enough new terms to the packed context to be worth a re-run.
+
+Usage:
+    python3 research_context.py ../research_outputs/kestra_output.json --output context.json
+"""
+
+import argparse
+import json
+import re
+import sys
+
+MAX_FACTS = 8
+MAX_POSTS = 6
+MAX_PAPERS = 5
+MAX_TEXT = 600  # characters kept per extract / snippet / abstract
+
+# A late agent is "material" if it adds at least this many new terms making up this share of the context
+MATERIAL_MIN_NEW_TERMS = 20
+MATERIAL_MIN_NOVELTY = 0.2
+
+
+def _clip(text, limit=MAX_TEXT):
+    text = " ".join((text or "").split())
+    return text if len(text) <= limit else text[:limit].rsplit(" ", 1)[0] + "…"
+
+
+def pack_research_context(kestra_data):
+    """Reduce Kestra research output to what the Director prompt uses."""
+    agents = kestra_data.get("agents", {})
+    context = {"topic": kestra_data.get("topic", "")}
+
+    historian = agents.get("historian", {})
+    if historian.get("status") == "success":
+        wiki = historian.get("wiki_data") or {}
+        context["background"] = {
+            "title": wiki.get("title", ""),
+            "extract": _clip(historian.get("extract") or wiki.get("extract")),
+            "url": wiki.get("url", ""),
+            "facts": [
+                f"{fact.get('label', '')}: {fact.get('desc', '')}".strip(": ")
+                for fact in (historian.get("wikidata_facts") or [])[:MAX_FACTS]
+            ],
+        }
+
+    skeptic = agents.get("skeptic", {})
+    if skeptic.get("status") == "success":
+        context["discussions"] = [
+            {"source": p.get("source", ""), "title": p.get("title", ""),
+             "snippet": _clip(p.get("snippet"), 300), "url": p.get("url", "")}
+            for p in (skeptic.get("posts") or [])[:MAX_POSTS]
+        ]
+
+    professor = agents.get("professor", {})
+    if professor.get("status") == "success":
+        context["papers"] = [
+            {"title": p.get("title", ""), "year": p.get("year"), "citations": p.get("citations", 0),
+             "abstract": _clip(p.get("abstract")), "url": p.get("pdf_url") or ""}
+            for p in (professor.get("papers") or [])[:MAX_PAPERS]
+        ]
+    return context
+
+
+def _terms(value, terms=None):
+    """Distinct lowercase words (4+ letters) in every string of a packed context."""
+    terms = set() if terms is None else terms
+    if isinstance(value, str):
+        terms.update(re.findall(r"[a-z]{4,}", value.lower()))
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            if key != "url":  # links are not facts
+                _terms(item, terms)
+    elif isinstance(value, list):
+        for item in value:
+            _terms(item, terms)
+    return terms
+
+
+def material_change(previous, current, min_new_terms=MATERIAL_MIN_NEW_TERMS, min_novelty=MATERIAL_MIN_NOVELTY):
+    """
+    Does `current` context add material facts over `previous`?
+
+    Returns (changed, {"new_terms", "novelty"}); novelty is the share of current's terms not in previous.
+    """
+    old, new = _terms(previous), _terms(current)
+    added = new - old
+    novelty = len(added) / len(new) if new else 0.0
+    changed = len(added) >= min_new_terms and novelty >= min_novelty
+    return changed, {"new_terms": len(added), "novelty": round(novelty, 3)}
+
+
+def load_research_context(filepath):
+    with open(filepath, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack Kestra research into Director context")
+    parser.add_argument("research", help="Kestra research JSON (e.g. research_outputs/kestra_output.json)")
+    parser.add_argument("--output", default=None, help="Write the context here instead of stdout")
+    args = parser.parse_args()
+
+    with open(args.research, "r", encoding="utf-8") as f:
+        context = pack_research_context(json.load(f))
+    text = json.dumps(context, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+        print(f"✅ Packed research context: {args.output} ({len(text)} characters)")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
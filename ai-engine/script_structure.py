@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Structured view of the Director's markdown script.
+
+parse_script() reads the markdown once, line by line, and returns the title,
+the ordered sections (Hook / Main / Twist / Conclusion, or whatever headings
+the model used) with their paragraphs, the sources, and word counts plus an
+estimated speaking duration for every paragraph, section and the whole script.
+director.py writes it as final_5min_script.json and derives tts.txt from it,
+so the TTS and video stages can split work on paragraph boundaries.
+
+Usage:
+    python3 script_structure.py ../research_outputs/final_5min_script.md --output script.json
+"""
+
+import argparse
+import json
+import re
+import sys
+
+WORDS_PER_MINUTE = 150  # narration pace; the Director prompt targets ~750 words for 5 minutes
+
+# Heading keyword -> canonical section name
+SECTION_NAMES = [
+    ("hook", "Hook"),
+    ("intro", "Hook"),
+    ("main", "Main"),
+    ("explanation", "Main"),
+    ("twist", "Twist"),
+    ("revelation", "Twist"),
+    ("conclusion", "Conclusion"),
+    ("outro", "Conclusion"),
+    ("wrap", "Conclusion"),
+]
+SOURCE_HEADINGS = ("sources", "references", "citations")
+
+_TIMING = re.compile(r"\(?\s*\d{1,2}:\d{2}\s*(?:[-–—]\s*\d{1,2}:\d{2})?\s*\)?")
+_STAGE_DIRECTION = re.compile(r"\[[^\]]*\]")
+_SPEAKER = re.compile(r"^(?:narrator|host|voice ?over|vo)\s*:\s*", re.IGNORECASE)
+_LIST_ITEM = re.compile(r"^(?:[-*+•]|\d+[.)])\s+")
+_WORD = re.compile(r"[\w’']+(?:-[\w’']+)*")
+
+
+def count_words(text):
+    return len(_WORD.findall(text))
+
+
+def speaking_seconds(words, wpm=WORDS_PER_MINUTE):
+    return round(words * 60.0 / wpm, 1)
+
+
+def _plain(text):
+    """Drop markdown emphasis/inline code and collapse whitespace."""
+    text = re.sub(r"(\*\*|__|\*|`)", "", text)
+    return " ".join(text.split())
+
+
+def _heading(line):
+    """Heading text if `line` is a markdown heading or a bold-only line, else None."""
+    if line.startswith("#"):
+        return _plain(line.lstrip("#"))
+    if line.startswith("**") and line.endswith("**") and len(line) > 4:
+        return _plain(line)
+    return None
+
+
+def clean_narration(line):
+    """Spoken text of a narration line: stage directions, emphasis, speaker labels and list markers removed."""
+    text = _plain(_STAGE_DIRECTION.sub("", line))
+    text = _SPEAKER.sub("", _LIST_ITEM.sub("", text)).strip()
+    return "" if _TIMING.fullmatch(text) else text
+
+
+def _section_name(heading):
+    """Canonical section name for a heading (timing/punctuation stripped), or None."""
+    label = _TIMING.sub("", heading).strip(" :-–—").lower()
+    for keyword, name in SECTION_NAMES:
+        if label.startswith(keyword):
+            return name
+    return None
+
+
+def parse_script(markdown, wpm=WORDS_PER_MINUTE):
+    """Parse the Director's markdown into title / sections / paragraphs / sources (single pass)."""
+    title = ""
+    sections = []
+    sources = []
+    in_sources = False
+    paragraph_lines = []
+
+    def current_section():
+        if not sections:
+            sections.append({"name": "Main", "heading": "", "paragraphs": []})
+        return sections[-1]
+
+    def flush():
+        text = " ".join(paragraph_lines).strip()
+        paragraph_lines.clear()
+        if text:
+            current_section()["paragraphs"].append({"text": text})
+
+    for raw in markdown.splitlines():
+        line = raw.strip()
+        if not line or line == "---":
+            flush()
+            continue
+
+        heading = _heading(line)
+        label = (heading if heading is not None else _plain(line)).strip()
+        lowered = label.lower()
+
+        # Sources block: everything after a "Sources" heading/label is a citation, not narration
+        if lowered.startswith(SOURCE_HEADINGS) and (heading is not None or ":" in label[:12] or len(label) < 20):
+            flush()
+            in_sources = True
+            rest = label.split(":", 1)[1].strip() if ":" in label else ""
+            sources.extend(s.strip() for s in rest.split(";") if s.strip())
+            continue
+        if in_sources:
+            if heading is not None and _section_name(heading):
+                in_sources = False
+            else:
+                source = _LIST_ITEM.sub("", _plain(line)).strip()
+                if source:
+                    sources.append(source)
+                continue
+
+        if heading is not None or lowered.startswith("title:"):
+            flush()
+            name = _section_name(label)
+            if name:
+                sections.append({"name": name, "heading": _TIMING.sub("", label).strip(" :-–—"), "paragraphs": []})
+            elif not title and not sections:
+                title = re.sub(r"^title\s*:\s*", "", label, flags=re.IGNORECASE).strip(' "“”')
+            elif heading is not None:
+                # Any other heading starts a section of its own
+                sections.append({"name": label, "heading": label, "paragraphs": []})
+            continue
+
+        # Bare section labels ("Hook (0:00-0:30)") without markdown
+        name = _section_name(label)
+        if name and _TIMING.search(label) and len(label) < 60:
+            flush()
+            sections.append({"name": name, "heading": _TIMING.sub("", label).strip(" :-–—"), "paragraphs": []})
+            continue
+
+        text = clean_narration(line)
+        if not text:
+            continue
+        if _LIST_ITEM.match(line):
+            flush()
+            paragraph_lines.append(text)
+            flush()
+        else:
+            paragraph_lines.append(text)
+    flush()
+
+    structure = {
+        "title": title or "Veritasium_Script",
+        "words_per_minute": wpm,
+        "words": 0,
+        "seconds": 0.0,
+        "sections": [s for s in sections if s["paragraphs"]],
+        "sources": sources,
+    }
+    return recount(structure)
+
+
+def recount(structure):
+    """(Re)compute paragraph indexes, word counts and durations, e.g. after editing paragraphs."""
+    wpm = structure["words_per_minute"]
+    total_words, index = 0, 0
+    for section in structure["sections"]:
+        section_words = 0
+        for paragraph in section["paragraphs"]:
+            paragraph["index"] = index
+            paragraph["words"] = count_words(paragraph["text"])
+            paragraph["seconds"] = speaking_seconds(paragraph["words"], wpm)
+            section_words += paragraph["words"]
+            index += 1
+        section["words"] = section_words
+        section["seconds"] = speaking_seconds(section_words, wpm)
+        total_words += section_words
+    structure["words"] = total_words
+    structure["seconds"] = speaking_seconds(total_words, wpm)
+    return structure
+
+
+def paragraphs(structure):
+    """All paragraph texts in speaking order."""
+    return [p["text"] for section in structure["sections"] for p in section["paragraphs"]]
+
+
+def tts_text(structure):
+    """Plain narration for TTS: paragraphs separated by blank lines."""
+    return "\n\n".join(paragraphs(structure))
+
+
+def to_markdown(structure):
+    """Render the structure back to the Director's markdown layout."""
+    lines = [f"**{structure['title']}**", ""]
+    for section in structure["sections"]:
+        lines += [f"### {section['heading'] or section['name']}", ""]
+        for paragraph in section["paragraphs"]:
+            lines += [paragraph["text"], ""]
+    if structure["sources"]:
+        lines += ["**Sources:**"] + [f"- {source}" for source in structure["sources"]]
+    return "\n".join(lines).rstrip() + "\n"
+
+
+def load_structure(filepath):
+    with open(filepath, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_structure(structure, filepath):
+    with open(filepath, "w", encoding="utf-8") as f:
+        json.dump(structure, f, indent=2, ensure_ascii=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse a Director markdown script into structured JSON")
+    parser.add_argument("script", help="Markdown script (e.g. research_outputs/final_5min_script.md)")
+    parser.add_argument("--output", default=None, help="Write the JSON here instead of stdout")
+    args = parser.parse_args()
+
+    with open(args.script, "r", encoding="utf-8") as f:
+        structure = parse_script(f.read())
+    if args.output:
+        save_structure(structure, args.output)
+        print(f"✅ {structure['title']}: {len(structure['sections'])} sections, "
+              f"{structure['words']} words (~{structure['seconds'] / 60:.1f} min) → {args.output}")
+    else:
+        print(json.dumps(structure, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
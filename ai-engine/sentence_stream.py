@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Incremental sentence segmenter for the Director's streamed markdown.
+
+SentenceSegmenter.feed() takes raw token deltas and returns the narration
+sentences completed so far, cleaned the same way script_structure.parse_script()
+cleans paragraphs: titles, section headings, timings, stage directions and the
+sources block never reach TTS. Lines are classified once complete (a Director
+paragraph is a single line, so this costs a fraction of a second at Cerebras
+speeds); complete lines are split into sentences and very short sentences are
+merged with the next one so TTS requests are not one word long.
+
+Usage:
+    segmenter = SentenceSegmenter()
+    for delta in token_stream:
+        for sentence in segmenter.feed(delta):
+            synthesize(sentence)
+    for sentence in segmenter.close():
+        synthesize(sentence)
+"""
+
+import re
+import sys
+
+from script_structure import SOURCE_HEADINGS, _heading, _plain, _section_name, _TIMING, clean_narration
+
+MIN_SENTENCE_CHARS = 40  # shorter sentences are sent together with the next one
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+|(?<=[.!?][\"”’')\]])\s+")
+
+
+class SentenceSegmenter:
+    """Turns streamed markdown into clean narration sentences, in speaking order."""
+
+    def __init__(self, min_chars=MIN_SENTENCE_CHARS):
+        self.min_chars = min_chars
+        self._line = ""
+        self._pending = ""  # completed sentence(s) waiting to reach min_chars
+        self._in_sources = False
+
+    def feed(self, text):
+        """Add streamed text; returns sentences completed by it."""
+        self._line += text
+        sentences = []
+        while "\n" in self._line:
+            line, self._line = self._line.split("\n", 1)
+            sentences += self._process_line(line)
+        return sentences
+
+    def close(self):
+        """End of stream: returns the remaining sentences."""
+        sentences = self._process_line(self._line) if self._line else []
+        self._line = ""
+        return sentences + self._flush()
+
+    # ------------------------------------------------------------------ #
+    # Internals (mirror script_structure.parse_script's classification)
+    # ------------------------------------------------------------------ #
+    def _process_line(self, raw):
+        line = raw.strip()
+        if not line or line == "---":
+            return self._flush()  # paragraph break
+
+        heading = _heading(line)
+        label = (heading if heading is not None else _plain(line)).strip()
+        lowered = label.lower()
+
+        if lowered.startswith(SOURCE_HEADINGS) and (heading is not None or ":" in label[:12] or len(label) < 20):
+            self._in_sources = True
+            return self._flush()
+        if self._in_sources:
+            if heading is not None and _section_name(heading):
+                self._in_sources = False
+            return []
+
+        # Title, section and other headings (and bare "Hook (0:00-0:30)" labels) are not spoken
+        if heading is not None or lowered.startswith("title:"):
+            return self._flush()
+        if _section_name(label) and _TIMING.search(label) and len(label) < 60:
+            return self._flush()
+
+        text = clean_narration(line)
+        if not text:
+            return []
+        # The line's last part only ends a sentence if it ends in punctuation; a paragraph can wrap lines
+        sentences = []
+        parts = _SENTENCE_END.split(text + " ")
+        for i, part in enumerate(parts):
+            part = part.strip()
+            if not part:
+                continue
+            self._pending = f"{self._pending} {part}".strip()
+            complete = i < len(parts) - 1
+            if complete and len(self._pending) >= self.min_chars:
+                sentences.append(self._pending)
+                self._pending = ""
+        return sentences
+
+    def _flush(self):
+        sentence, self._pending = self._pending, ""
+        return [sentence] if sentence else []
+
+
+def main():
+    """Segment a markdown script from stdin, printing one sentence per line (for checking the rules)."""
+    segmenter = SentenceSegmenter()
+    for chunk in iter(lambda: sys.stdin.read(64), ""):
+        for sentence in segmenter.feed(chunk):
+            print(sentence)
+    for sentence in segmenter.close():
+        print(sentence)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Bytes transferred for seek-heavy playback of a /download video.
+
+Simulates a player that opens the video, then seeks SEEKS times to random
+positions and plays WINDOW bytes after each, then reopens it (a repeat view):
+
+- ranged: every seek is a Range request for just its window, and the repeat
+  view revalidates with If-None-Match (304, no body);
+- baseline: what a client gets from a server without ranges or ETags, i.e.
+  every seek re-streams the file from byte 0 up to the end of the window and
+  the repeat view downloads the whole file again.
+
+Usage (backend running):
+    python3 bench_download.py video_output/generated_video/generated_video_20250101_120000.mp4
+    python3 bench_download.py <file> --base-url http://localhost:8000 --seeks 20 --window-kb 512
+"""
+
+import argparse
+import random
+import sys
+import time
+
+import requests
+
+CHUNK_BYTES = 64 * 1024
+
+
+def _read(response, limit=None):
+    """Consume a streamed body (stopping after `limit` bytes); returns the bytes received."""
+    received = 0
+    for block in response.iter_content(chunk_size=CHUNK_BYTES):
+        received += len(block)
+        if limit is not None and received >= limit:
+            break
+    response.close()
+    return received
+
+
+def ranged_playback(url, positions, window):
+    size_response = requests.head(url, timeout=30)
+    size_response.raise_for_status()
+    size, etag = int(size_response.headers["Content-Length"]), size_response.headers.get("ETag")
+    total = 0
+    for position in [0] + positions:
+        end = min(size, position + window) - 1
+        response = requests.get(url, headers={"Range": f"bytes={position}-{end}"}, stream=True, timeout=30)
+        if response.status_code != 206:
+            raise RuntimeError(f"expected 206 for a range request, got {response.status_code}")
+        total += _read(response)
+    repeat = requests.get(url, headers={"If-None-Match": etag or ""}, stream=True, timeout=30)
+    total += _read(repeat)
+    return total, repeat.status_code
+
+
+def baseline_playback(url, positions, window):
+    total = 0
+    for position in [0] + positions:
+        total += _read(requests.get(url, stream=True, timeout=30), limit=position + window)
+    total += _read(requests.get(url, stream=True, timeout=30))
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare bytes transferred for seek-heavy playback")
+    parser.add_argument("file", help="Path as passed to /download (e.g. video_output/generated_video/...mp4)")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--seeks", type=int, default=20)
+    parser.add_argument("--window-kb", type=int, default=512, help="Bytes played after each seek")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    url = f"{args.base_url.rstrip('/')}/download/{args.file}"
+    head = requests.head(url, timeout=30)
+    if head.status_code != 200:
+        print(f"❌ HEAD {url}: {head.status_code}")
+        return 1
+    size = int(head.headers["Content-Length"])
+    window = args.window_kb * 1024
+    positions = sorted(random.Random(args.seed).randrange(0, max(1, size - window)) for _ in range(args.seeks))
+
+    begin = time.time()
+    ranged, repeat_status = ranged_playback(url, positions, window)
+    ranged_seconds = time.time() - begin
+    begin = time.time()
+    baseline = baseline_playback(url, positions, window)
+    baseline_seconds = time.time() - begin
+
+    print(f"🎬 {size / 1e6:.1f} MB video, {args.seeks} seeks × {args.window_kb} KB + a repeat view")
+    print(f"📦 Range + ETag:     {ranged / 1e6:8.1f} MB in {ranged_seconds:.2f}s (repeat view: {repeat_status})")
+    print(f"📦 Without ranges:   {baseline / 1e6:8.1f} MB in {baseline_seconds:.2f}s")
+    print(f"📉 {baseline / max(1, ranged):.1f}x fewer bytes with ranges")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
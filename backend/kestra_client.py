@@ -0,0 +1,190 @@
+"""
+Kestra REST client used by the backend to run the research flow.
+
+Submits executions through the Kestra HTTP API, waits for completion by following
+the execution's server-sent event stream (falling back to polling with backoff),
+and downloads the agents' output files straight from Kestra's internal storage.
+
+Configuration (environment):
+- KESTRA_URL: server base URL, e.g. http://kestra:8080 (unset = REST path disabled)
+- KESTRA_TENANT: optional tenant id (newer Kestra versions use /api/v1/{tenant}/...)
+- KESTRA_USERNAME / KESTRA_PASSWORD: optional basic auth
+"""
+
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATES = {"SUCCESS", "WARNING", "FAILED", "KILLED", "CANCELLED", "RETRIED", "SKIPPED"}
+SUCCESS_STATES = {"SUCCESS", "WARNING"}
+
+RESEARCH_NAMESPACE = "dev"
+RESEARCH_FLOW_ID = "multi-agent-research"
+AGENT_FILES = {
+    "historian": "historian.json",
+    "skeptic": "skeptic.json",
+    "professor": "professor.json",
+}
+
+
+class KestraError(Exception):
+    """Kestra API call failed or the execution did not succeed."""
+
+
+class KestraTimeout(KestraError):
+    """The execution did not finish in time (it has been asked to stop)."""
+
+
+class KestraClient:
+    def __init__(self, base_url: str, tenant: Optional[str] = None,
+                 auth: Optional[Tuple[str, str]] = None, session: Optional[requests.Session] = None):
+        self.base_url = base_url.rstrip("/")
+        self.prefix = f"/api/v1/{tenant}" if tenant else "/api/v1"
+        self.session = session or requests.Session()
+        if auth:
+            self.session.auth = auth
+
+    @classmethod
+    def from_env(cls) -> Optional["KestraClient"]:
+        base_url = os.environ.get("KESTRA_URL")
+        if not base_url:
+            return None
+        user, password = os.environ.get("KESTRA_USERNAME"), os.environ.get("KESTRA_PASSWORD")
+        return cls(base_url, os.environ.get("KESTRA_TENANT"), (user, password) if user and password else None)
+
+    def _url(self, path: str) -> str:
+        return f"{self.base_url}{self.prefix}{path}"
+
+    def submit(self, namespace: str, flow_id: str, inputs: Dict[str, str]) -> Dict[str, Any]:
+        """Create an execution; inputs are sent as multipart form fields."""
+        files = {name: (None, value) for name, value in inputs.items()}
+        response = self.session.post(self._url(f"/executions/{namespace}/{flow_id}"), files=files, timeout=30)
+        if response.status_code >= 400:
+            raise KestraError(f"Submit failed ({response.status_code}): {response.text[:300]}")
+        return response.json()
+
+    def get_execution(self, execution_id: str) -> Dict[str, Any]:
+        response = self.session.get(self._url(f"/executions/{execution_id}"), timeout=30)
+        if response.status_code >= 400:
+            raise KestraError(f"Get execution failed ({response.status_code}): {response.text[:300]}")
+        return response.json()
+
+    def wait(self, execution_id: str, timeout: float) -> Dict[str, Any]:
+        """Block until the execution reaches a terminal state (or raise on timeout)."""
+        deadline = time.monotonic() + timeout
+        try:
+            execution = self._follow(execution_id, deadline)
+            if execution:
+                return execution
+        except requests.RequestException as e:
+            logger.info(f"Kestra follow stream unavailable ({e}); polling instead")
+
+        delay = 0.5
+        while time.monotonic() < deadline:
+            execution = self.get_execution(execution_id)
+            if _state(execution) in TERMINAL_STATES:
+                return execution
+            time.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+            delay = min(delay * 1.5, 5.0)
+        raise KestraTimeout(f"Execution {execution_id} did not finish within {timeout:.0f}s")
+
+    def _follow(self, execution_id: str, deadline: float) -> Optional[Dict[str, Any]]:
+        """Follow the execution's SSE stream; returns the terminal execution or None if the stream ended early."""
+        read_timeout = max(1.0, deadline - time.monotonic())
+        with self.session.get(self._url(f"/executions/{execution_id}/follow"), stream=True,
+                              headers={"Accept": "text/event-stream"}, timeout=(10, read_timeout)) as response:
+            if response.status_code >= 400:
+                raise requests.RequestException(f"follow returned {response.status_code}")
+            for line in response.iter_lines(decode_unicode=True):
+                if time.monotonic() > deadline:
+                    return None
+                if not line or not line.startswith("data:"):
+                    continue
+                try:
+                    event = json.loads(line[5:].strip())
+                except json.JSONDecodeError:
+                    continue
+                if _state(event) in TERMINAL_STATES:
+                    # Stream events can be partial; fetch the full execution once it is done
+                    return self.get_execution(execution_id)
+        return None
+
+    def kill(self, execution_id: str) -> None:
+        response = self.session.delete(self._url(f"/executions/{execution_id}/kill"), timeout=30)
+        if response.status_code >= 400 and response.status_code != 409:  # 409: already finished
+            raise KestraError(f"Kill failed ({response.status_code}): {response.text[:300]}")
+
+    def download(self, execution_id: str, uri: str) -> bytes:
+        """Fetch a kestra:/// internal storage file produced by the execution."""
+        response = self.session.get(self._url(f"/executions/{execution_id}/file"), params={"path": uri}, timeout=60)
+        if response.status_code >= 400:
+            raise KestraError(f"Download of {uri} failed ({response.status_code})")
+        return response.content
+
+
+def _state(execution: Dict[str, Any]) -> Optional[str]:
+    return (execution.get("state") or {}).get("current")
+
+
+def output_files(execution: Dict[str, Any]) -> Dict[str, str]:
+    """All outputFiles URIs across the execution's task runs, keyed by file name."""
+    files = {}
+    for task_run in execution.get("taskRunList") or []:
+        for name, uri in ((task_run.get("outputs") or {}).get("outputFiles") or {}).items():
+            files[name] = uri
+    return files
+
+
+def run_research_flow(client: KestraClient, topic: str, output_dir: Path, timeout: float = 600) -> Tuple[bool, str]:
+    """
+    Run dev.multi-agent-research via the API and write the agent files plus
+    kestra_output.json into `output_dir`. Returns (success, log).
+    """
+    execution = client.submit(RESEARCH_NAMESPACE, RESEARCH_FLOW_ID, {"topic": topic})
+    execution_id = execution["id"]
+    logger.info(f"Kestra execution {execution_id} submitted for '{topic}'")
+
+    try:
+        execution = client.wait(execution_id, timeout)
+    except KestraTimeout:
+        # Otherwise it keeps running and its persist task may overwrite the fallback's kestra_output.json
+        try:
+            client.kill(execution_id)
+        except (KestraError, requests.RequestException) as e:
+            logger.warning(f"Could not kill Kestra execution {execution_id}: {e}")
+        raise
+    state = _state(execution)
+    if state not in SUCCESS_STATES:
+        return False, f"Kestra execution {execution_id} ended in state {state}"
+
+    files = output_files(execution)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    agents = {}
+    for agent, filename in AGENT_FILES.items():
+        if filename not in files:
+            agents[agent] = {"agent": agent.capitalize(), "status": "failed", "error": "File missing"}
+            continue
+        content = client.download(execution_id, files[filename])
+        (output_dir / filename).write_bytes(content)
+        agents[agent] = json.loads(content)
+
+    if "combined_research.json" in files:
+        combined = json.loads(client.download(execution_id, files["combined_research.json"]))
+    else:
+        combined = {
+            "topic": topic,
+            "timestamp": execution.get("state", {}).get("startDate"),
+            "agents": agents,
+            "summary": {f"{agent}_status": data.get("status", "unknown") for agent, data in agents.items()},
+        }
+    combined["kestra_execution_id"] = execution_id
+    with open(output_dir / "kestra_output.json", "w", encoding="utf-8") as f:
+        json.dump(combined, f, indent=2, ensure_ascii=False)
+    return True, ""
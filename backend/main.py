@@ -3,7 +3,7 @@
 Veritasium Backend API
 
 FastAPI backend that orchestrates the complete content generation pipeline:
-1. Research generation (Kestra/local fallback)
+1. Research generation (Kestra REST API/local fallback)
 2. Script drafting (fine-tuned model)
 3. Content merging (Director Agent)
 4. TTS generation (ElevenLabs/Edge TTS)
@@ -16,21 +16,26 @@ Endpoints:
 """
 
 import asyncio
+import hashlib
+import re
 import subprocess
 import os
+import sys
 import json
 import uuid
 import shutil
 import time
 import logging
 from datetime import datetime
+from collections import OrderedDict
 from typing import Dict, Optional, Any, Tuple
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+import requests
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from pydantic import BaseModel
 from dotenv import load_dotenv
 
@@ -41,6 +46,80 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
+# Topic canonicalization / similarity index shared with the research script,
+# and the Director's research-context packing
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "kestra"))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "ai-engine"))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "video_output"))
+from topic_index import TopicIndex, canonical_topic
+from research_context import material_change, pack_research_context
+from kestra_client import AGENT_FILES, KestraClient, KestraError, KestraTimeout, run_research_flow
+from prewarm import PREWARM_INTERVAL_MINUTES, ResearchPrewarmer, prewarmed_context
+from signed_urls import verify as verify_signature
+from wavespeed_jobs import JOB_DEADLINE_SECONDS, WEBHOOK_SIGNED_PATH, VideoJobManager, record_webhook_event
+from ranged_download import DownloadError, download as ranged_download
+
+# Kestra REST API (set KESTRA_URL to enable; local script is the fallback)
+KESTRA_TIMEOUT = float(os.environ.get("KESTRA_TIMEOUT", "600"))
+
+TOPIC_REUSE_MAX_AGE_HOURS = float(os.environ.get("TOPIC_REUSE_MAX_AGE_HOURS", 7 * 24))
+
+# Speculative Director: start merging once the draft and a quorum of research agents are done
+SPECULATIVE_DIRECTOR = os.environ.get("SPECULATIVE_DIRECTOR", "false").lower() in ("1", "true", "yes")
+SPECULATIVE_QUORUM = int(os.environ.get("SPECULATIVE_QUORUM", "2"))
+
+# Streaming TTS: the Director's sentences are synthesized while the script is still being written
+STREAMING_TTS = os.environ.get("STREAMING_TTS", "false").lower() in ("1", "true", "yes")
+STREAM_MANIFEST = "video_output/generated_tts/stream_manifest.json"
+AUDIO_STREAM_CHUNK = 64 * 1024
+AUDIO_STREAM_POLL_SECONDS = 0.25
+AUDIO_STREAM_TIMEOUT = float(os.environ.get("AUDIO_STREAM_TIMEOUT", "900"))  # give up on a stalled task
+
+# Artifacts the video API may fetch through signed URLs (/artifacts/{task_id}/{name}); see kestra/signed_urls.py
+SIGNED_ARTIFACTS = {
+    "output.mp3": ("video_output/generated_tts/output.mp3", "audio/mpeg"),
+    "output_post.mp3": ("video_output/generated_tts/output_post.mp3", "audio/mpeg"),
+    "face.png": ("video_output/face/veritasium_dreamworks.png", "image/png"),
+}
+# Audio segments for segment-parallel rendering (video_output/segment_render.py)
+SEGMENT_ARTIFACT = re.compile(r"segment_\d{2}\.mp3")
+SEGMENTS_DIR = "video_output/generated_tts/segments"
+
+# Still-image + captions preview rendered by video_gen.py while the avatar video is pending
+PREVIEW_FILE = "video_output/generated_video/preview.mp4"
+
+# /download: media types, caching and byte ranges
+DOWNLOAD_MEDIA_TYPES = {
+    ".mp4": "video/mp4",
+    ".mp3": "audio/mpeg",
+    ".json": "application/json",
+    ".md": "text/markdown; charset=utf-8",
+    ".txt": "text/plain; charset=utf-8",
+}
+# generated_video_<timestamp>.mp4 never changes once written; every other artifact is rewritten by the next
+# run under the same name, so clients revalidate it (cheap: 304 while the ETag matches)
+CACHE_IMMUTABLE = "public, max-age=31536000, immutable"
+CACHE_REVALIDATE = "no-cache"
+ETAG_CACHE_SIZE = 256
+_etags: "OrderedDict[str, Tuple[int, int, str]]" = OrderedDict()  # path -> (mtime_ns, size, ETag), LRU
+
+# Persisted WaveSpeed predictions (video_output/wavespeed_jobs.py); orphaned ones are resumed at startup
+WAVESPEED_JOBS = "video_output/generated_tts/wavespeed_jobs.json"
+# video_gen.py timeouts: TTS alone, and TTS + uploads + download on top of the WaveSpeed job deadline,
+# so a render is never killed while its job may still finish
+TTS_TIMEOUT_SECONDS = 600
+VIDEO_GEN_TIMEOUT_SECONDS = JOB_DEADLINE_SECONDS + TTS_TIMEOUT_SECONDS
+
+# Artifacts produced by a successful pipeline run (project-relative)
+PIPELINE_FILES = {
+    "research": "research_outputs/kestra_output.json",
+    "script": "research_outputs/finetuned_script.txt",
+    "final_script": "research_outputs/final_5min_script.md",
+    "script_structure": "research_outputs/final_5min_script.json",
+    "tts_text": "research_outputs/tts.txt",
+    "tts_audio": "video_output/generated_tts/output.mp3",
+}
+
 app = FastAPI(
     title="Veritasium Backend API",
     description="AI-powered educational video content generation",
@@ -63,6 +142,9 @@ class GenerationRequest(BaseModel):
     topic: str
     tts_engine: str = "elevenlabs"
     generate_video: bool = False
+    reuse: bool = True  # reuse artifacts of a previously generated, equivalent topic
+    speculative: bool = SPECULATIVE_DIRECTOR  # start the Director on partial research
+    stream_tts: bool = STREAMING_TTS  # synthesize narration sentence by sentence during the Director run
 
 class GenerationResponse(BaseModel):
     task_id: str
@@ -101,11 +183,21 @@ def _init_task(task_id: str, topic: str, tts_engine: str, generate_video: bool)
         "steps": {
             "research": {"status": "pending", "label": "Kestra research → kestra_output.json", "log": ""},
             "draft": {"status": "pending", "label": "Fine-tuned model → finetuned_script.txt", "log": ""},
-            "director": {"status": "pending", "label": "Director merge → final_5min_script.md + tts.txt", "log": ""},
+            "director": {"status": "pending", "label": "Director merge → final_5min_script.md/.json + tts.txt", "log": ""},
+            "budget": {"status": "pending", "label": "Speaking-time budget → trimmed tts.txt", "log": ""},
             "tts": {"status": "pending", "label": "TTS → output.mp3", "log": ""},
             "video": {"status": "pending", "label": "Video generation (WaveSpeed) → .mp4", "log": ""},
         },
         "files": {},
+        "topic_match": {
+            "canonical": canonical_topic(topic),
+            "threshold": _topic_index().threshold,
+            "research": None,
+            "pipeline": None,
+        },
+        "speculation": None,
+        "budget": None,
+        "streaming": None,
         "error": None,
         "updated_at": datetime.now().isoformat(),
     }
@@ -144,28 +236,157 @@ def _parse_final_output(stdout: str) -> Optional[str]:
             return line.split("Final Output:", 1)[1].strip()
     return None
 
+def _topic_index() -> TopicIndex:
+    return TopicIndex(str(_project_root() / "research_outputs" / "topic_index.json"))
+
+
+def _reuse_pipeline_artifacts(task_id: str, topic: str, tts_engine: str, generate_video: bool) -> bool:
+    """Restore a previous run's artifacts for an equivalent topic. Returns True if reused."""
+    index = _topic_index()
+    match = index.match(topic, "pipeline", max_age=TOPIC_REUSE_MAX_AGE_HOURS * 3600)
+    if not match:
+        return False
+    meta = match["meta"]
+    if meta.get("tts_engine") != tts_engine or (generate_video and "video" not in match["paths"]):
+        return False
+    archived = {key: Path(index.resolve(path)) for key, path in match["paths"].items()}
+    if not set(PIPELINE_FILES) <= set(archived) or not all(p.exists() for p in archived.values()):
+        return False  # archived before an artifact was added, or files removed
+
+    root = _project_root()
+    files = dict(PIPELINE_FILES)
+    if generate_video:
+        files["video"] = meta["video"]
+    for key, rel in files.items():
+        (root / rel).parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(archived[key], root / rel)
+
+    task = active_tasks[task_id]
+    task["topic_match"]["pipeline"] = {k: match[k] for k in ("topic", "canonical", "similarity", "updated_at")}
+    log = f"Reused from '{match['topic']}' (similarity {match['similarity']:.2f})"
+    for step_key in task["steps"]:
+        skipped = step_key == "video" and not generate_video
+        _set_step(task_id, step_key, "skipped" if skipped else "completed", log=log)
+    task["status"] = "completed"
+    task["current_step"] = "completed"
+    task["files"] = files
+    task["updated_at"] = datetime.now().isoformat()
+    logger.info(f"Pipeline {task_id}: {log}")
+    return True
+
+
+def _archive_pipeline_artifacts(topic: str, tts_engine: str, files: Dict[str, str]):
+    """Copy this run's artifacts to research_outputs/topics/<canonical>/ and index them."""
+    root = _project_root()
+    index = _topic_index()
+    archive_dir = root / "research_outputs" / "topics" / canonical_topic(topic)
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    paths = {}
+    for key, rel in files.items():
+        src = root / rel
+        if not src.exists():
+            return
+        dst = archive_dir / src.name
+        shutil.copyfile(src, dst)
+        paths[key] = index.relative(str(dst))
+    meta = {"tts_engine": tts_engine}
+    if "video" in files:
+        meta["video"] = files["video"]
+    index.record(topic, "pipeline", paths, meta)
+
+
+def _restore_prewarmed_research(task_id: str, topic: str) -> Optional[Dict[str, Any]]:
+    """Copy indexed (pre-warmed or earlier) research for an equivalent topic into place; returns the match."""
+    index = _topic_index()
+    match = index.match(topic, "research", max_age=TOPIC_REUSE_MAX_AGE_HOURS * 3600)
+    if not match:
+        return None
+    src = Path(index.resolve(match["paths"]["research"]))
+    if not src.exists():
+        return None
+    root = _project_root()
+    ensure_dirs(root)
+    shutil.copyfile(src, root / PIPELINE_FILES["research"])
+    active_tasks[task_id]["topic_match"]["research"] = {k: match[k] for k in ("topic", "canonical", "similarity", "updated_at")}
+    _set_step(task_id, "research", "completed",
+              log=f"Pre-warmed research from '{match['topic']}' (similarity {match['similarity']:.2f})")
+    return match
+
+
+def _pipeline_busy() -> bool:
+    return any(task.get("status") == "running" for task in list(active_tasks.values()))
+
+
+def _partial_research(topic: str, since: float) -> Optional[Dict[str, Any]]:
+    """
+    Research assembled from the agent files finished so far in this run, once at least
+    SPECULATIVE_QUORUM agents succeeded. Agents still running are marked "pending".
+    """
+    research_dir = _project_root() / "research_outputs"
+    agents: Dict[str, Any] = {}
+    for agent, filename in AGENT_FILES.items():
+        path = research_dir / filename
+        try:
+            if path.stat().st_mtime < since:
+                continue  # left over from an earlier run
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            continue
+        if data.get("topic") == topic and data.get("status") == "success":
+            agents[agent] = data
+    if len(agents) < SPECULATIVE_QUORUM:
+        return None
+    for agent in AGENT_FILES:
+        agents.setdefault(agent, {"agent": agent.capitalize(), "status": "pending"})
+    return {"topic": topic, "agents": agents}
+
+
+def _write_context(context: Dict[str, Any], name: str) -> str:
+    path = _project_root() / "research_outputs" / name
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(context, f, indent=2, ensure_ascii=False)
+    return str(path)
+
+
+def _load_research(root: Path) -> Dict[str, Any]:
+    """Current kestra_output.json ({} if missing or unreadable)."""
+    try:
+        with open(root / PIPELINE_FILES["research"], "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def _research_reuse_info(root: Path) -> Optional[Dict[str, Any]]:
+    """`reused_from` block the research script writes when it reused an equivalent topic."""
+    return _load_research(root).get("reused_from")
+
+
 def run_research_generation(topic: str, retries: int = 3) -> Tuple[bool, str]:
-    """Run research generation (Kestra or local fallback)"""
+    """Run research generation (Kestra REST API or local fallback)"""
     root = _project_root()
     ensure_dirs(root)
     env = os.environ.copy()
+    kestra = KestraClient.from_env()
+    log = ""
 
     for attempt in range(retries):
         try:
-            kestra_bin = shutil.which("kestra")
-            if kestra_bin:
-                logger.info(f"Research attempt {attempt+1}: Kestra CLI")
-                result = subprocess.run(
-                    [kestra_bin, "flow", "run", "dev.multi-agent-research", "-i", f"topic={topic}"],
-                    capture_output=True,
-                    text=True,
-                    timeout=180,
-                    cwd=str(root),
-                    env=env,
-                )
-                if result.returncode == 0:
-                    return True, ""
-                log = result.stderr[:500]
+            if kestra:
+                logger.info(f"Research attempt {attempt+1}: Kestra API ({kestra.base_url})")
+                try:
+                    ok, log = run_research_flow(kestra, topic, root / "research_outputs", timeout=KESTRA_TIMEOUT)
+                    if ok:
+                        logger.info("Research success via Kestra API")
+                        return True, ""
+                except KestraTimeout as e:
+                    # Another attempt would wait out KESTRA_TIMEOUT again: retries use the local script only
+                    log = str(e)
+                    kestra = None
+                except (KestraError, requests.RequestException, ValueError) as e:
+                    log = str(e)
+                logger.warning(f"Kestra research failed ({log}); falling back to local script...")
             else:
                 logger.info(f"Research attempt {attempt+1}: Falling back to local script...")
             # FIXED: Use --output-dir for correct path
@@ -215,19 +436,26 @@ def run_script_generation(topic: str) -> Tuple[bool, str]:
     return False, log
 
 
-def run_content_merging(topic: str) -> Tuple[bool, str]:
-    """Run director to merge research and script"""
+def run_content_merging(topic: str, context_path: Optional[str] = None,
+                        stream_tts_engine: Optional[str] = None) -> Tuple[bool, str]:
+    """Run director to merge research and script (optionally streaming narration into TTS)"""
     root = _project_root()
     ensure_dirs(root)
     env = os.environ.copy()
     cmd = ["python3", "director.py", "--topic", topic]
+    if context_path:
+        cmd += ["--context", context_path]
+    if stream_tts_engine:
+        cmd += ["--stream-tts", stream_tts_engine]
     logger.info(f"Director: {' '.join(cmd)}")
     result = subprocess.run(
-        cmd, capture_output=True, text=True, cwd=str(root / "ai-engine"), timeout=300, env=env
+        cmd, capture_output=True, text=True, cwd=str(root / "ai-engine"),
+        timeout=900 if stream_tts_engine else 300, env=env
     )
     script_file = root / "research_outputs" / "final_5min_script.md"
+    structure_file = root / PIPELINE_FILES["script_structure"]
     tts_file = root / "research_outputs" / "tts.txt"
-    if result.returncode == 0 and script_file.exists() and tts_file.exists():
+    if result.returncode == 0 and script_file.exists() and structure_file.exists() and tts_file.exists():
         logger.info("Director success")
         return True, ""
     log = result.stderr[:500] or "Missing outputs"
@@ -235,8 +463,46 @@ def run_content_merging(topic: str) -> Tuple[bool, str]:
     return False, log
 
 
-def run_tts_and_video_generation(tts_engine: str, generate_video: bool) -> Dict[str, Any]:
-    """Run TTS (and optionally video) via video_gen.py. Returns output paths."""
+def _stream_manifest() -> Optional[Dict[str, Any]]:
+    """Manifest of the last streaming TTS run (director.py --stream-tts), if any."""
+    try:
+        with open(_project_root() / STREAM_MANIFEST, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def run_budget_enforcement() -> Tuple[bool, str, Optional[Dict[str, Any]]]:
+    """Cap the script's estimated speaking time before TTS/video. Returns (ok, log, budget record)."""
+    root = _project_root()
+    cmd = [
+        "python3", "budget.py",
+        "--structure", str(root / PIPELINE_FILES["script_structure"]),
+        "--tts", str(root / PIPELINE_FILES["tts_text"]),
+        "--markdown", str(root / PIPELINE_FILES["final_script"]),
+    ]
+    logger.info(f"Budget: {' '.join(cmd)}")
+    result = subprocess.run(
+        cmd, capture_output=True, text=True, cwd=str(root / "ai-engine"), timeout=300, env=os.environ.copy()
+    )
+    if result.returncode != 0:
+        return False, result.stderr[-500:] or result.stdout[-500:], None
+    try:
+        with open(root / PIPELINE_FILES["script_structure"], "r", encoding="utf-8") as f:
+            record = json.load(f).get("budget")
+    except (OSError, json.JSONDecodeError):
+        record = None
+    lines = result.stdout.strip().splitlines()
+    return True, lines[-1] if lines else "", record
+
+
+def run_tts_and_video_generation(tts_engine: str, generate_video: bool, tts_mode: str = "parallel",
+                                 task_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Run TTS (and optionally video) via video_gen.py. Returns output paths.
+    With PUBLIC_BASE_URL/ARTIFACT_SIGNING_KEY set, the video API fetches the audio and face image from this
+    backend through signed URLs for `task_id` instead of a third-party upload.
+    """
     root = _project_root()
     ensure_dirs(root)
     env = os.environ.copy()
@@ -244,14 +510,17 @@ def run_tts_and_video_generation(tts_engine: str, generate_video: bool) -> Dict[
         # video_gen.py skips video generation if WAVESPEED_API_KEY is missing
         env.pop("WAVESPEED_API_KEY", None)
 
-    cmd = ["python3", "video_gen.py", "--tts", tts_engine]
+    cmd = ["python3", "video_gen.py", "--tts", tts_engine, "--tts-mode", tts_mode]
+    if generate_video and task_id:
+        # Signed input URLs (when configured); the WaveSpeed job is tagged with it for resumption
+        cmd += ["--task-id", task_id]
     logger.info(f"TTS/Video: {' '.join(cmd)}")
     result = subprocess.run(
         cmd,
         capture_output=True,
         text=True,
         cwd=str(root / "video_output"),
-        timeout=600,
+        timeout=VIDEO_GEN_TIMEOUT_SECONDS if generate_video else TTS_TIMEOUT_SECONDS,
         env=env,
     )
 
@@ -274,49 +543,143 @@ def run_tts_and_video_generation(tts_engine: str, generate_video: bool) -> Dict[
     }
 
 
-async def run_generation_pipeline(topic: str, tts_engine: str, generate_video: bool, task_id: str):
+async def run_generation_pipeline(topic: str, tts_engine: str, generate_video: bool, task_id: str, reuse: bool = True,
+                                  speculative: bool = SPECULATIVE_DIRECTOR, stream_tts: bool = STREAMING_TTS):
     """Run the complete generation pipeline asynchronously"""
     try:
         active_tasks[task_id] = _init_task(task_id, topic, tts_engine, generate_video)
         logger.info(f"Pipeline {task_id}: Started {topic}")
 
-        # Step 1: Research and Script Generation (Parallel)
-        _set_step(task_id, "research", "running", current_step="research")
-        _set_step(task_id, "draft", "running")
-
-        with ThreadPoolExecutor(max_workers=2) as executor:
-            futures = {
-                executor.submit(run_research_generation, topic): "research",
-                executor.submit(run_script_generation, topic): "draft"
-            }
-
-            for future in as_completed(futures):
-                task_name = futures[future]
-                success, log_msg = future.result()
-                step_key = task_name
-                status = "completed" if success else "failed"
-                _set_step(task_id, step_key, status, log=log_msg)
-                if not success:
-                    _set_failed(task_id, f"{step_key.capitalize()} failed: {log_msg}")
-                    return
-
-        # Step 2: Content Merging
-        _set_step(task_id, "director", "running", current_step="director")
-        success, log_msg = run_content_merging(topic)
+        if reuse and _reuse_pipeline_artifacts(task_id, topic, tts_engine, generate_video):
+            return
+
+        # Step 1: Research and Script Generation (Parallel); pre-warmed research skips the research stage
+        research_match = _restore_prewarmed_research(task_id, topic) if reuse else None
+        if research_match:
+            _set_step(task_id, "draft", "running", current_step="draft")
+        else:
+            _set_step(task_id, "research", "running", current_step="research")
+            _set_step(task_id, "draft", "running")
+
+        research_started = time.time()
+        speculative_future = None
+        speculative_started = 0.0
+        speculative_context: Optional[Dict[str, Any]] = None
+        speculation: Dict[str, Any] = {}
+        # Awaited, never blocked on: /status and the audio stream are served meanwhile. No `with`, since
+        # its exit would block the loop until a step still running after another one failed has finished.
+        executor = ThreadPoolExecutor(max_workers=3)
+        try:
+            futures = {asyncio.wrap_future(executor.submit(run_script_generation, topic)): "draft"}
+            if not research_match:
+                futures[asyncio.wrap_future(executor.submit(run_research_generation, topic))] = "research"
+
+            pending = set(futures)
+            while pending:
+                done, pending = await asyncio.wait(pending, timeout=1.0, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    task_name = futures[future]
+                    success, log_msg = future.result()
+                    step_key = task_name
+                    status = "completed" if success else "failed"
+                    _set_step(task_id, step_key, status, log=log_msg)
+                    if not success:
+                        _set_failed(task_id, f"{step_key.capitalize()} failed: {log_msg}")
+                        return
+                    if step_key == "research":
+                        active_tasks[task_id]["topic_match"]["research"] = _research_reuse_info(_project_root())
+
+                # Draft done, research still running: start the Director on a quorum of agents
+                draft_done = all(futures[f] != "draft" for f in pending)
+                if speculative and speculative_future is None and pending and draft_done:
+                    partial = _partial_research(topic, research_started)
+                    if partial:
+                        speculative_context = pack_research_context(partial)
+                        context_path = _write_context(speculative_context, "speculative_context.json")
+                        ready = sorted(a for a, d in partial["agents"].items() if d.get("status") == "success")
+                        speculation = {"agents": ready, "started_after": round(time.time() - research_started, 1)}
+                        speculative_started = time.time()
+                        _set_step(task_id, "director", "running", current_step="director",
+                                  log=f"Speculative start on {', '.join(ready)}")
+                        speculative_future = executor.submit(run_content_merging, topic, context_path)
+                        speculative_future.add_done_callback(lambda f: speculation.update(finished=time.time()))
+
+            # Step 2: Content Merging (accept the speculative result unless the late agent adds material facts)
+            _set_step(task_id, "director", "running", current_step="director")
+            success, log_msg = False, ""
+            if speculative_future is not None:
+                research_done = time.time()
+                spec_ok, spec_log = await asyncio.wrap_future(speculative_future)
+                speculative_done = speculation.pop("finished", time.time())
+                full_context = pack_research_context(_load_research(_project_root()))
+                changed, diff = material_change(speculative_context, full_context)
+                speculation.update(diff, accepted=spec_ok and not changed)
+                if speculation["accepted"]:
+                    # Critical-path time saved: the part of the Director run that overlapped research
+                    speculation["saved_seconds"] = round(min(research_done, speculative_done) - speculative_started, 1)
+                    success, log_msg = True, f"Speculative result accepted ({diff['new_terms']} new terms from late agent)"
+                else:
+                    logger.info(f"Pipeline {task_id}: re-running Director (speculative ok={spec_ok}, {diff}) {spec_log}")
+                active_tasks[task_id]["speculation"] = speculation
+        finally:
+            executor.shutdown(wait=False)
+
+        stream_started: Optional[float] = None
+        if not success:
+            if stream_tts:
+                stream_started = time.time()
+                active_tasks[task_id]["streaming"] = {"status": "streaming", "started_at": stream_started}
+                _set_step(task_id, "tts", "running", log="Streaming sentences as the Director writes")
+            # Off the event loop, so /tasks/{id}/audio/stream can serve audio while the Director runs
+            success, log_msg = await asyncio.to_thread(
+                run_content_merging, topic, prewarmed_context(_topic_index(), research_match),
+                tts_engine if stream_tts else None,
+            )
+            if success and speculation:
+                log_msg = f"Re-ran on full research ({speculation['new_terms']} new terms from late agent)"
         status = "completed" if success else "failed"
         _set_step(task_id, "director", status, log=log_msg)
         if not success:
             _set_failed(task_id, f"Director failed: {log_msg}")
             return
 
-        # Step 3: TTS (and optionally video)
+        # Streamed narration is already audio; the budget can no longer shorten it
+        manifest = _stream_manifest() if stream_started else None
+        if manifest and manifest.get("started_at", 0) < stream_started:
+            manifest = None  # left over from an earlier run
+        streamed = bool(manifest and manifest.get("status") == "complete")
+        if manifest:
+            active_tasks[task_id]["streaming"] = _streaming_summary(manifest)
+
+        # Step 3: Speaking-time budget (an overlong script multiplies TTS and video cost)
+        if streamed:
+            _set_step(task_id, "budget", "skipped", log="Narration was synthesized while streaming")
+        else:
+            _set_step(task_id, "budget", "running", current_step="budget")
+            ok, log_msg, record = run_budget_enforcement()
+            active_tasks[task_id]["budget"] = record
+            # Not fatal: without a budget pass the script is simply synthesized as written
+            _set_step(task_id, "budget", "completed" if ok else "skipped", log=log_msg)
+
+        # Step 4: TTS (and optionally video)
         _set_step(task_id, "tts", "running", current_step="tts")
+        tts_started: Optional[float] = None
+        if not streamed:
+            # Paragraph-parallel TTS appends to output.mp3 in order and keeps the stream manifest current
+            tts_started = time.time()
+            active_tasks[task_id]["streaming"] = {"status": "streaming", "started_at": tts_started}
         if generate_video:
             _set_step(task_id, "video", "running")
+            active_tasks[task_id]["preview"] = {"status": "pending", "since": time.time()}
         else:
             _set_step(task_id, "video", "skipped")
 
-        out = run_tts_and_video_generation(tts_engine, generate_video)
+        out = await asyncio.to_thread(
+            run_tts_and_video_generation, tts_engine, generate_video, "streamed" if streamed else "parallel", task_id
+        )
+        manifest = _stream_manifest() if tts_started else None
+        if manifest and manifest.get("started_at", 0) >= tts_started:
+            active_tasks[task_id]["streaming"] = _streaming_summary(manifest)
         tts_status = "completed" if out.get("ok") else "failed"
         tts_log = out.get("log", "")
         _set_step(task_id, "tts", tts_status, log=tts_log)
@@ -330,13 +693,7 @@ async def run_generation_pipeline(topic: str, tts_engine: str, generate_video: b
 
         # Success
         root = _project_root()
-        files = {
-            "research": "research_outputs/kestra_output.json",
-            "script": "research_outputs/finetuned_script.txt",
-            "final_script": "research_outputs/final_5min_script.md",
-            "tts_text": "research_outputs/tts.txt",
-            "tts_audio": "video_output/generated_tts/output.mp3",
-        }
+        files = dict(PIPELINE_FILES)
         video_rel: Optional[str] = None
         if out.get("video_path"):
             # Try to convert to project-relative path
@@ -347,24 +704,125 @@ async def run_generation_pipeline(topic: str, tts_engine: str, generate_video: b
             files["video"] = video_rel
 
         task = active_tasks.get(task_id, {})
+        _refresh_preview(task)
         task["status"] = "completed"
         task["current_step"] = "completed"
-        task["files"] = files
+        # The preview is not archived for reuse: it only bridges the wait for the avatar video
+        task["files"] = {**files, "preview": PREVIEW_FILE} if task.get("preview", {}).get("status") == "ready" else files
         task["updated_at"] = datetime.now().isoformat()
         logger.info(f"Pipeline {task_id}: Completed")
+        try:
+            _archive_pipeline_artifacts(topic, tts_engine, files)
+        except Exception as e:
+            logger.warning(f"Pipeline {task_id}: could not archive artifacts for reuse: {e}")
 
     except Exception as e:
         logger.error(f"Pipeline {task_id}: Unexpected error: {str(e)}")
         _set_failed(task_id, f"Unexpected error: {str(e)}")
 
 
+prewarmer = ResearchPrewarmer(_project_root(), _topic_index(), active_tasks, _pipeline_busy)
+
+
+@app.on_event("startup")
+async def start_prewarmer():
+    """Pre-warm research for scheduled/popular topics in the background"""
+    if PREWARM_INTERVAL_MINUTES > 0:
+        app.state.prewarm_task = asyncio.create_task(prewarmer.run_forever())
+
+
+def _resumed_task(request_id: str, job: Dict[str, Any]) -> str:
+    """
+    Task that /status reports a resumed prediction under: the task that submitted it (video_gen.py --task-id
+    tags the job), recreated since tasks do not survive a restart, or "resumed-<id>" for untagged jobs.
+    """
+    task_id = job.get("task_id") or f"resumed-{request_id[:8]}"
+    if task_id not in active_tasks:
+        task = active_tasks[task_id] = _init_task(task_id, "", "", True)
+        for step_key, step in task["steps"].items():
+            if step_key != "video":
+                step.update(status="completed", log="Before the backend restart")
+        task["current_step"] = "video"
+    _set_step(task_id, "video", "running", log=f"Resuming WaveSpeed job {request_id} after a backend restart")
+    return task_id
+
+
+async def _resume_video_jobs(manager: VideoJobManager, request_ids: list):
+    """Await predictions left behind by a previous backend process and download finished videos."""
+    logger.info(f"Resuming {len(request_ids)} WaveSpeed job(s): {', '.join(request_ids)}")
+    tasks = {request_id: _resumed_task(request_id, manager.jobs[request_id]) for request_id in request_ids}
+    remaining = {task_id: list(tasks.values()).count(task_id) for task_id in tasks.values()}
+    for request_id, result in (await manager.wait_all(request_ids)).items():
+        task_id = tasks[request_id]
+        if isinstance(result, Exception):
+            logger.warning(f"WaveSpeed job {request_id} did not finish: {result}")
+            _set_step(task_id, "video", "failed", log=str(result))
+            _set_failed(task_id, f"Resumed WaveSpeed job {request_id} did not finish: {result}")
+            continue
+        video_rel = f"video_output/generated_video/generated_video_{int(time.time())}_{request_id[:8]}.mp4"
+        try:
+            await asyncio.to_thread(ranged_download, result, str(_project_root() / video_rel))
+            logger.info(f"WaveSpeed job {request_id} resumed → {video_rel}")
+        except (DownloadError, requests.RequestException, OSError) as e:
+            logger.warning(f"WaveSpeed job {request_id}: download failed: {e}")
+            _set_step(task_id, "video", "failed", log=str(e))
+            _set_failed(task_id, f"Download of resumed WaveSpeed job {request_id} failed: {e}")
+            continue
+        task = active_tasks[task_id]
+        # Segment renders resume as several jobs of one task; their videos are listed, not joined
+        videos = task["files"].setdefault("resumed_videos", [])
+        videos.append(video_rel)
+        remaining[task_id] -= 1
+        if not remaining[task_id] and task["status"] != "failed":
+            if len(videos) == 1:
+                task["files"]["video"] = video_rel
+            _set_step(task_id, "video", "completed", current_step="completed")
+            task["status"] = "completed"
+
+
+@app.on_event("startup")
+async def resume_video_jobs():
+    """Pick up WaveSpeed predictions whose video_gen.py process died with the previous backend"""
+    if not os.environ.get("WAVESPEED_API_KEY"):
+        return
+    manager = VideoJobManager(str(_project_root() / WAVESPEED_JOBS), api_key=os.environ["WAVESPEED_API_KEY"])
+    pending = manager.orphaned()
+    if pending:
+        app.state.video_resume_task = asyncio.create_task(_resume_video_jobs(manager, pending))
+
+
+@app.post("/webhooks/wavespeed")
+async def wavespeed_webhook(payload: Dict[str, Any], token: str = "", expires: int = 0, sig: str = ""):
+    """
+    WaveSpeed completion callback (set WAVESPEED_WEBHOOK_URL to {PUBLIC_BASE_URL}/webhooks/wavespeed).
+    The job manager registers it with a per-job token and HMAC signature (ARTIFACT_SIGNING_KEY); only
+    verified callbacks for the prediction that token belongs to, still being waited on, are accepted.
+    The job manager in video_gen.py picks them up from disk.
+    """
+    if not verify_signature(WEBHOOK_SIGNED_PATH.format(token=token), expires, sig):
+        raise HTTPException(status_code=403, detail="Invalid or expired signature")
+    data = payload.get("data", payload)
+    store = _project_root() / WAVESPEED_JOBS
+    try:
+        jobs = json.loads(store.read_text())
+    except (OSError, ValueError):
+        jobs = {}
+    job = jobs.get(str(data.get("id")))
+    if not job or job.get("status") in ("completed", "failed", "timed_out"):
+        raise HTTPException(status_code=404, detail="Unknown prediction")
+    if not token or job.get("webhook_token") != token:
+        raise HTTPException(status_code=403, detail="Token does not belong to this prediction")
+    record_webhook_event(str(store), payload)
+    return {"ok": True}
+
+
 @app.post("/generate", response_model=GenerationResponse)
 async def generate_content(request: GenerationRequest, background_tasks: BackgroundTasks):
     """Start content generation pipeline"""
     task_id = str(uuid.uuid4())
 
     # Start background task
-    background_tasks.add_task(run_generation_pipeline, request.topic, request.tts_engine, request.generate_video, task_id)
+    background_tasks.add_task(run_generation_pipeline, request.topic, request.tts_engine, request.generate_video, task_id, request.reuse, request.speculative, request.stream_tts)
 
     return GenerationResponse(
         task_id=task_id,
@@ -373,25 +831,85 @@ async def generate_content(request: GenerationRequest, background_tasks: Backgro
     )
 
 
+def _refresh_preview(task: Dict[str, Any]):
+    """Mark this run's preview video as ready once video_gen.py has written it (files.preview)."""
+    preview = task.get("preview")
+    if not preview or preview["status"] != "pending":
+        return
+    path = _project_root() / PREVIEW_FILE
+    try:
+        written = path.stat().st_mtime
+    except OSError:
+        return
+    if written >= preview["since"]:
+        # Seconds from the start of the TTS/video step (TTS included) until the preview existed
+        preview.update(status="ready", ready_seconds=round(written - preview["since"], 1))
+        task.setdefault("files", {})["preview"] = PREVIEW_FILE
+
+
 @app.get("/status/{task_id}")
 async def get_status(task_id: str):
     """Check generation status"""
     if task_id not in active_tasks:
         raise HTTPException(status_code=404, detail="Task not found")
 
+    _refresh_preview(active_tasks[task_id])
     return active_tasks[task_id]
 
 
-@app.get("/download/{file_path:path}")
-async def download_file(file_path: str):
-    """Download generated files"""
+def _strong_etag(path: Path, stat: os.stat_result) -> str:
+    """Content hash ETag, recomputed only when the file's mtime or size changes."""
+    cached = _etags.get(str(path))
+    if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        _etags.move_to_end(str(path))
+        return cached[2]
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            sha.update(block)
+    # Full digest with an explicit prefix: a bare 32-hex tag reads as an S3-style MD5 to download clients
+    etag = f'"sha256-{sha.hexdigest()}"'
+    _etags[str(path)] = (stat.st_mtime_ns, stat.st_size, etag)
+    _etags.move_to_end(str(path))
+    while len(_etags) > ETAG_CACHE_SIZE:
+        _etags.popitem(last=False)
+    return etag
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match check: "*" or any listed tag equal to `etag` under weak comparison (W/ ignored)."""
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags)
+
+
+async def _file_response(request: Request, disk_path: Path, filename: str, immutable: bool = False) -> Response:
+    """
+    FileResponse with a strong content-hash ETag (If-None-Match -> 304), the file's media type and
+    Cache-Control. Range and If-Range (206, 416, multipart ranges) are handled by FileResponse itself.
+    """
+    stat = disk_path.stat()
+    etag = await asyncio.to_thread(_strong_etag, disk_path, stat)
+    headers = {"ETag": etag, "Cache-Control": CACHE_IMMUTABLE if immutable else CACHE_REVALIDATE}
+    if _etag_matches(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=304, headers=headers)
+    media_type = DOWNLOAD_MEDIA_TYPES.get(disk_path.suffix, "application/octet-stream")
+    return FileResponse(path=disk_path, filename=filename, media_type=media_type, headers=headers,
+                        stat_result=stat)
+
+
+@app.api_route("/download/{file_path:path}", methods=["GET", "HEAD"])
+async def download_file(file_path: str, request: Request):
+    """Download generated files (byte ranges, ETag revalidation and caching headers for media seeking)"""
     # Security: only allow specific file types and paths
     allowed_files = [
         "research_outputs/kestra_output.json",
         "research_outputs/finetuned_script.txt",
         "research_outputs/final_5min_script.md",
+        "research_outputs/final_5min_script.json",
         "research_outputs/tts.txt",
-        "video_output/generated_tts/output.mp3"
+        "video_output/generated_tts/output.mp3",
+        STREAM_MANIFEST,
+        PREVIEW_FILE,
     ]
 
     # Allow generated videos (pattern) if present
@@ -408,13 +926,103 @@ async def download_file(file_path: str):
     if not disk_path.exists():
         raise HTTPException(status_code=404, detail="File not found")
 
-    return FileResponse(
-        path=disk_path,
-        filename=file_path.split('/')[-1],
-        media_type='application/octet-stream'
+    return await _file_response(request, disk_path, file_path.split('/')[-1], immutable=is_generated_video)
+
+
+@app.api_route("/artifacts/{task_id}/{name}", methods=["GET", "HEAD"])
+async def signed_artifact(task_id: str, name: str, expires: int = 0, sig: str = ""):
+    """
+    Serve a running task's render input (audio, face image) to the video API.
+    Requires a valid, unexpired HMAC signature for "{task_id}/{name}" (kestra/signed_urls.py).
+    """
+    if not verify_signature(f"{task_id}/{name}", expires, sig):
+        raise HTTPException(status_code=403, detail="Invalid or expired signature")
+    is_segment = bool(SEGMENT_ARTIFACT.fullmatch(name))
+    if (name not in SIGNED_ARTIFACTS and not is_segment) or task_id not in active_tasks:
+        raise HTTPException(status_code=404, detail="Artifact not found")
+    # The files are shared between runs: only the task that is currently rendering may read them
+    if active_tasks[task_id]["status"] != "running":
+        raise HTTPException(status_code=410, detail="Task is no longer running")
+
+    file_path, media_type = (f"{SEGMENTS_DIR}/{name}", "audio/mpeg") if is_segment else SIGNED_ARTIFACTS[name]
+    disk_path = _project_root() / file_path
+    if not disk_path.exists():
+        raise HTTPException(status_code=404, detail="File not found")
+    return FileResponse(path=disk_path, filename=name, media_type=media_type)
+
+
+def _streaming_summary(manifest: Dict[str, Any]) -> Dict[str, Any]:
+    """Task-level view of a stream manifest (without the per-chunk list)."""
+    summary = {k: manifest.get(k) for k in ("status", "started_at", "first_audio_seconds", "audio_seconds", "wall_seconds")}
+    summary["chunks"] = len(manifest.get("chunks", []))
+    return summary
+
+
+def _audio_stream_state(task: Dict[str, Any]) -> Tuple[Optional[int], bool]:
+    """
+    (bytes of output.mp3 safe to send, finished?) for a task.
+
+    Both the Director's sentence streaming and the paragraph-parallel TTS step append to output.mp3 in
+    speaking order and record the committed bytes (whole MP3 frames) in the stream manifest; only those
+    are sent. Without a manifest from this task's run (e.g. single-request TTS), the file is served once
+    the TTS step has completed. (None, True) means nothing to serve.
+    """
+    if task["status"] == "failed":
+        return None, True  # a manifest left "streaming" by the failed run would never complete
+    streaming = task.get("streaming") or {}
+    if streaming.get("started_at"):
+        manifest = _stream_manifest()
+        if manifest and manifest.get("started_at", 0) >= streaming["started_at"]:
+            if manifest.get("status") == "failed":
+                return None, True  # TTS is redone from tts.txt; the partial stream cannot be continued
+            return manifest.get("audio_bytes", 0), manifest.get("status") == "complete"
+    if task["steps"]["tts"]["status"] == "completed":
+        audio = _project_root() / PIPELINE_FILES["tts_audio"]
+        return (audio.stat().st_size if audio.exists() else None), True
+    return 0, False
+
+
+@app.get("/tasks/{task_id}/audio/stream")
+async def stream_task_audio(task_id: str):
+    """Progressive MP3 (chunked transfer) of a task's narration, sent as it is synthesized"""
+    if task_id not in active_tasks:
+        raise HTTPException(status_code=404, detail="Task not found")
+    audio_path = _project_root() / PIPELINE_FILES["tts_audio"]
+
+    async def tail():
+        sent = 0
+        deadline = time.time() + AUDIO_STREAM_TIMEOUT
+        while time.time() < deadline:
+            limit, done = _audio_stream_state(active_tasks[task_id])
+            if limit is None:
+                return
+            if limit > sent:
+                with open(audio_path, "rb") as f:
+                    f.seek(sent)
+                    while sent < limit:
+                        data = f.read(min(AUDIO_STREAM_CHUNK, limit - sent))
+                        if not data:
+                            break
+                        sent += len(data)
+                        yield data
+            if done:
+                return
+            await asyncio.sleep(AUDIO_STREAM_POLL_SECONDS)
+        logger.warning(f"Audio stream {task_id}: timed out after {sent} bytes")
+
+    return StreamingResponse(
+        tail(),
+        media_type="audio/mpeg",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
+@app.get("/prewarm")
+async def prewarm_status():
+    """Background research pre-warming status and pending topics"""
+    return {**prewarmer.state, "pending": await asyncio.to_thread(prewarmer.candidates)}
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
@@ -425,7 +1033,7 @@ async def health_check():
 async def test_pipeline(request: GenerationRequest):
     """Test endpoint (sync for debugging; remove for prod)"""
     task_id = str(uuid.uuid4())
-    await run_generation_pipeline(request.topic, request.tts_engine, request.generate_video, task_id)
+    await run_generation_pipeline(request.topic, request.tts_engine, request.generate_video, task_id, request.reuse, request.speculative, request.stream_tts)
     return active_tasks.get(task_id, {"error": "Task not found"})
 
 
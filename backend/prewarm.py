@@ -0,0 +1,214 @@
+"""
+Background research pre-warming for the backend.
+
+Research normally runs on the critical path after a user clicks generate. The
+ResearchPrewarmer periodically researches scheduled and popular topics ahead
+of time, while no pipeline is running, and stores the results (plus the
+packed Director context) in the shared topic index, so the first request for
+one of those topics restores research instead of computing it.
+
+Topics come from:
+- PREWARM_TOPICS: ";"-separated list
+- PREWARM_TOPICS_FILE: one topic per line (default research_outputs/prewarm_topics.txt)
+- request history: topics requested at least PREWARM_MIN_REQUESTS times
+
+Research runs through the local research script in batch mode with only
+PREWARM_RATE_SHARE of every provider's rate limit, so user requests keep the
+bulk of the provider budget.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import subprocess
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from provider_limits import scaled_limits_spec
+from research_context import pack_research_context
+from topic_index import TopicIndex, canonical_topic
+
+logger = logging.getLogger(__name__)
+
+PREWARM_INTERVAL_MINUTES = float(os.environ.get("PREWARM_INTERVAL_MINUTES", "60"))  # 0 disables
+PREWARM_REFRESH_HOURS = float(os.environ.get("PREWARM_REFRESH_HOURS", "24"))
+PREWARM_RATE_SHARE = float(os.environ.get("PREWARM_RATE_SHARE", "0.5"))
+PREWARM_MIN_REQUESTS = int(os.environ.get("PREWARM_MIN_REQUESTS", "2"))
+PREWARM_HISTORY_TOP = int(os.environ.get("PREWARM_HISTORY_TOP", "5"))
+PREWARM_BATCH_SIZE = 4
+IDLE_POLL_SECONDS = 5.0
+
+
+class ResearchPrewarmer:
+    def __init__(self, root: Path, index: TopicIndex, tasks: Dict[str, Dict], is_busy: Callable[[], bool]):
+        self.root = root
+        self.index = index
+        self.tasks = tasks
+        self.is_busy = is_busy
+        self.state: Dict[str, Any] = {
+            "enabled": PREWARM_INTERVAL_MINUTES > 0,
+            "running": False,
+            "last_run": None,
+            "last_topics": [],
+            "warmed": 0,
+            "failed": 0,
+        }
+
+    def scheduled_topics(self) -> List[str]:
+        topics = [t.strip() for t in os.environ.get("PREWARM_TOPICS", "").split(";") if t.strip()]
+        topics_file = Path(os.environ.get("PREWARM_TOPICS_FILE", self.root / "research_outputs" / "prewarm_topics.txt"))
+        if topics_file.exists():
+            with open(topics_file, "r", encoding="utf-8") as f:
+                topics += [line.strip() for line in f if line.strip() and not line.strip().startswith("#")]
+        return topics
+
+    def popular_topics(self) -> List[str]:
+        """Most requested topics (by canonical form) in the task history."""
+        counts: Counter = Counter()
+        latest: Dict[str, str] = {}
+        for task in list(self.tasks.values()):
+            canonical = canonical_topic(task["topic"])
+            counts[canonical] += 1
+            latest[canonical] = task["topic"]
+        return [latest[c] for c, n in counts.most_common(PREWARM_HISTORY_TOP) if n >= PREWARM_MIN_REQUESTS]
+
+    def candidates(self) -> List[str]:
+        """Scheduled + popular topics whose research (or packed context) is missing or older than the refresh age."""
+        max_age = PREWARM_REFRESH_HOURS * 3600
+        seen, topics = set(), []
+        for topic in self.scheduled_topics() + self.popular_topics():
+            canonical = canonical_topic(topic)
+            if canonical in seen:
+                continue
+            seen.add(canonical)
+            if self.index.match(topic, "research", max_age=max_age) and self.index.match(topic, "context", max_age=max_age):
+                continue
+            topics.append(topic)
+        return topics
+
+    def _wait_until_idle(self):
+        while self.is_busy():
+            time.sleep(IDLE_POLL_SECONDS)
+
+    @staticmethod
+    def _stop(process: subprocess.Popen):
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+    def _research(self, topics: List[str]) -> bool:
+        """
+        Research `topics` with the batch script at a reduced share of the provider rate limits.
+
+        The share only holds while no pipeline runs (the subprocess has its own buckets), so the batch is
+        stopped as soon as a user task starts. Returns False if it was stopped that way; topics the batch
+        finished before that are already indexed.
+        """
+        work_dir = self.root / "research_outputs" / "prewarm"
+        work_dir.mkdir(parents=True, exist_ok=True)
+        batch_file = work_dir / "topics.txt"
+        batch_file.write_text("\n".join(topics) + "\n", encoding="utf-8")
+        env = os.environ.copy()
+        env["PROVIDER_RATE_LIMITS"] = scaled_limits_spec(PREWARM_RATE_SHARE)
+        cmd = [
+            "python3", str(self.root / "kestra" / "generate_kestra_output.py"),
+            "--batch-file", str(batch_file), "--batch-workers", "1",
+            "--output-dir", str(self.root / "research_outputs"),
+            "--reuse-max-age-hours", str(PREWARM_REFRESH_HOURS),
+        ]
+        log_path = work_dir / "research.log"
+        deadline = time.time() + 300 * len(topics)
+        with open(log_path, "w", encoding="utf-8") as log:
+            process = subprocess.Popen(cmd, stdout=log, stderr=subprocess.STDOUT, cwd=str(self.root / "kestra"), env=env)
+            interrupted = timed_out = False
+            while process.poll() is None:
+                interrupted, timed_out = self.is_busy(), time.time() > deadline
+                if interrupted or timed_out:
+                    self._stop(process)
+                    break
+                try:
+                    process.wait(timeout=IDLE_POLL_SECONDS)
+                except subprocess.TimeoutExpired:
+                    pass
+        if interrupted:
+            logger.info(f"Prewarm research paused for a user task: {topics}")
+            return False
+        if timed_out:
+            logger.warning(f"Prewarm research timed out for {topics}")
+        elif process.returncode != 0:
+            tail = log_path.read_text(encoding="utf-8", errors="replace")[-500:]
+            logger.warning(f"Prewarm research failed for some of {topics}: {tail}")
+        return True
+
+    def _store_context(self, topic: str) -> bool:
+        """Pack the Director context for the topic's indexed research and index it as kind "context"."""
+        match = self.index.match(topic, "research", max_age=PREWARM_REFRESH_HOURS * 3600)
+        if not match:
+            return False
+        research_path = self.index.resolve(match["paths"]["research"])
+        with open(research_path, "r", encoding="utf-8") as f:
+            context = pack_research_context(json.load(f))
+        context_path = self.root / "research_outputs" / "topics" / f"{match['canonical']}.context.json"
+        context_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(context_path, "w", encoding="utf-8") as f:
+            json.dump(context, f, indent=2, ensure_ascii=False)
+        self.index.record(match["topic"], "context", {"context": self.index.relative(str(context_path))},
+                          {"research": match["paths"]["research"]})
+        return True
+
+    def run_once(self) -> Dict[str, Any]:
+        """Warm every current candidate, a few topics at a time, only while no pipeline is running."""
+        topics = self.candidates()
+        if not topics:
+            return self.state
+        self.state["running"] = True
+        self.state["last_topics"] = topics
+        start = time.time()
+        max_age = PREWARM_REFRESH_HOURS * 3600
+        pending = list(topics)
+        try:
+            while pending:
+                chunk, pending = pending[:PREWARM_BATCH_SIZE], pending[PREWARM_BATCH_SIZE:]
+                self._wait_until_idle()
+                finished = self._research(chunk)
+                for topic in chunk:
+                    if not finished and not self.index.match(topic, "research", max_age=max_age):
+                        pending.append(topic)  # interrupted by a user task: retry once idle again
+                        continue
+                    try:
+                        ok = self._store_context(topic)
+                    except (OSError, ValueError, KeyError) as e:
+                        logger.warning(f"Prewarm context for '{topic}' failed: {e}")
+                        ok = False
+                    self.state["warmed" if ok else "failed"] += 1
+        finally:
+            self.state["running"] = False
+            self.state["last_run"] = datetime.now().isoformat()
+        logger.info(f"Prewarmed research for {len(topics)} topics in {time.time() - start:.1f}s")
+        return self.state
+
+    async def run_forever(self):
+        while True:
+            try:
+                await asyncio.to_thread(self.run_once)
+            except Exception as e:
+                logger.error(f"Prewarm run failed: {e}")
+            await asyncio.sleep(PREWARM_INTERVAL_MINUTES * 60)
+
+
+def prewarmed_context(index: TopicIndex, research_match: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Path of the packed Director context built from exactly this research, if one exists."""
+    if not research_match:
+        return None
+    match = index.match(research_match["topic"], "context")
+    if not match or match["meta"].get("research") != research_match["paths"].get("research"):
+        return None
+    path = index.resolve(match["paths"]["context"])
+    return path if os.path.exists(path) else None
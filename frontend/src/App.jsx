@@ -84,7 +84,9 @@ function App() {
           }
 
           const audioUrl = files.tts_audio ? `${API_BASE}/download/${encodeURI(files.tts_audio)}` : null
-          const videoUrl = files.video ? `${API_BASE}/download/${encodeURI(files.video)}` : null
+          // The local preview stands in if the avatar video did not arrive
+          const videoFile = files.video || files.preview
+          const videoUrl = videoFile ? `${API_BASE}/download/${encodeURI(videoFile)}` : null
 
           setGeneratedContent({
             title,
@@ -187,6 +189,16 @@ function App() {
                   content={generatedContent}
                   isGenerating={isGenerating}
                   pipeline={pipeline}
+                  liveAudioUrl={
+                    taskId && pipeline?.streaming
+                      ? `${API_BASE}/tasks/${taskId}/audio/stream`
+                      : null
+                  }
+                  previewUrl={
+                    pipeline?.files?.preview
+                      ? `${API_BASE}/download/${encodeURI(pipeline.files.preview)}`
+                      : null
+                  }
                   onBack={handleBackToHero}
                 />
               </motion.div>
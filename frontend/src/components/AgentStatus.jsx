@@ -1,14 +1,15 @@
 import { useMemo } from 'react'
 // eslint-disable-next-line no-unused-vars
 import { motion } from 'framer-motion'
-import { CheckCircle2, Clock3, AlertTriangle, BookOpen, GraduationCap, Film, AudioLines, Video } from 'lucide-react'
+import { CheckCircle2, Clock3, AlertTriangle, BookOpen, GraduationCap, Film, Timer, AudioLines, Video } from 'lucide-react'
 
-const STEP_ORDER = ['research', 'draft', 'director', 'tts', 'video']
+const STEP_ORDER = ['research', 'draft', 'director', 'budget', 'tts', 'video']
 
 const STEP_ICONS = {
   research: BookOpen,
   draft: GraduationCap,
   director: Film,
+  budget: Timer,
   tts: AudioLines,
   video: Video,
 }
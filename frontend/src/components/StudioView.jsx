@@ -4,7 +4,7 @@ import { motion } from 'framer-motion'
 import { Play, Copy, Send, Eye, ThumbsUp, Clock, User, ArrowLeft } from 'lucide-react'
 import AgentStatus from './AgentStatus'
 
-const StudioView = ({ content, isGenerating, pipeline, onBack }) => {
+const StudioView = ({ content, isGenerating, pipeline, liveAudioUrl, previewUrl, onBack }) => {
   const [refineInput, setRefineInput] = useState('')
 
   const handleCopyScript = () => {
@@ -46,8 +46,24 @@ const StudioView = ({ content, isGenerating, pipeline, onBack }) => {
               transition={{ duration: 0.6 }}
               className="relative aspect-video bg-gray-100 rounded-xl overflow-hidden border border-gray-200 shadow-lg"
             >
-              {isGenerating ? (
-                <AgentStatus pipeline={pipeline} />
+              {isGenerating && previewUrl ? (
+                // Local still-image preview while the avatar video renders
+                <>
+                  <video className="absolute inset-0 w-full h-full object-cover" src={previewUrl} autoPlay controls />
+                  <div className="absolute top-4 left-4 bg-gray-900 px-2 py-1 rounded text-xs font-montserrat text-white border border-gray-700">
+                    Preview · avatar video rendering…
+                  </div>
+                </>
+              ) : isGenerating ? (
+                <>
+                  <AgentStatus pipeline={pipeline} />
+                  {liveAudioUrl && (
+                    // Narration streams in while the script is still being written
+                    <div className="absolute bottom-4 left-4 right-4">
+                      <audio className="w-full" src={liveAudioUrl} autoPlay controls />
+                    </div>
+                  )}
+                </>
               ) : content ? (
                 <>
                   {content.videoUrl ? (
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Locking and atomic writes for small JSON stores shared by several processes.
+
+The topic index and the WaveSpeed job store are read-modify-written by the
+backend, its worker threads and the pipeline scripts it spawns. Every update
+must hold one lock across all of them and re-read the file inside it:
+
+    with locked(path):
+        data = load_json(path)
+        data[key] = value
+        write_json_atomic(path, data)
+
+locked() takes a per-path threading lock (threads of one process) and an
+exclusive flock on "<path>.lock" (other processes; POSIX only).
+"""
+
+import json
+import os
+import threading
+import uuid
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: threads of one process are still serialized
+    fcntl = None
+
+_locks = {}
+_locks_guard = threading.Lock()
+
+
+def _thread_lock(path):
+    with _locks_guard:
+        return _locks.setdefault(os.path.abspath(path), threading.Lock())
+
+
+@contextmanager
+def locked(path):
+    """Exclusive lock on `path` across threads and processes."""
+    with _thread_lock(path):
+        if fcntl is None:
+            yield
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(f"{path}.lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def load_json(path, default=None):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {} if default is None else default
+
+
+def write_json_atomic(path, data, indent=2):
+    """Write via a uniquely named temp file and rename, so readers never see half a file."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=indent, ensure_ascii=False)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
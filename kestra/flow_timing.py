@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Compare execution times of a Kestra flow across flow revisions.
+
+Reads finished executions from the Kestra executions search API and prints the
+count, mean and median duration per flow revision, so the effect of a flow
+change (e.g. moving to the prebuilt research runtime) can be measured.
+
+Usage:
+    python3 flow_timing.py --url http://localhost:8080
+    python3 flow_timing.py --flow multi-agent-research --namespace dev --size 200
+"""
+
+import argparse
+import re
+import statistics
+import sys
+from collections import defaultdict
+
+import requests
+
+_DURATION = re.compile(r"PT(?:(?P<h>[\d.]+)H)?(?:(?P<m>[\d.]+)M)?(?:(?P<s>[\d.]+)S)?")
+
+
+def parse_duration(value):
+    """ISO-8601 duration as returned by Kestra (e.g. "PT1M12.5S") -> seconds."""
+    match = _DURATION.fullmatch(value or "")
+    if not match:
+        return None
+    return sum(float(match.group(unit) or 0) * scale for unit, scale in (("h", 3600), ("m", 60), ("s", 1)))
+
+
+def fetch_executions(url, namespace, flow_id, size, tenant=None):
+    prefix = f"/api/v1/{tenant}" if tenant else "/api/v1"
+    response = requests.get(
+        f"{url.rstrip('/')}{prefix}/executions/search",
+        params={"namespace": namespace, "flowId": flow_id, "size": size, "sort": "state.startDate:desc"},
+        timeout=30,
+    )
+    response.raise_for_status()
+    return response.json().get("results", [])
+
+
+def durations_by_revision(executions, states=("SUCCESS", "WARNING")):
+    revisions = defaultdict(list)
+    for execution in executions:
+        state = execution.get("state") or {}
+        if state.get("current") not in states:
+            continue
+        seconds = parse_duration(state.get("duration"))
+        if seconds is not None:
+            revisions[execution.get("flowRevision")].append(seconds)
+    return revisions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kestra flow execution time per revision")
+    parser.add_argument("--url", default="http://localhost:8080", help="Kestra server URL")
+    parser.add_argument("--tenant", default=None, help="Kestra tenant id, if any")
+    parser.add_argument("--namespace", default="dev")
+    parser.add_argument("--flow", default="multi-agent-research")
+    parser.add_argument("--size", type=int, default=100, help="Number of recent executions to read")
+    args = parser.parse_args()
+
+    try:
+        executions = fetch_executions(args.url, args.namespace, args.flow, args.size, args.tenant)
+    except requests.RequestException as e:
+        print(f"❌ Could not read executions: {e}")
+        return 1
+
+    revisions = durations_by_revision(executions)
+    if not revisions:
+        print(f"⚠️ No finished executions for {args.namespace}.{args.flow}")
+        return 0
+
+    print(f"⏱️ {args.namespace}.{args.flow} execution time by revision")
+    for revision in sorted(revisions, key=lambda r: r or 0):
+        values = revisions[revision]
+        print(f"   rev {revision}: {len(values)} runs, mean {statistics.mean(values):.1f}s, "
+              f"median {statistics.median(values):.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
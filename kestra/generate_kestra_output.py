@@ -3,20 +3,21 @@
 Local development script to replicate the multi-agent-research Kestra flow functionality.
 
 This script performs the same research as the Kestra workflow but runs locally for development/testing.
+The agents themselves live in research_agents.py, which the Kestra flow imports too.
 
 Requirements: pip install -r requirements.txt
 
 Usage: python3 generate_kestra_output.py "The science of why time moves forward"
+       python3 generate_kestra_output.py --batch-file topics.txt
 
 Output: ../research_outputs/kestra_output.json
+        (batch mode: ../research_outputs/<topic-slug>_research.json per topic)
 """
 
 import json
-import urllib.parse
 import os
 import sys
 import time
-from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import argparse
 
@@ -33,6 +34,11 @@ try:
 except ImportError:
     missing_packages.append("python-slugify")
 
+try:
+    import numpy  # noqa: F401 (used by ranking.py)
+except ImportError:
+    missing_packages.append("numpy")
+
 if missing_packages:
     print("❌ Missing required packages:", ", ".join(missing_packages))
     print("Please install them with:")
@@ -44,268 +50,236 @@ if missing_packages:
         print(f"   pip install {pkg}")
     sys.exit(1)
 
-
-def run_historian_research(topic):
-    """Agent A: The Historian - Wikipedia + Wikidata"""
-    print(f"🏛️ Historian researching: {topic}")
+from http_cache import HttpCache, DEFAULT_MAX_BYTES, parse_ttls
+from provider_limits import limiter_stats
+import knowledge_index
+import research_agents as agents
+from research_agents import (
+    fetch_scholar_papers_batch,
+    fetch_wikidata_facts_batch,
+    make_session,
+    research_topic,
+)
+from topic_index import TopicIndex, canonical_topic
+
+# Shared on-disk response cache, configured in main() (None = straight to network)
+research_cache = None
+
+# Previously researched topics (reuse results for rephrasings), configured in main()
+topic_index = None
+REUSE_MAX_AGE_HOURS = float(os.environ.get("TOPIC_REUSE_MAX_AGE_HOURS", 7 * 24))
+reuse_max_age_hours = REUSE_MAX_AGE_HOURS
+
+
+def write_output(data, output_file):
+    """Write research JSON; returns True on success."""
     try:
-        # 1. Wikipedia Summary
-        url = f"https://en.wikipedia.org/api/rest_v1/page/summary/{urllib.parse.quote(topic)}"
-        headers = {'User-Agent': 'VeritasiumHackathonBot/1.0'}
-        response = requests.get(url, headers=headers, timeout=10)
-
-        wiki_result = {}
-        if response.status_code == 200:
-            data = response.json()
-            wiki_result = {
-                "title": data.get("title", ""),
-                "extract": data.get("extract", ""),
-                "url": data.get("content_urls", {}).get("desktop", {}).get("page", "")
-            }
-        else:
-            wiki_result = {"error": "Wikipedia page not found"}
-
-        # 2. Wikidata Facts (SPARQL) - FIXED: Safe string building
-        label_part = topic + '"@en'  # Build label safely
-        sparql_query = """
-        SELECT ?item ?itemLabel ?description WHERE {
-          ?item rdfs:label "%s" .
-          SERVICE wikibase:label { bd:serviceParam wikibase:language "en" . }
-        } LIMIT 1
-        """ % label_part  # % formatting avoids {} conflicts
-
-        sparql_url = "https://query.wikidata.org/sparql"
-        sparql_params = {"query": sparql_query, "format": "json"}
-
-        facts = []
-        try:
-            sparql_response = requests.get(sparql_url, params=sparql_params, timeout=5)
-            if sparql_response.status_code == 200:
-                wikidata = sparql_response.json().get("results", {}).get("bindings", [])
-                facts = [{"label": i["itemLabel"]["value"], "desc": i.get("description", {}).get("value", "")} for i in wikidata]
-        except Exception as e:
-            print(f"Wikidata error: {e}")
-
-        result = {
-            "agent": "Historian",
-            "topic": topic,
-            "extract": wiki_result.get("extract", ""),
-            "wiki_data": wiki_result,
-            "wikidata_facts": facts,
-            "status": "success"
-        }
+        with open(output_file, "w", encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        print(f"✅ SUCCESS: Saved research output to {output_file}")
+        return True
     except Exception as e:
-        result = {
-            "agent": "Historian",
-            "topic": topic,
-            "error": str(e),
-            "status": "failed"
-        }
-    return result
+        print(f"❌ ERROR saving file: {e}")
+        return False
 
 
-def run_skeptic_research(topic):
-    """Agent B: The Skeptic - Stack Exchange + NewsAPI"""
-    print(f"🤔 Skeptic researching: {topic}")
+def write_agent_output(output_dir, agent_name, data):
+    """Publish one agent's result as <output-dir>/<agent>.json as soon as it finishes.
 
+    Written atomically, so a reader polling for partial research never sees half a file.
+    """
+    output_file = os.path.join(output_dir, f"{agent_name}.json")
+    tmp = f"{output_file}.{os.getpid()}.tmp"
     try:
-        all_posts = []
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, output_file)
+    except OSError as e:
+        print(f"⚠️ Could not write {output_file}: {e}")
+
+
+def find_reusable_research(topic, max_age_hours):
+    """Research saved for an equivalent topic (above the similarity threshold), or None."""
+    if topic_index is None:
+        return None
+    match = topic_index.match(topic, "research", max_age=max_age_hours * 3600)
+    if not match:
+        return None
+    try:
+        with open(topic_index.resolve(match["paths"]["research"]), "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, KeyError, json.JSONDecodeError):
+        return None
+    data["reused_from"] = {
+        "topic": match["topic"],
+        "canonical": match["canonical"],
+        "similarity": match["similarity"],
+        "researched_at": data.get("timestamp"),
+    }
+    data["topic"] = topic
+    print(f"♻️ Reusing research for '{match['topic']}' (similarity {match['similarity']:.2f})")
+    return data
 
-        # 1. Stack Exchange
-        stack_sites = ["physics", "skeptics", "science", "astronomy"]
-        for site in stack_sites:
-            try:
-                url = "https://api.stackexchange.com/2.3/search/advanced"
-                params = {
-                    "site": site,
-                    "q": topic,
-                    "sort": "votes",
-                    "pagesize": 2,
-                    "order": "desc",
-                    "filter": "!nNPvSNPH.z"
-                }
-                response = requests.get(url, params=params, timeout=5)
-                if response.status_code == 200:
-                    items = response.json().get("items", [])
-                    for item in items:
-                        all_posts.append({
-                            "source": f"StackExchange ({site})",
-                            "title": item.get("title", ""),
-                            "snippet": item.get("body_markdown", "")[:200] + "...",
-                            "score": item.get("score", 0),
-                            "url": item.get("link", "")
-                        })
-            except Exception as e:
-                print(f"StackExchange error ({site}): {e}")
-                continue
 
-        # 2. NewsAPI (Optional)
-        news_key = os.environ.get("NEWS_API_KEY")
-        if news_key:
-            try:
-                news_url = "https://newsapi.org/v2/everything"
-                news_params = {
-                    "apiKey": news_key,
-                    "q": f"{topic} AND (myth OR misconception OR study)",
-                    "sortBy": "relevancy",
-                    "pageSize": 2,
-                    "language": "en"
-                }
-                resp = requests.get(news_url, params=news_params, timeout=5)
-                if resp.status_code == 200:
-                    articles = resp.json().get("articles", [])
-                    for art in articles:
-                        all_posts.append({
-                            "source": "NewsAPI",
-                            "title": art.get("title", ""),
-                            "snippet": art.get("description", ""),
-                            "url": art.get("url", "")
-                        })
-            except Exception as e:
-                print(f"NewsAPI error: {e}")
-
-        result = {
-            "agent": "Skeptic",
-            "topic": topic,
-            "posts": all_posts,
-            "total_found": len(all_posts),
-            "status": "success"
-        }
+def remember_research(topic, output_file, data):
+    """Index complete research (every agent succeeded) so rephrasings of `topic` can reuse it."""
+    complete = all(status == "success" for status in data.get("summary", {}).values())
+    if topic_index is not None and complete:
+        topic_index.record(topic, "research", {"research": topic_index.relative(output_file)})
 
-    except Exception as e:
-        result = {
-            "agent": "Skeptic",
-            "topic": topic,
-            "error": str(e),
-            "status": "failed"
-        }
 
-    return result
+def load_topics(path):
+    """Topics file: one topic per line; blank lines and # comments ignored, duplicates dropped."""
+    with open(path, "r", encoding="utf-8") as f:
+        topics = [line.strip() for line in f if line.strip() and not line.strip().startswith("#")]
+    return list(dict.fromkeys(topics))
 
 
-def run_professor_research(topic):
-    """Agent C: The Professor - Semantic Scholar"""
-    print(f"🎓 Professor researching: {topic}")
-
-    try:
-        # Semantic Scholar Graph API
-        url = "https://api.semanticscholar.org/graph/v1/paper/search"
-        params = {
-            "query": topic,
-            "limit": 5,
-            "fields": "title,authors,abstract,year,citationCount,openAccessPdf"
-        }
-        headers = {"User-Agent": "VeritasiumHackathonBot/1.0"}
-
-        response = requests.get(url, params=params, headers=headers, timeout=10)
-
-        papers = []
-        if response.status_code == 200:
-            data = response.json().get("data", [])
-            for p in data:
-                if p.get("abstract"):
-                    papers.append({
-                        "title": p.get("title"),
-                        "authors": [a["name"] for a in p.get("authors", [])[:2]],
-                        "abstract": p.get("abstract")[:300] + "...",
-                        "year": p.get("year"),
-                        "citations": p.get("citationCount", 0),
-                        "pdf_url": p.get("openAccessPdf", {}).get("url") if p.get("openAccessPdf") else None
-                    })
-
-        # Sort by citations
-        papers.sort(key=lambda x: x.get('citations', 0), reverse=True)
-
-        result = {
-            "agent": "Professor",
-            "topic": topic,
-            "papers": papers[:3],
-            "total_found": len(papers),
-            "status": "success"
-        }
+def run_batch(topics, output_dir, workers):
+    """Research many topics with shared client/limits, writing one file per topic as each finishes."""
+    print(f"🚀 Starting batch research for {len(topics)} topics ({workers} at a time)")
+    start_time = time.time()
 
-    except Exception as e:
-        result = {
-            "agent": "Professor",
-            "topic": topic,
-            "error": str(e),
-            "status": "failed"
+    completed, failed = 0, 0
+    pending = []
+    for topic in topics:
+        reused = find_reusable_research(topic, reuse_max_age_hours)
+        if reused and write_output(reused, os.path.join(output_dir, f"{slugify(topic)}_research.json")):
+            completed += 1
+        else:
+            pending.append(topic)
+    topics_total = len(topics)
+    topics = pending
+
+    # Batch endpoints first: one SPARQL query and one paper-details call for every topic
+    # (skipping Wikidata for topics the local knowledge index already answers)
+    if agents.historian_mode == "network":
+        wiki_topics = topics
+    elif agents.historian_mode == "index-first":
+        wiki_topics = [t for t in topics if not knowledge_index.lookup(t, agents.knowledge_db)]
+    else:
+        wiki_topics = []
+    wikidata = fetch_wikidata_facts_batch(wiki_topics) if wiki_topics else {}
+    papers = fetch_scholar_papers_batch(topics) if topics else {}
+    print(f"📦 Prefetched Wikidata/Semantic Scholar for {len(topics)} topics in {time.time() - start_time:.1f}s")
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(research_topic, topic, wikidata.get(topic), papers.get(topic)): topic
+            for topic in topics
         }
+        for future in as_completed(futures):
+            topic = futures[future]
+            output_file = os.path.join(output_dir, f"{slugify(topic)}_research.json")
+            try:
+                data = future.result()
+                if research_cache is not None:
+                    data["cache"] = research_cache.stats()
+                data["rate_limits"] = limiter_stats()
+                ok = write_output(data, output_file)
+                if ok:
+                    remember_research(topic, output_file, data)
+            except Exception as e:
+                print(f"❌ {topic}: {e}")
+                ok = False
+            completed += ok
+            failed += not ok
+            elapsed = time.time() - start_time
+            print(f"[{completed + failed}/{topics_total}] {topic} ({completed / elapsed * 60:.1f} topics/min)")
 
-    return result
+    duration = time.time() - start_time
+    print("\n" + "="*80)
+    print("BATCH RESEARCH COMPLETE")
+    print("="*80)
+    print(f"Topics: {completed} succeeded, {failed} failed")
+    print(f"Duration: {duration:.1f}s ({topics_total / duration * 60:.1f} topics/min)")
+    print(f"Output: {output_dir}")
+    if research_cache is not None:
+        print(f"Cache hit ratio: {research_cache.stats()['hit_ratio']:.0%}")
+    print("="*80)
+    return 0 if failed == 0 else 1
 
 
 def main():
     parser = argparse.ArgumentParser(description="Generate multi-agent research output")
-    parser.add_argument("topic", help="Research topic")
+    parser.add_argument("topic", nargs="?", help="Research topic")
     parser.add_argument("--output-dir", default="../research_outputs", help="Output directory")
     parser.add_argument("--output", default="kestra_output.json", help="Output filename")
+    parser.add_argument("--batch-file", default=None, help="File of topics (one per line) to research in one run")
+    parser.add_argument("--batch-workers", type=int, default=4, help="Topics researched concurrently in batch mode")
+    parser.add_argument("--cache-dir", default=None, help="HTTP cache directory (default: <output-dir>/.http_cache)")
+    parser.add_argument("--cache-max-mb", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024), help="HTTP cache size limit in MB")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the HTTP cache")
+    parser.add_argument("--historian-mode", choices=["network", "index-first", "offline"], default="index-first",
+                        help="Answer the Historian from the local knowledge index before the REST APIs")
+    parser.add_argument("--knowledge-db", default=None, help="Knowledge index path (default: <output-dir>/knowledge.db)")
+    parser.add_argument("--no-rank", action="store_true", help="Keep provider order instead of relevance ranking")
+    parser.add_argument("--no-reuse", action="store_true", help="Research even if an equivalent topic was researched recently")
+    parser.add_argument("--reuse-max-age-hours", type=float, default=REUSE_MAX_AGE_HOURS, help="Oldest research to reuse")
 
     args = parser.parse_args()
+    if not args.topic and not args.batch_file:
+        parser.error("a topic or --batch-file is required")
     topic = args.topic
     output_dir = args.output_dir
 
-    print(f"🚀 Starting multi-agent research for: {topic}")
-    start_time = time.time()
-
-    # Run all three research agents in parallel
-    with ThreadPoolExecutor(max_workers=3) as executor:
-        futures = {
-            executor.submit(run_historian_research, topic): "historian",
-            executor.submit(run_skeptic_research, topic): "skeptic",
-            executor.submit(run_professor_research, topic): "professor"
-        }
-
-        results = {}
-        for future in as_completed(futures):
-            agent_name = futures[future]
-            try:
-                results[agent_name] = future.result()
-            except Exception as e:
-                print(f"Error in {agent_name}: {e}")
-                results[agent_name] = {
-                    "agent": agent_name.capitalize(),
-                    "topic": topic,
-                    "error": str(e),
-                    "status": "failed"
-                }
-
-    # Extract agent data
-    historian_data = results.get("historian")
-    skeptic_data = results.get("skeptic")
-    professor_data = results.get("professor")
-
-    # Create combined research output
-    combined_research = {
-        "topic": topic,
-        "timestamp": datetime.now().isoformat(),
-        "agents": {
-            "historian": historian_data,
-            "skeptic": skeptic_data,
-            "professor": professor_data
-        },
-        "summary": {
-            "historian_status": historian_data.get("status", "unknown"),
-            "skeptic_status": skeptic_data.get("status", "unknown"),
-            "professor_status": professor_data.get("status", "unknown")
-        }
-    }
+    global research_cache, topic_index, reuse_max_age_hours
+    reuse_max_age_hours = args.reuse_max_age_hours
+    topic_index = None if args.no_reuse else TopicIndex(os.path.join(output_dir, "topic_index.json"))
+    # Each topic runs 3 agents; size the pool so concurrent calls never queue for a connection
+    http_session = make_session(3 * max(1, args.batch_workers if args.batch_file else 1))
+    research_cache = None
+    if not args.no_cache:
+        research_cache = HttpCache(
+            args.cache_dir or os.path.join(output_dir, ".http_cache"),
+            max_bytes=args.cache_max_mb * 1024 * 1024,
+            ttls=parse_ttls(os.environ.get("RESEARCH_CACHE_TTLS")),
+            session=http_session,
+        )
+    agents.configure(
+        cache=research_cache,
+        session=http_session,
+        mode=args.historian_mode,
+        db=args.knowledge_db or os.path.join(output_dir, "knowledge.db"),
+        rank=not args.no_rank,
+    )
 
     # Create output directory
     os.makedirs(output_dir, exist_ok=True)
 
+    if args.batch_file:
+        return run_batch(load_topics(args.batch_file), output_dir, max(1, args.batch_workers))
+
+    print(f"🚀 Starting multi-agent research for: {topic}")
+    start_time = time.time()
+
     # Use configurable filename
     output_file = os.path.join(output_dir, args.output)
 
+    reused = find_reusable_research(topic, reuse_max_age_hours)
+    if reused:
+        return 0 if write_output(reused, output_file) else 1
+
+    # Run all three research agents in parallel, publishing each agent's file as it finishes
+    combined_research = research_topic(topic, on_result=lambda agent, data: write_agent_output(output_dir, agent, data))
+    historian_data = combined_research["agents"]["historian"]
+    skeptic_data = combined_research["agents"]["skeptic"]
+    professor_data = combined_research["agents"]["professor"]
+    if research_cache is not None:
+        combined_research["cache"] = research_cache.stats()
+    combined_research["rate_limits"] = limiter_stats()
+
     # Write the combined research output
-    try:
-        with open(output_file, "w", encoding='utf-8') as f:
-            json.dump(combined_research, f, indent=2, ensure_ascii=False)
-        print(f"✅ SUCCESS: Saved research output to {output_file}")
-    except Exception as e:
-        print(f"❌ ERROR saving file: {e}")
+    if not write_output(combined_research, output_file):
         return 1
 
+    # Keep a per-topic copy (kestra_output.json is overwritten by the next run) for reuse
+    if topic_index is not None:
+        archive_file = os.path.join(output_dir, "topics", f"{canonical_topic(topic)}.json")
+        os.makedirs(os.path.dirname(archive_file), exist_ok=True)
+        if write_output(combined_research, archive_file):
+            remember_research(topic, archive_file, combined_research)
+
     # Print summary
     duration = time.time() - start_time
     print("\n" + "="*80)
@@ -317,6 +291,10 @@ def main():
     print(f"Historian: {historian_data.get('status', 'unknown')}")
     print(f"Skeptic: {skeptic_data.get('status', 'unknown')}")
     print(f"Professor: {professor_data.get('status', 'unknown')}")
+    if research_cache is not None:
+        cache_stats = combined_research["cache"]
+        print(f"Cache: {cache_stats.get('hits', 0)} hits, {cache_stats.get('revalidated', 0)} revalidated, "
+              f"{cache_stats.get('misses', 0)} misses ({cache_stats['hit_ratio']:.0%} served from cache)")
     print("="*80)
 
     return 0
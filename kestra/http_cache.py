@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+On-disk HTTP response cache for the research agents.
+
+Stores response bodies together with their ETag / Last-Modified validators in a
+small SQLite file. Fresh entries (younger than the provider TTL) are served
+without touching the network; stale entries are revalidated with a conditional
+request (If-None-Match / If-Modified-Since) so an unchanged page costs a 304
+instead of a full download. The cache is size-bounded and evicts the least
+recently used entries first.
+
+Usage:
+    cache = HttpCache("../research_outputs/.http_cache")
+    response = cache.get(url, provider="wikipedia", params=..., timeout=10)
+    print(cache.stats())
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import requests
+
+from provider_limits import limited_request
+
+# Default freshness per provider, in seconds
+DEFAULT_TTLS = {
+    "wikipedia": 7 * 24 * 3600,
+    "wikidata": 7 * 24 * 3600,
+    "semanticscholar": 3 * 24 * 3600,
+    "stackexchange": 24 * 3600,
+    "newsapi": 3600,
+    "default": 3600,
+}
+
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024  # 50 MB
+
+# Query parameters that must never end up in a cache key
+SECRET_PARAMS = {"apiKey", "api_key", "key"}
+
+
+def parse_ttls(spec):
+    """Parse "wikipedia=3600,newsapi=600" into a TTL override dict."""
+    ttls = {}
+    for part in (spec or "").split(","):
+        if "=" not in part:
+            continue
+        name, value = part.split("=", 1)
+        try:
+            ttls[name.strip()] = int(value)
+        except ValueError:
+            print(f"⚠️ Ignoring invalid cache TTL: {part}")
+    return ttls
+
+
+class CachedResponse:
+    """Minimal stand-in for requests.Response built from a cache entry."""
+
+    def __init__(self, status_code, content, headers, url, cache_status):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+        self.url = url
+        self.cache_status = cache_status  # "hit", "revalidated", "stale" or "miss"
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class HttpCache:
+    """SQLite-backed response cache with conditional revalidation and LRU eviction."""
+
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_BYTES, ttls=None, session=None):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, "responses.db")
+        self.max_bytes = max_bytes
+        self.ttls = dict(DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+        self.session = session or requests.Session()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                provider TEXT,
+                url TEXT,
+                status INTEGER,
+                headers TEXT,
+                body BLOB,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL,
+                last_access REAL,
+                size INTEGER
+            )
+            """
+        )
+        self._db.commit()
+        self._stats = {}
+        self._evictions = 0
+
+    # ------------------------------------------------------------------ #
+    # Public API
+    # ------------------------------------------------------------------ #
+    def get(self, url, provider="default", params=None, headers=None, timeout=10):
+        """GET through the cache. Only 200 responses are stored."""
+        key = self._key(url, params)
+        entry = self._load(key)
+        now = time.time()
+        ttl = self.ttls.get(provider, self.ttls["default"])
+
+        if entry and now - entry["fetched_at"] < ttl:
+            self._touch(key, now)
+            self._count(provider, "hits")
+            return self._response(entry, "hit")
+
+        request_headers = dict(headers or {})
+        if entry:
+            if entry["etag"]:
+                request_headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                request_headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            response = limited_request(
+                self.session, provider, "GET", url, params=params, headers=request_headers, timeout=timeout
+            )
+        except requests.RequestException:
+            if entry:
+                # Network is down (or the provider's circuit is open): a stale answer beats no answer
+                self._count(provider, "stale")
+                return self._response(entry, "stale")
+            self._count(provider, "errors")
+            raise
+
+        if response.status_code == 304 and entry:
+            # A 304 may carry fresh validators; keep them so the next revalidation sends the current ones
+            etag = response.headers.get("ETag") or entry["etag"]
+            last_modified = response.headers.get("Last-Modified") or entry["last_modified"]
+            headers = {k: v for k, v in entry["headers"].items() if k.lower() not in ("etag", "last-modified")}
+            for name, value in (("ETag", etag), ("Last-Modified", last_modified)):
+                if value:
+                    headers[name] = value
+            entry["headers"] = headers
+            with self._lock:
+                self._db.execute(
+                    "UPDATE responses SET fetched_at = ?, last_access = ?, etag = ?, last_modified = ?, "
+                    "headers = ? WHERE key = ?",
+                    (now, now, etag, last_modified, json.dumps(entry["headers"]), key),
+                )
+                self._db.commit()
+            self._count(provider, "revalidated")
+            return self._response(entry, "revalidated")
+
+        self._count(provider, "misses")
+        if response.status_code == 200:
+            self._store(key, provider, url, response, now)
+        return CachedResponse(response.status_code, response.content, dict(response.headers), url, "miss")
+
+    def stats(self):
+        """Hit/miss counters, overall and per provider, plus current cache size."""
+        with self._lock:
+            entries, size = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            providers = {name: dict(counts) for name, counts in self._stats.items()}
+            evictions = self._evictions
+        totals = {}
+        for counts in providers.values():
+            for name, value in counts.items():
+                totals[name] = totals.get(name, 0) + value
+        lookups = sum(totals.values())
+        served = totals.get("hits", 0) + totals.get("revalidated", 0) + totals.get("stale", 0)
+        return {
+            **totals,
+            "hit_ratio": round(served / lookups, 3) if lookups else 0.0,
+            "evictions": evictions,
+            "entries": entries,
+            "bytes": size,
+            "providers": providers,
+        }
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    # ------------------------------------------------------------------ #
+    # Internals
+    # ------------------------------------------------------------------ #
+    @staticmethod
+    def _key(url, params):
+        clean = sorted((k, str(v)) for k, v in (params or {}).items() if k not in SECRET_PARAMS)
+        raw = url + "?" + json.dumps(clean)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _load(self, key):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT status, headers, body, etag, last_modified, fetched_at, url "
+                "FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+        if not row:
+            return None
+        return {
+            "status": row[0],
+            "headers": json.loads(row[1]),
+            "body": row[2],
+            "etag": row[3],
+            "last_modified": row[4],
+            "fetched_at": row[5],
+            "url": row[6],
+        }
+
+    def _touch(self, key, now):
+        with self._lock:
+            self._db.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._db.commit()
+
+    def _store(self, key, provider, url, response, now):
+        body = response.content
+        if len(body) > self.max_bytes:
+            return
+        headers = {k: v for k, v in response.headers.items() if k.lower() in ("content-type", "etag", "last-modified")}
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key, provider, url, response.status_code, json.dumps(headers), body,
+                    response.headers.get("ETag"), response.headers.get("Last-Modified"),
+                    now, now, len(body),
+                ),
+            )
+            self._evict()
+            self._db.commit()
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits (caller holds the lock)."""
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._db.execute("SELECT key, size FROM responses ORDER BY last_access ASC").fetchall():
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._evictions += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def _count(self, provider, name):
+        with self._lock:
+            counts = self._stats.setdefault(provider, {})
+            counts[name] = counts.get(name, 0) + 1
+
+    @staticmethod
+    def _response(entry, cache_status):
+        return CachedResponse(entry["status"], entry["body"], entry["headers"], entry["url"], cache_status)
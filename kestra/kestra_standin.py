@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Kestra API, running the multi-agent-research flow on this machine.
+
+Implements what backend/kestra_client.py and flow_timing.py use:
+    POST   /api/v1/executions/{namespace}/{flowId}   multipart inputs (topic); ?revision=N picks the
+                                                     flow revision, ?wait=true returns once it finished
+    GET    /api/v1/executions/{id}                   execution with state and taskRunList outputFiles
+    GET    /api/v1/executions/{id}/follow            server-sent state events until it finishes
+    GET    /api/v1/executions/{id}/file?path=URI     a kestra:/// output file
+    DELETE /api/v1/executions/{id}/kill              KILLED (409 once finished)
+    GET    /api/v1/executions/search                 finished and running executions, newest first
+
+Each task runs as its own interpreter in its own working directory, like Kestra's task runners (the
+container start itself is not emulated). The revisions reproduce how the flow's tasks are set up:
+    1  the original flow: every Python task creates a virtualenv and pip installs its packages
+       (beforeCommands) before running its script
+    2  the current flow (default): tasks import research_agents from the prebuilt runtime, and
+       combined research is kept per topic in a KV store, so a repeated topic skips the agents
+
+Usage:
+    python3 kestra_standin.py --port 8080
+    KESTRA_URL=http://localhost:8080 uvicorn main:app          # backend research via the REST path
+    curl -F topic=Entropy "http://localhost:8080/api/v1/executions/dev/multi-agent-research?revision=1&wait=true"
+    python3 flow_timing.py --url http://localhost:8080
+    python3 kestra_standin.py --hang      # executions never finish (exercises KESTRA_TIMEOUT)
+    python3 kestra_standin.py --no-follow # no SSE stream (the client polls instead)
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+KESTRA_DIR = os.path.dirname(os.path.abspath(__file__))
+LATEST_REVISION = 2
+TERMINAL_STATES = ("SUCCESS", "WARNING", "FAILED", "KILLED")
+TASK_TIMEOUT = 300
+FOLLOW_INTERVAL = 0.5
+
+HANG = False
+FOLLOW = True
+STORAGE_DIR = None
+
+executions = {}
+files = {}  # kestra:/// URI -> local path
+kv_store = {}  # revision 2's per-topic research cache
+lock = threading.Lock()
+
+AGENTS = {
+    "agent_a_historian": ("historian", "run_historian_research"),
+    "agent_b_skeptic": ("skeptic", "run_skeptic_research"),
+    "agent_c_professor": ("professor", "run_professor_research"),
+}
+
+# Revision 1 embedded a self-contained copy of each agent that only needed `requests`; its cost besides
+# the setup is one interpreter and the agent's HTTP calls, reproduced here by the first of them
+LEGACY_AGENT_SCRIPT = """
+import json, os, requests
+agent, url = os.environ["AGENT"], os.environ["AGENT_URL"]
+try:
+    requests.get(url, params={"q": os.environ["TOPIC"]}, timeout=10).raise_for_status()
+    result = {"agent": agent.capitalize(), "topic": os.environ["TOPIC"], "status": "success"}
+except Exception as e:
+    result = {"agent": agent.capitalize(), "topic": os.environ["TOPIC"], "error": str(e), "status": "failed"}
+with open(agent + ".json", "w") as f:
+    json.dump(result, f, indent=2)
+"""
+LEGACY_AGENT_URLS = {
+    "historian": "https://en.wikipedia.org/api/rest_v1/page/summary/",
+    "skeptic": "https://api.stackexchange.com/2.3/search/advanced",
+    "professor": "https://api.semanticscholar.org/graph/v1/paper/search",
+}
+
+# Same as the flow's agent tasks (multi-agent-research.yaml)
+AGENT_SCRIPT = """
+import json, os
+import research_agents
+agent = os.environ["AGENT"]
+result = getattr(research_agents, os.environ["AGENT_FUNCTION"])(os.environ["TOPIC"])
+with open(agent + ".json", "w") as f:
+    json.dump(result, f, indent=2)
+"""
+
+COMBINE_SCRIPT = """
+import json, os
+from slugify import slugify
+agents = {}
+for agent in ("historian", "skeptic", "professor"):
+    try:
+        with open(agent + ".json") as f:
+            agents[agent] = json.load(f)
+    except (OSError, ValueError) as e:
+        agents[agent] = {"agent": agent.capitalize(), "status": "failed", "error": str(e)}
+combined = {
+    "topic": os.environ["TOPIC"],
+    "timestamp": os.environ["START_DATE"],
+    "agents": agents,
+    "summary": {f"{agent}_status": data.get("status", "unknown") for agent, data in agents.items()},
+}
+slugify(combined["topic"])
+with open("combined_research.json", "w") as f:
+    json.dump(combined, f, indent=2, ensure_ascii=False)
+"""
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _duration(seconds):
+    return f"PT{seconds:.3f}S"
+
+
+def _set_state(execution, state):
+    execution["state"]["current"] = state
+    execution["state"]["histories"].append({"state": state, "date": _now()})
+
+
+class _Killed(Exception):
+    pass
+
+
+def run_task(execution, task_id, script, env, input_files=(), packages=()):
+    """
+    Run one Python script task in a fresh working directory and register its *.json outputs.
+    With `packages`, the task first creates a virtualenv and pip installs them (revision 1's beforeCommands).
+    """
+    if execution["state"]["current"] == "KILLED":
+        raise _Killed()
+    workdir = os.path.join(STORAGE_DIR, execution["id"], task_id)
+    os.makedirs(workdir)
+    for path in input_files:
+        shutil.copy(path, workdir)
+    task_run = {"taskId": task_id, "state": {"current": "RUNNING", "startDate": _now()}, "outputs": {}}
+    with lock:
+        execution["taskRunList"].append(task_run)
+    begin = time.time()
+    python = sys.executable
+    try:
+        if packages:
+            subprocess.run([sys.executable, "-m", "venv", "env"], cwd=workdir, check=True, capture_output=True,
+                           timeout=TASK_TIMEOUT)
+            python = os.path.join(workdir, "env", "bin", "python")
+            subprocess.run([python, "-m", "pip", "install", "-q", *packages], cwd=workdir, check=True,
+                           capture_output=True, timeout=TASK_TIMEOUT)
+        subprocess.run([python, "-c", script], cwd=workdir, check=True, capture_output=True, timeout=TASK_TIMEOUT,
+                       env={**os.environ, **env, "PYTHONPATH": KESTRA_DIR})
+        state = "SUCCESS"
+    except (subprocess.SubprocessError, OSError) as e:
+        print(f"❌ {execution['id'][:8]} {task_id}: {getattr(e, 'stderr', b'') or e}")
+        state = "FAILED"
+    outputs = {}
+    for name in sorted(os.listdir(workdir)):
+        if name.endswith(".json"):
+            uri = f"kestra:///{execution['namespace']}/{execution['flowId']}/executions/{execution['id']}/tasks/{task_id}/{name}"
+            files[uri] = os.path.join(workdir, name)
+            outputs[name] = uri
+    task_run["outputs"]["outputFiles"] = outputs
+    task_run["state"].update(current=state, duration=_duration(time.time() - begin))
+    if state == "FAILED":
+        raise RuntimeError(f"task {task_id} failed")
+    return {name: files[uri] for name, uri in outputs.items()}
+
+
+def run_agents(execution, env):
+    legacy = execution["flowRevision"] == 1
+    with ThreadPoolExecutor(max_workers=len(AGENTS)) as pool:
+        futures = []
+        for task_id, (agent, function) in AGENTS.items():
+            agent_env = {**env, "AGENT": agent, "AGENT_FUNCTION": function, "AGENT_URL": LEGACY_AGENT_URLS[agent]}
+            futures.append(pool.submit(run_task, execution, task_id, LEGACY_AGENT_SCRIPT if legacy else AGENT_SCRIPT,
+                                       agent_env, packages=("requests",) if legacy else ()))
+        outputs = {}
+        for future in futures:
+            outputs.update(future.result())
+    return run_task(execution, "combine_research", COMBINE_SCRIPT, env, input_files=outputs.values(),
+                    packages=("python-slugify",) if legacy else ())
+
+
+def run_execution(execution):
+    """Run the flow's tasks (revision 2 first looks the topic up in the KV store)."""
+    begin = time.time()
+    _set_state(execution, "RUNNING")
+    if HANG:
+        return
+    topic = execution["inputs"]["topic"]
+    env = {"TOPIC": topic, "START_DATE": execution["state"]["startDate"]}
+    try:
+        cached = kv_store.get(topic) if execution["flowRevision"] >= 2 else None
+        if cached:
+            path = os.path.join(STORAGE_DIR, execution["id"], "cached_research.kv")
+            os.makedirs(os.path.dirname(path))
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(cached)
+            outputs = run_task(execution, "restore_cached_research",
+                               "import shutil; shutil.copy('cached_research.kv', 'combined_research.json')",
+                               env, input_files=[path])
+        else:
+            outputs = run_agents(execution, env)
+            if execution["flowRevision"] >= 2:
+                with open(outputs["combined_research.json"], encoding="utf-8") as f:
+                    kv_store[topic] = f.read()
+        state = "SUCCESS"
+    except _Killed:
+        state = "KILLED"
+    except Exception as e:
+        print(f"❌ {execution['id'][:8]}: {e}")
+        state = "FAILED"
+    with lock:
+        if execution["state"]["current"] != "KILLED":
+            _set_state(execution, state)
+        execution["state"].update(endDate=_now(), duration=_duration(time.time() - begin))
+    print(f"{'✅' if state == 'SUCCESS' else '⚠️'} {execution['id'][:8]} r{execution['flowRevision']} "
+          f"'{topic}': {execution['state']['current']} in {time.time() - begin:.2f}s")
+
+
+def parse_multipart(content_type, body):
+    message = BytesParser().parsebytes(f"Content-Type: {content_type}\r\n\r\n".encode() + body)
+    fields = {}
+    for part in message.get_payload() if message.is_multipart() else []:
+        name = part.get_param("name", header="content-disposition")
+        if name:
+            fields[name] = part.get_payload(decode=True).decode("utf-8")
+    return fields
+
+
+class Handler(BaseHTTPRequestHandler):
+    def _json(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _execution(self, execution_id):
+        execution = executions.get(execution_id)
+        if execution is None:
+            self._json(404, {"message": f"Execution {execution_id} not found"})
+        return execution
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        match = re.fullmatch(r"/api/v1/executions/([^/]+)/([^/]+)", url.path)
+        if not match:
+            return self._json(404, {"message": "not found"})
+        query = parse_qs(url.query)
+        revision = int(query.get("revision", [LATEST_REVISION])[0])
+        if revision not in (1, 2):
+            return self._json(404, {"message": f"Flow revision {revision} not found"})
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        inputs = parse_multipart(self.headers.get("Content-Type", ""), body)
+        execution = {
+            "id": uuid.uuid4().hex[:22],
+            "namespace": match.group(1),
+            "flowId": match.group(2),
+            "flowRevision": revision,
+            "inputs": {"topic": inputs.get("topic", "The science of why time moves forward")},
+            "state": {"current": "CREATED", "startDate": _now(), "histories": []},
+            "taskRunList": [],
+        }
+        executions[execution["id"]] = execution
+        thread = threading.Thread(target=run_execution, args=(execution,), daemon=True)
+        thread.start()
+        if query.get("wait", ["false"])[0] == "true":
+            thread.join()
+        self._json(200, execution)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/api/v1/executions/search":
+            query = parse_qs(url.query)
+            results = [e for e in executions.values()
+                       if e["namespace"] == query.get("namespace", [e["namespace"]])[0]
+                       and e["flowId"] == query.get("flowId", [e["flowId"]])[0]]
+            results.sort(key=lambda e: e["state"]["startDate"], reverse=True)
+            size = int(query.get("size", [25])[0])
+            return self._json(200, {"results": results[:size], "total": len(results)})
+        match = re.fullmatch(r"/api/v1/executions/([^/]+)(/follow|/file)?", url.path)
+        if not match:
+            return self._json(404, {"message": "not found"})
+        execution = self._execution(match.group(1))
+        if execution is None:
+            return
+        if match.group(2) == "/follow":
+            return self._follow(execution)
+        if match.group(2) == "/file":
+            path = files.get(parse_qs(url.query).get("path", [""])[0])
+            if not path or execution["id"] not in path:
+                return self._json(404, {"message": "file not found"})
+            with open(path, "rb") as f:
+                data = f.read()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            return self.wfile.write(data)
+        self._json(200, execution)
+
+    def do_DELETE(self):
+        match = re.fullmatch(r"/api/v1/executions/([^/]+)/kill", urlparse(self.path).path)
+        if not match:
+            return self._json(404, {"message": "not found"})
+        execution = self._execution(match.group(1))
+        if execution is None:
+            return
+        with lock:
+            if execution["state"]["current"] in TERMINAL_STATES:
+                return self._json(409, {"message": "Execution already finished"})
+            _set_state(execution, "KILLED")
+        print(f"🛑 {execution['id'][:8]} killed")
+        self.send_response(202)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _follow(self, execution):
+        if not FOLLOW:
+            return self._json(404, {"message": "not found"})
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        try:
+            while True:
+                state = execution["state"]["current"]
+                event = {"id": execution["id"], "state": {"current": state}}
+                self.wfile.write(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+                if state in TERMINAL_STATES:
+                    return
+                time.sleep(FOLLOW_INTERVAL)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    global HANG, FOLLOW, STORAGE_DIR
+    parser = argparse.ArgumentParser(description="Local stand-in for the Kestra API (multi-agent-research)")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--hang", action="store_true", help="Executions stay RUNNING until killed")
+    parser.add_argument("--no-follow", action="store_true", help="No /follow stream (clients must poll)")
+    parser.add_argument("--storage", default=None, help="Internal storage directory (default: a temp dir)")
+    args = parser.parse_args()
+
+    HANG, FOLLOW = args.hang, not args.no_follow
+    STORAGE_DIR = args.storage or tempfile.mkdtemp(prefix="kestra-standin-")
+    print(f"🎭 Kestra stand-in on http://localhost:{args.port} (storage: {STORAGE_DIR})")
+    ThreadingHTTPServer(("", args.port), Handler).serve_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Local full-text knowledge index for the Historian agent.
+
+Builds a SQLite FTS5 index (BM25 ranking) from a Wikipedia/Wikidata dump subset
+so frequently researched topics can be answered in milliseconds, offline.
+
+Dump format: JSON Lines, one page per line:
+    {"title": "...", "extract": "...", "url": "...", "facts": [{"label": "...", "desc": "..."}]}
+Raw Wikipedia REST summaries (title/extract/content_urls) are accepted too.
+
+Usage:
+    python3 knowledge_index.py ingest fixtures/wiki_physics_sample.jsonl
+    python3 knowledge_index.py query "entropy"
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+
+from text_utils import tokenize
+
+DEFAULT_DB = "../research_outputs/knowledge.db"
+MIN_COVERAGE = 0.6  # share of topic terms a page must contain to count as a hit
+
+
+def _connect(db_path):
+    return sqlite3.connect(db_path)
+
+
+def _page_from_record(record):
+    url = record.get("url") or record.get("content_urls", {}).get("desktop", {}).get("page", "")
+    return {
+        "title": record.get("title", ""),
+        "extract": record.get("extract", ""),
+        "url": url,
+        "facts": record.get("facts", []),
+    }
+
+
+def build_index(dump_path, db_path=DEFAULT_DB):
+    """(Re)build the index from a JSONL dump. Returns the number of pages ingested."""
+    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+    db = _connect(db_path)
+    try:
+        db.execute("DROP TABLE IF EXISTS pages")
+        db.execute(
+            "CREATE VIRTUAL TABLE pages USING fts5("
+            "title, extract, facts_text, url UNINDEXED, facts UNINDEXED, tokenize='porter unicode61')"
+        )
+        count = 0
+        with open(dump_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                page = _page_from_record(json.loads(line))
+                if not page["title"] or not page["extract"]:
+                    continue
+                facts_text = " ".join(f"{fact.get('label', '')} {fact.get('desc', '')}" for fact in page["facts"])
+                db.execute(
+                    "INSERT INTO pages (title, extract, facts_text, url, facts) VALUES (?, ?, ?, ?, ?)",
+                    (page["title"], page["extract"], facts_text, page["url"], json.dumps(page["facts"])),
+                )
+                count += 1
+        db.commit()
+        return count
+    finally:
+        db.close()
+
+
+def lookup(topic, db_path=DEFAULT_DB, min_coverage=MIN_COVERAGE):
+    """Best matching page for `topic`, or None on a miss (or when no index exists)."""
+    if not os.path.exists(db_path):
+        return None
+    terms = tokenize(topic)
+    if not terms:
+        return None
+    query = " OR ".join(f'"{t}"' for t in terms)
+    db = _connect(db_path)
+    try:
+        rows = db.execute(
+            "SELECT title, extract, url, facts, bm25(pages, 10.0, 1.0, 2.0) AS score "
+            "FROM pages WHERE pages MATCH ? ORDER BY score LIMIT 5",
+            (query,),
+        ).fetchall()
+    except sqlite3.OperationalError:
+        return None
+    finally:
+        db.close()
+
+    for title, extract, url, facts, score in rows:
+        # FTS5 matches stemmed terms; require most of the topic to actually be covered
+        page_terms = set(tokenize(f"{title} {extract}"))
+        covered = sum(1 for t in terms if t in page_terms or t.rstrip("s") in page_terms)
+        if covered / len(terms) >= min_coverage:
+            return {
+                "title": title,
+                "extract": extract,
+                "url": url,
+                "facts": json.loads(facts),
+                "bm25": round(score, 3),
+            }
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local knowledge index for the Historian agent")
+    sub = parser.add_subparsers(dest="command", required=True)
+    ingest = sub.add_parser("ingest", help="Build the index from a JSONL dump")
+    ingest.add_argument("dump", help="Path to JSONL dump")
+    ingest.add_argument("--db", default=DEFAULT_DB, help="Index database path")
+    query = sub.add_parser("query", help="Look up a topic")
+    query.add_argument("topic", help="Topic to look up")
+    query.add_argument("--db", default=DEFAULT_DB, help="Index database path")
+    args = parser.parse_args()
+
+    if args.command == "ingest":
+        start = time.time()
+        count = build_index(args.dump, args.db)
+        print(f"✅ Indexed {count} pages into {args.db} in {time.time() - start:.2f}s")
+        return 0
+
+    start = time.perf_counter()
+    page = lookup(args.topic, args.db)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    if not page:
+        print(f"❌ No local match for '{args.topic}' ({elapsed_ms:.1f} ms)")
+        return 1
+    print(f"✅ {page['title']} (bm25 {page['bm25']}, {elapsed_ms:.1f} ms)")
+    print(page["extract"])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
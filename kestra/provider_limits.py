@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Per-provider rate limiting and circuit breaking for outbound API calls.
+
+Every external provider gets one shared ProviderLimiter (per process):
+- a token bucket (requests per second + burst) that callers block on before
+  each request, paused further when the provider asks us to back off
+  (429 Retry-After, StackExchange `backoff`, exhausted `quota_remaining`);
+- a circuit breaker that, after repeated failures, short-circuits calls to
+  the provider for a cool-down period instead of burning quota on requests
+  that are going to fail anyway.
+
+Usage:
+    response = limited_request(requests, "stackexchange", "GET", url, params=params, timeout=5)
+    audio = limited_call("elevenlabs", client.text_to_speech.convert, voice_id=..., text=...)
+
+Override limits with PROVIDER_RATE_LIMITS="stackexchange=1:2,semanticscholar=0.5:1" (rps:burst).
+"""
+
+import asyncio
+import os
+import threading
+import time
+
+import requests
+
+# provider -> (requests per second, burst)
+DEFAULT_LIMITS = {
+    "wikipedia": (10.0, 10),
+    "wikidata": (2.0, 5),
+    "stackexchange": (2.0, 4),
+    "semanticscholar": (1.0, 1),
+    "newsapi": (1.0, 2),
+    "elevenlabs": (2.0, 4),
+    "edge_tts": (5.0, 5),
+    "wavespeed": (2.0, 4),
+    "fileio": (1.0, 2),
+    "default": (5.0, 5),
+}
+
+FAILURE_THRESHOLD = 3      # consecutive failures before the circuit opens
+COOLDOWN_SECONDS = 60.0    # how long an open circuit rejects calls
+QUOTA_EXHAUSTED_COOLDOWN = 3600.0
+
+
+class CircuitOpenError(requests.RequestException):
+    """Raised instead of calling a provider whose circuit is open."""
+
+
+def parse_limits(spec):
+    """Parse "stackexchange=1:2,newsapi=0.5:1" into {provider: (rps, burst)}."""
+    limits = {}
+    for part in (spec or "").split(","):
+        if "=" not in part:
+            continue
+        name, value = part.split("=", 1)
+        try:
+            rps, _, burst = value.partition(":")
+            limits[name.strip()] = (float(rps), int(burst or 1))
+        except ValueError:
+            print(f"⚠️ Ignoring invalid rate limit: {part}")
+    return limits
+
+
+class TokenBucket:
+    """Thread-safe token bucket; acquire() blocks until a token is available."""
+
+    def __init__(self, rate, burst, lock=None):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = lock or threading.Lock()
+
+    def pause(self, seconds):
+        """Hold all requests for `seconds` (provider asked us to back off)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def reserve(self):
+        """Take a token and return how long the caller must wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now)
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """Closed -> open after N consecutive failures -> half-open after cool-down."""
+
+    def __init__(self, failure_threshold=FAILURE_THRESHOLD, cooldown=COOLDOWN_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._failures = 0
+        self._opened_at = None
+        self._open_for = cooldown
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state()
+
+    def _state(self):
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self._open_for:
+            return "half-open"
+        return "open"
+
+    def allow(self):
+        """True if a call may go through; half-open lets a single trial call out."""
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._failures >= self.failure_threshold or self._opened_at is not None:
+                self._open(self.cooldown)
+
+    def trip(self, seconds):
+        """Open the circuit immediately (e.g. daily quota exhausted)."""
+        with self._lock:
+            self._open(seconds)
+
+    def _open(self, seconds):
+        self._opened_at = time.monotonic()
+        self._open_for = seconds
+
+
+class ProviderLimiter:
+    """Token bucket + circuit breaker + counters for one provider."""
+
+    def __init__(self, name, rate, burst):
+        self.name = name
+        # Counters are updated from many worker threads: they share the token bucket's lock
+        self._lock = threading.Lock()
+        self.bucket = TokenBucket(rate, burst, lock=self._lock)
+        self.breaker = CircuitBreaker()
+        self.stats = {"calls": 0, "throttled": 0, "rejected": 0, "failures": 0, "waited_s": 0.0}
+        self.quota_remaining = None
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self.stats[name] += amount
+
+    def _before_call(self):
+        if not self.breaker.allow():
+            self._count("rejected")
+            raise CircuitOpenError(f"{self.name} circuit is open; skipping call")
+        self._count("calls")
+        return self.bucket.reserve()
+
+    def acquire(self):
+        wait = self._before_call()
+        if wait > 0:
+            self._count("waited_s", wait)
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        wait = self._before_call()
+        if wait > 0:
+            self._count("waited_s", wait)
+            await asyncio.sleep(wait)
+
+    def record_failure(self):
+        self._count("failures")
+        self.breaker.record_failure()
+
+    def record_success(self):
+        self.breaker.record_success()
+
+    def observe(self, response):
+        """Update limiter state from a provider response (status, headers, quota fields)."""
+        retry_after = response.headers.get("Retry-After")
+        if response.status_code == 429:
+            self._count("throttled")
+            self.bucket.pause(_seconds(retry_after, default=COOLDOWN_SECONDS / 4))
+            self.record_failure()
+            return
+        if response.status_code >= 500:
+            self.record_failure()
+            return
+        self.record_success()
+        if self.name == "stackexchange" and "json" in response.headers.get("Content-Type", ""):
+            try:
+                body = response.json()
+            except ValueError:
+                return
+            if body.get("backoff"):
+                self.bucket.pause(float(body["backoff"]))
+            if "quota_remaining" in body:
+                self.quota_remaining = body["quota_remaining"]
+                if self.quota_remaining <= 0:
+                    self.breaker.trip(QUOTA_EXHAUSTED_COOLDOWN)
+
+    def snapshot(self):
+        with self._lock:
+            snap = dict(self.stats)
+        snap["state"] = self.breaker.state
+        snap["waited_s"] = round(snap["waited_s"], 2)
+        if self.quota_remaining is not None:
+            snap["quota_remaining"] = self.quota_remaining
+        return snap
+
+
+def _seconds(value, default):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+_limiters = {}
+_registry_lock = threading.Lock()
+_limits = dict(DEFAULT_LIMITS)
+_limits.update(parse_limits(os.environ.get("PROVIDER_RATE_LIMITS")))
+
+
+def get_limiter(provider):
+    """Process-wide limiter for `provider` (created on first use)."""
+    with _registry_lock:
+        limiter = _limiters.get(provider)
+        if limiter is None:
+            rate, burst = _limits.get(provider, _limits["default"])
+            limiter = ProviderLimiter(provider, rate, burst)
+            _limiters[provider] = limiter
+        return limiter
+
+
+def limited_request(session, provider, method, url, **kwargs):
+    """Rate-limited, circuit-broken HTTP request via `session` (or the requests module)."""
+    limiter = get_limiter(provider)
+    limiter.acquire()
+    try:
+        response = session.request(method, url, **kwargs)
+    except requests.RequestException:
+        limiter.record_failure()
+        raise
+    limiter.observe(response)
+    return response
+
+
+def limited_call(provider, fn, *args, **kwargs):
+    """Rate-limited, circuit-broken call of an SDK function; any exception counts as a failure."""
+    limiter = get_limiter(provider)
+    limiter.acquire()
+    try:
+        result = fn(*args, **kwargs)
+    except Exception:
+        limiter.record_failure()
+        raise
+    limiter.record_success()
+    return result
+
+
+def limiter_stats():
+    """Counters for every provider used so far in this process."""
+    with _registry_lock:
+        limiters = list(_limiters.values())
+    return {limiter.name: limiter.snapshot() for limiter in limiters}
+
+
+def scaled_limits_spec(share):
+    """PROVIDER_RATE_LIMITS spec granting `share` (0-1] of every provider's configured rate.
+
+    Used to give background work (e.g. research pre-warming) a fraction of each provider's budget.
+    """
+    parts = []
+    for name, (rate, burst) in sorted(_limits.items()):
+        parts.append(f"{name}={rate * share:g}:{max(1, int(burst * share))}")
+    return ",".join(parts)
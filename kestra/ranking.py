@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Relevance ranking and near-duplicate removal for research items.
+
+All posts/papers/facts for a topic are scored at once against the topic with a
+vectorized BM25 (NumPy), near-duplicates are dropped using cosine similarity of
+hashed TF-IDF vectors (catches the same question cross-posted to several
+StackExchange sites), and the top-k per source are kept so the Director prompt
+stays small and dense.
+
+Usage:
+    ranked = rank_items(topic, posts, text_of=lambda p: p["title"] + " " + p["body"],
+                        group_of=lambda p: p["source"], top_k=2)
+
+Micro-benchmark:
+    python3 ranking.py --benchmark --items 1000
+"""
+
+import argparse
+import random
+import sys
+import time
+import zlib
+
+import numpy as np
+
+from text_utils import tokenize
+
+HASH_DIM = 4096
+DUPLICATE_THRESHOLD = 0.85  # cosine similarity above which two items count as the same
+
+
+def bm25_scores(query, documents, k1=1.5, b=0.75):
+    """BM25 score of every document (list of token lists) against `query` (token list)."""
+    terms = list(dict.fromkeys(query))
+    n = len(documents)
+    if not n or not terms:
+        return np.zeros(n)
+    column = {t: i for i, t in enumerate(terms)}
+    tf = np.zeros((n, len(terms)))
+    for row, tokens in enumerate(documents):
+        for t in tokens:
+            col = column.get(t)
+            if col is not None:
+                tf[row, col] += 1
+    lengths = np.fromiter((len(d) for d in documents), dtype=float, count=n)
+    avgdl = lengths.mean() or 1.0
+    df = np.count_nonzero(tf, axis=0)
+    idf = np.log1p((n - df + 0.5) / (df + 0.5))
+    denom = tf + k1 * (1 - b + b * lengths[:, None] / avgdl)
+    return (idf * tf * (k1 + 1) / denom).sum(axis=1)
+
+
+def hashed_tfidf(documents, dim=HASH_DIM):
+    """L2-normalised TF-IDF matrix over hashed unigrams + bigrams (rows = documents)."""
+    n = len(documents)
+    buckets = {}  # feature -> hash bucket, so each distinct feature is hashed once
+    rows, cols = [], []
+    for row, tokens in enumerate(documents):
+        features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        for f in features:
+            col = buckets.get(f)
+            if col is None:
+                col = buckets[f] = zlib.crc32(f.encode("utf-8")) % dim
+            cols.append(col)
+        rows.extend([row] * len(features))
+    flat = np.array(rows, dtype=np.int64) * dim + np.array(cols, dtype=np.int64)
+    matrix = np.bincount(flat, minlength=n * dim).reshape(n, dim).astype(np.float32)
+    df = np.count_nonzero(matrix, axis=0)
+    matrix *= (np.log((1 + n) / (1 + df)) + 1).astype(np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def rank_items(topic, items, text_of, group_of=None, top_k=None, prior=None,
+               duplicate_threshold=DUPLICATE_THRESHOLD):
+    """
+    Score `items` against `topic`, drop near-duplicates, keep the top_k per group.
+
+    text_of(item) -> text to score; group_of(item) -> source key for per-source top-k;
+    prior(item) -> optional float added to the normalised relevance (e.g. citations).
+    Returns items (with a "relevance" field) best first.
+    """
+    if not items:
+        return []
+    documents = [tokenize(text_of(item)) for item in items]
+    scores = bm25_scores(tokenize(topic), documents)
+    if scores.max() > 0:
+        scores = scores / scores.max()
+    if prior is not None:
+        scores = scores + np.fromiter((prior(item) for item in items), dtype=float, count=len(items))
+
+    order = np.argsort(-scores, kind="stable")
+    if len(items) > 1:
+        vectors = hashed_tfidf(documents)
+        similarity = vectors @ vectors.T
+    else:
+        similarity = None
+
+    kept, per_group = [], {}
+    for idx in order:
+        if similarity is not None and kept and similarity[idx, kept].max() >= duplicate_threshold:
+            continue
+        group = group_of(items[idx]) if group_of else None
+        if top_k is not None and per_group.get(group, 0) >= top_k:
+            continue
+        per_group[group] = per_group.get(group, 0) + 1
+        kept.append(idx)
+
+    ranked = []
+    for idx in kept:
+        item = dict(items[idx])
+        item["relevance"] = round(float(scores[idx]), 4)
+        ranked.append(item)
+    return ranked
+
+
+def _synthetic_items(count, seed=0):
+    rng = random.Random(seed)
+    vocab = ("time entropy arrow thermodynamics physics clock universe order disorder heat energy "
+             "quantum particle light speed relativity gravity space black hole experiment theory").split()
+    items = []
+    for i in range(count):
+        body = " ".join(rng.choice(vocab) for _ in range(rng.randint(40, 200)))
+        items.append({"title": f"Question {i}", "body": body, "source": f"site{i % 4}"})
+    # Sprinkle exact and near duplicates, as cross-posted questions would be
+    for i in range(0, count // 10):
+        items[rng.randrange(count)]["body"] = items[i]["body"] + " thanks"
+    return items
+
+
+def benchmark(count=1000, repeats=5):
+    """Time rank_items on `count` synthetic items; returns (mean seconds, items kept)."""
+    items = _synthetic_items(count)
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        ranked = rank_items("why does time move forward entropy", items,
+                            text_of=lambda p: p["title"] + " " + p["body"],
+                            group_of=lambda p: p["source"], top_k=50)
+        timings.append(time.perf_counter() - start)
+    return sum(timings) / len(timings), len(ranked)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Research item ranking")
+    parser.add_argument("--benchmark", action="store_true", help="Run the ranking micro-benchmark")
+    parser.add_argument("--items", type=int, default=1000, help="Synthetic items for the benchmark")
+    args = parser.parse_args()
+    if not args.benchmark:
+        parser.print_help()
+        return 0
+    mean, kept = benchmark(args.items)
+    print(f"⏱️ Ranked {args.items} items in {mean * 1000:.1f} ms "
+          f"({args.items / mean:,.0f} items/s), kept {kept}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
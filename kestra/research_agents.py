@@ -0,0 +1,473 @@
+#!/usr/bin/env python3
+"""
+The three research agents (Historian, Skeptic, Professor) shared by
+generate_kestra_output.py and the multi-agent-research Kestra flow.
+
+The flow runs these functions from the prebuilt research runtime image
+(see Dockerfile.runtime), so there is a single copy of the agent code.
+
+Usage:
+    from research_agents import run_historian_research
+    result = run_historian_research("The science of why time moves forward")
+
+    python3 research_agents.py historian "Entropy" --output historian.json
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import knowledge_index
+from provider_limits import limited_request
+from ranking import rank_items
+
+# Shared on-disk response cache (None = straight to network); set via configure()
+research_cache = None
+
+# Pooled HTTP client shared by every agent (and every topic in batch mode)
+http_session = requests
+
+SCHOLAR_FIELDS = "title,authors,abstract,year,citationCount,openAccessPdf"
+
+# Relevance ranking: fetch a wider pool, drop near-duplicates, keep the best few per source
+rank_results = True
+POSTS_PER_SOURCE = 2
+PAPERS_KEPT = 3
+
+# Historian source: "network", "index-first" (local index, REST on a miss) or "offline" (index only)
+historian_mode = "index-first"
+knowledge_db = os.environ.get("KNOWLEDGE_DB", knowledge_index.DEFAULT_DB)
+
+
+def configure(cache=None, session=None, mode=None, db=None, rank=None):
+    """Set module-wide agent options; `cache` is always replaced, other unset arguments are kept."""
+    global research_cache, http_session, historian_mode, knowledge_db, rank_results
+    research_cache = cache
+    if session is not None:
+        http_session = session
+    if mode is not None:
+        historian_mode = mode
+    if db is not None:
+        knowledge_db = db
+    if rank is not None:
+        rank_results = rank
+
+
+def http_get(url, provider, **kwargs):
+    """GET a research provider (rate-limited), going through the response cache when enabled."""
+    if research_cache is None:
+        return limited_request(http_session, provider, "GET", url, **kwargs)
+    return research_cache.get(url, provider=provider, **kwargs)
+
+
+def make_session(pool_size):
+    """requests.Session with a connection pool big enough for `pool_size` concurrent calls."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def run_historian_research(topic, wikidata_facts=None):
+    """Agent A: The Historian - Wikipedia + Wikidata (local index first, if built).
+
+    `wikidata_facts` skips the per-topic SPARQL query (batch mode prefetches them).
+    """
+    print(f"🏛️ Historian researching: {topic}")
+    if historian_mode != "network":
+        page = knowledge_index.lookup(topic, knowledge_db)
+        if page:
+            print(f"📚 Historian answered from local index: {page['title']}")
+            return {
+                "agent": "Historian",
+                "topic": topic,
+                "extract": page["extract"],
+                "wiki_data": {"title": page["title"], "extract": page["extract"], "url": page["url"]},
+                "wikidata_facts": page["facts"],
+                "source": "local_index",
+                "status": "success"
+            }
+        if historian_mode == "offline":
+            return {
+                "agent": "Historian",
+                "topic": topic,
+                "error": "No local index match (offline mode)",
+                "status": "failed"
+            }
+    try:
+        # 1. Wikipedia Summary
+        url = f"https://en.wikipedia.org/api/rest_v1/page/summary/{urllib.parse.quote(topic)}"
+        headers = {'User-Agent': 'VeritasiumHackathonBot/1.0'}
+        response = http_get(url, "wikipedia", headers=headers, timeout=10)
+
+        wiki_result = {}
+        if response.status_code == 200:
+            data = response.json()
+            wiki_result = {
+                "title": data.get("title", ""),
+                "extract": data.get("extract", ""),
+                "url": data.get("content_urls", {}).get("desktop", {}).get("page", "")
+            }
+        else:
+            wiki_result = {"error": "Wikipedia page not found"}
+
+        # 2. Wikidata Facts (SPARQL)
+        facts = wikidata_facts if wikidata_facts is not None else fetch_wikidata_facts(topic)
+
+        result = {
+            "agent": "Historian",
+            "topic": topic,
+            "extract": wiki_result.get("extract", ""),
+            "wiki_data": wiki_result,
+            "wikidata_facts": facts,
+            "source": "network",
+            "status": "success"
+        }
+    except Exception as e:
+        result = {
+            "agent": "Historian",
+            "topic": topic,
+            "error": str(e),
+            "status": "failed"
+        }
+    return result
+
+
+def fetch_wikidata_facts(topic):
+    """Single-topic Wikidata lookup by exact English label."""
+    label_part = topic + '"@en'  # Build label safely
+    sparql_query = """
+    SELECT ?item ?itemLabel ?description WHERE {
+      ?item rdfs:label "%s" .
+      SERVICE wikibase:label { bd:serviceParam wikibase:language "en" . }
+    } LIMIT 1
+    """ % label_part  # % formatting avoids {} conflicts
+
+    sparql_url = "https://query.wikidata.org/sparql"
+    sparql_params = {"query": sparql_query, "format": "json"}
+
+    facts = []
+    try:
+        sparql_response = http_get(sparql_url, "wikidata", params=sparql_params, timeout=5)
+        if sparql_response.status_code == 200:
+            wikidata = sparql_response.json().get("results", {}).get("bindings", [])
+            facts = [{"label": i["itemLabel"]["value"], "desc": i.get("description", {}).get("value", "")} for i in wikidata]
+    except Exception as e:
+        print(f"Wikidata error: {e}")
+    return facts
+
+
+def fetch_wikidata_facts_batch(topics):
+    """
+    One SPARQL query (VALUES over all labels) for many topics -> {topic: facts}.
+    If the query fails every topic maps to None, so the Historian runs its own per-topic query.
+    """
+    labels = " ".join('"%s"@en' % t.replace("\\", "\\\\").replace('"', '\\"') for t in topics)
+    sparql_query = """
+    SELECT ?label ?itemLabel ?description WHERE {
+      VALUES ?label { %s }
+      ?item rdfs:label ?label .
+      OPTIONAL { ?item schema:description ?description . FILTER(LANG(?description) = "en") }
+      SERVICE wikibase:label { bd:serviceParam wikibase:language "en" . }
+    }
+    """ % labels
+    try:
+        response = http_get("https://query.wikidata.org/sparql", "wikidata",
+                            params={"query": sparql_query, "format": "json"}, timeout=30)
+        if response.status_code != 200:
+            print(f"Wikidata batch error: HTTP {response.status_code}")
+            return {t: None for t in topics}
+        facts = {t: [] for t in topics}
+        for i in response.json().get("results", {}).get("bindings", []):
+            topic = i["label"]["value"]
+            if topic in facts and not facts[topic]:  # LIMIT 1 per topic, like the single query
+                facts[topic].append({"label": i["itemLabel"]["value"], "desc": i.get("description", {}).get("value", "")})
+    except Exception as e:
+        print(f"Wikidata batch error: {e}")
+        return {t: None for t in topics}
+    return facts
+
+
+def run_skeptic_research(topic):
+    """Agent B: The Skeptic - Stack Exchange + NewsAPI"""
+    print(f"🤔 Skeptic researching: {topic}")
+
+    try:
+        all_posts = []
+
+        # 1. Stack Exchange
+        stack_sites = ["physics", "skeptics", "science", "astronomy"]
+        for site in stack_sites:
+            try:
+                url = "https://api.stackexchange.com/2.3/search/advanced"
+                params = {
+                    "site": site,
+                    "q": topic,
+                    "sort": "votes",
+                    "pagesize": 5 if rank_results else 2,
+                    "order": "desc",
+                    "filter": "!nNPvSNPH.z"
+                }
+                response = http_get(url, "stackexchange", params=params, timeout=5)
+                if response.status_code == 200:
+                    items = response.json().get("items", [])
+                    for item in items:
+                        all_posts.append({
+                            "source": f"StackExchange ({site})",
+                            "title": item.get("title", ""),
+                            "snippet": item.get("body_markdown", ""),  # truncated after ranking
+                            "score": item.get("score", 0),
+                            "url": item.get("link", "")
+                        })
+            except Exception as e:
+                print(f"StackExchange error ({site}): {e}")
+                continue
+
+        # 2. NewsAPI (Optional)
+        news_key = os.environ.get("NEWS_API_KEY")
+        if news_key:
+            try:
+                news_url = "https://newsapi.org/v2/everything"
+                news_params = {
+                    "apiKey": news_key,
+                    "q": f"{topic} AND (myth OR misconception OR study)",
+                    "sortBy": "relevancy",
+                    "pageSize": 5 if rank_results else 2,
+                    "language": "en"
+                }
+                resp = http_get(news_url, "newsapi", params=news_params, timeout=5)
+                if resp.status_code == 200:
+                    articles = resp.json().get("articles", [])
+                    for art in articles:
+                        all_posts.append({
+                            "source": "NewsAPI",
+                            "title": art.get("title", ""),
+                            "snippet": art.get("description") or "",
+                            "url": art.get("url", "")
+                        })
+            except Exception as e:
+                print(f"NewsAPI error: {e}")
+
+        # 3. Rank against the topic on full bodies, dedup cross-posts, then trim for the prompt
+        total_found = len(all_posts)
+        if rank_results:
+            all_posts = rank_items(topic, all_posts, text_of=lambda p: f"{p['title']} {p['snippet']}",
+                                   group_of=lambda p: p["source"], top_k=POSTS_PER_SOURCE)
+        for post in all_posts:
+            if len(post["snippet"]) > 200:
+                post["snippet"] = post["snippet"][:200] + "..."
+
+        result = {
+            "agent": "Skeptic",
+            "topic": topic,
+            "posts": all_posts,
+            "total_found": total_found,
+            "status": "success"
+        }
+
+    except Exception as e:
+        result = {
+            "agent": "Skeptic",
+            "topic": topic,
+            "error": str(e),
+            "status": "failed"
+        }
+
+    return result
+
+
+def run_professor_research(topic, raw_papers=None):
+    """Agent C: The Professor - Semantic Scholar
+
+    `raw_papers` skips the search call (batch mode prefetches them via the batch endpoint).
+    """
+    print(f"🎓 Professor researching: {topic}")
+
+    try:
+        if raw_papers is None:
+            # Semantic Scholar Graph API
+            url = "https://api.semanticscholar.org/graph/v1/paper/search"
+            params = {
+                "query": topic,
+                "limit": 10 if rank_results else 5,
+                "fields": SCHOLAR_FIELDS
+            }
+            headers = {"User-Agent": "VeritasiumHackathonBot/1.0"}
+
+            response = http_get(url, "semanticscholar", params=params, headers=headers, timeout=10)
+            raw_papers = response.json().get("data", []) if response.status_code == 200 else []
+
+        papers = []
+        for p in raw_papers:
+            if p.get("abstract"):
+                papers.append({
+                    "title": p.get("title"),
+                    "authors": [a["name"] for a in p.get("authors", [])[:2]],
+                    "abstract": p.get("abstract"),  # truncated after ranking
+                    "year": p.get("year"),
+                    "citations": p.get("citationCount") or 0,
+                    "pdf_url": p.get("openAccessPdf", {}).get("url") if p.get("openAccessPdf") else None
+                })
+
+        total_found = len(papers)
+        if rank_results:
+            # Relevance to the topic first, citations as a tie-breaking prior
+            papers = rank_items(topic, papers, text_of=lambda x: f"{x['title']} {x['abstract']}",
+                                prior=lambda x: 0.05 * math.log10(1 + x["citations"]))
+        else:
+            # Sort by citations
+            papers.sort(key=lambda x: x.get('citations', 0), reverse=True)
+        for paper in papers:
+            paper["abstract"] = paper["abstract"][:300] + "..."
+
+        result = {
+            "agent": "Professor",
+            "topic": topic,
+            "papers": papers[:PAPERS_KEPT],
+            "total_found": total_found,
+            "status": "success"
+        }
+
+    except Exception as e:
+        result = {
+            "agent": "Professor",
+            "topic": topic,
+            "error": str(e),
+            "status": "failed"
+        }
+
+    return result
+
+
+def fetch_scholar_papers_batch(topics):
+    """Search ids per topic, then fetch all paper details in one /paper/batch call -> {topic: papers}."""
+    headers = {"User-Agent": "VeritasiumHackathonBot/1.0"}
+    ids_by_topic = {}
+    for topic in topics:
+        try:
+            response = http_get(
+                "https://api.semanticscholar.org/graph/v1/paper/search", "semanticscholar",
+                params={"query": topic, "limit": 10 if rank_results else 5, "fields": "paperId"}, headers=headers, timeout=10,
+            )
+            if response.status_code != 200:
+                print(f"Semantic Scholar search error ({topic}): HTTP {response.status_code}")
+                ids_by_topic[topic] = None
+                continue
+            ids_by_topic[topic] = [p["paperId"] for p in response.json().get("data", []) if p.get("paperId")]
+        except Exception as e:
+            print(f"Semantic Scholar search error ({topic}): {e}")
+            ids_by_topic[topic] = None
+
+    unique_ids = list(dict.fromkeys(pid for ids in ids_by_topic.values() if ids for pid in ids))
+    details = {}
+    unanswered = set()
+    # The batch endpoint accepts up to 500 ids per call
+    for start in range(0, len(unique_ids), 500):
+        chunk = unique_ids[start:start + 500]
+        try:
+            response = limited_request(
+                http_session, "semanticscholar", "POST", "https://api.semanticscholar.org/graph/v1/paper/batch",
+                params={"fields": SCHOLAR_FIELDS}, json={"ids": chunk}, headers=headers, timeout=30,
+            )
+            if response.status_code != 200:
+                print(f"Semantic Scholar batch error: HTTP {response.status_code}")
+                unanswered.update(chunk)
+                continue
+            for pid, paper in zip(chunk, response.json()):
+                if paper:
+                    details[pid] = paper
+        except Exception as e:
+            print(f"Semantic Scholar batch error: {e}")
+            unanswered.update(chunk)
+
+    # Topics whose search or paper details failed get None so the Professor retries them individually
+    return {
+        topic: None if ids is None or unanswered.intersection(ids) else [details[pid] for pid in ids if pid in details]
+        for topic, ids in ids_by_topic.items()
+    }
+
+
+def research_topic(topic, wikidata_facts=None, raw_papers=None, on_result=None):
+    """Run all three research agents in parallel and combine their output.
+
+    on_result(agent_name, result) is called as each agent finishes, so callers can
+    publish partial research before the slowest agent is done.
+    """
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = {
+            executor.submit(run_historian_research, topic, wikidata_facts): "historian",
+            executor.submit(run_skeptic_research, topic): "skeptic",
+            executor.submit(run_professor_research, topic, raw_papers): "professor"
+        }
+
+        results = {}
+        for future in as_completed(futures):
+            agent_name = futures[future]
+            try:
+                results[agent_name] = future.result()
+            except Exception as e:
+                print(f"Error in {agent_name}: {e}")
+                results[agent_name] = {
+                    "agent": agent_name.capitalize(),
+                    "topic": topic,
+                    "error": str(e),
+                    "status": "failed"
+                }
+            if on_result is not None:
+                on_result(agent_name, results[agent_name])
+
+    # Extract agent data
+    historian_data = results.get("historian")
+    skeptic_data = results.get("skeptic")
+    professor_data = results.get("professor")
+
+    # Create combined research output
+    return {
+        "topic": topic,
+        "timestamp": datetime.now().isoformat(),
+        "agents": {
+            "historian": historian_data,
+            "skeptic": skeptic_data,
+            "professor": professor_data
+        },
+        "summary": {
+            "historian_status": historian_data.get("status", "unknown"),
+            "skeptic_status": skeptic_data.get("status", "unknown"),
+            "professor_status": professor_data.get("status", "unknown")
+        }
+    }
+
+
+AGENTS = {
+    "historian": run_historian_research,
+    "skeptic": run_skeptic_research,
+    "professor": run_professor_research,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a single research agent")
+    parser.add_argument("agent", choices=sorted(AGENTS), help="Agent to run")
+    parser.add_argument("topic", nargs="?", default=os.environ.get("TOPIC"), help="Research topic (default: $TOPIC)")
+    parser.add_argument("--output", default=None, help="Output JSON file (default: <agent>.json)")
+    args = parser.parse_args()
+    if not args.topic:
+        parser.error("a topic (or $TOPIC) is required")
+
+    result = AGENTS[args.agent](args.topic)
+    with open(args.output or f"{args.agent}.json", "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+    return 0 if result.get("status") == "success" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
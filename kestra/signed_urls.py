@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Time-limited HMAC-signed URLs for pipeline artifacts served by the backend.
+
+The avatar render (WaveSpeed) only needs to fetch the narration and the face
+image once, shortly after the job is submitted. Instead of pushing them to a
+third-party host, the backend serves them itself at
+
+    {PUBLIC_BASE_URL}/artifacts/{task_id}/{name}?expires=<unix>&sig=<hex>
+
+where sig = HMAC-SHA256(ARTIFACT_SIGNING_KEY, "{task_id}/{name}\\n{expires}").
+video_gen.py signs the URLs (same key, from the environment) and the backend
+verifies them, so a URL only works for one task's artifact and only until it
+expires (ARTIFACT_URL_TTL_SECONDS).
+
+The same signature authenticates the WaveSpeed completion webhook: the job
+manager adds signed_params("wavespeed-webhook/<token>") to the callback URL
+it registers, and the backend rejects callbacks that do not verify.
+
+Usage:
+    url = signed_url(f"{task_id}/output.mp3")
+    ok = verify(f"{task_id}/output.mp3", expires, sig)
+"""
+
+import hashlib
+import hmac
+import os
+import time
+from urllib.parse import quote, urlencode
+
+ARTIFACT_SIGNING_KEY = os.environ.get("ARTIFACT_SIGNING_KEY", "")
+PUBLIC_BASE_URL = os.environ.get("PUBLIC_BASE_URL", "").rstrip("/")
+ARTIFACT_URL_TTL_SECONDS = int(os.environ.get("ARTIFACT_URL_TTL_SECONDS", "3600"))
+
+
+def signing_configured():
+    """Signed URLs need both a secret and a base URL the video API can reach."""
+    return bool(ARTIFACT_SIGNING_KEY and PUBLIC_BASE_URL)
+
+
+def sign(path, expires, key=None):
+    message = f"{path}\n{int(expires)}".encode("utf-8")
+    return hmac.new((key or ARTIFACT_SIGNING_KEY).encode("utf-8"), message, hashlib.sha256).hexdigest()
+
+
+def signed_params(path, ttl=None, key=None):
+    """{"expires", "sig"} query parameters authorizing `path` for `ttl` seconds."""
+    expires = int(time.time() + (ttl or ARTIFACT_URL_TTL_SECONDS))
+    return {"expires": expires, "sig": sign(path, expires, key)}
+
+
+def signed_url(path, ttl=None, base_url=None, key=None):
+    """Absolute URL for `path` ("<task_id>/<name>") valid for `ttl` seconds."""
+    query = urlencode(signed_params(path, ttl, key))
+    return f"{base_url or PUBLIC_BASE_URL}/artifacts/{quote(path)}?{query}"
+
+
+def verify(path, expires, signature, key=None):
+    """True if the signature matches and the URL has not expired (constant-time compare)."""
+    if not (key or ARTIFACT_SIGNING_KEY) or not signature:
+        return False
+    try:
+        if int(expires) < time.time():
+            return False
+    except (TypeError, ValueError):
+        return False
+    return hmac.compare_digest(sign(path, expires, key), signature)
@@ -0,0 +1,21 @@
+"""
+Small text helpers shared by the research tooling (index, ranking, topic matching).
+"""
+
+import re
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "do", "does", "for",
+    "from", "how", "in", "is", "it", "its", "of", "on", "or", "that", "the", "this",
+    "to", "was", "what", "when", "where", "which", "who", "why", "will", "with",
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text, drop_stopwords=True):
+    """Lowercase word tokens, optionally without stopwords."""
+    tokens = _TOKEN_RE.findall((text or "").lower())
+    if drop_stopwords:
+        tokens = [t for t in tokens if t not in STOPWORDS]
+    return tokens
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Topic canonicalization and similarity index.
+
+"Why time moves forward" and "why does time move forward?" are the same request;
+keying caches on the raw string makes every rephrasing a miss. This module maps
+topics to a canonical slug (stopwords dropped, light stemming, sorted terms) and
+keeps a small MinHash index over previously researched topics, so research
+results and whole-pipeline artifacts can be reused above a similarity threshold.
+
+Usage:
+    index = TopicIndex("../research_outputs/topic_index.json")
+    match = index.match("why does time move forward?", kind="research")
+    index.record("Why time moves forward", kind="research", paths={"research": "..."})
+
+Set TOPIC_SIMILARITY_THRESHOLD (0-1, default 0.8) to tune reuse.
+"""
+
+import os
+import time
+import zlib
+
+from slugify import slugify
+
+from file_lock import load_json, locked, write_json_atomic
+from text_utils import tokenize
+
+DEFAULT_THRESHOLD = float(os.environ.get("TOPIC_SIMILARITY_THRESHOLD", "0.8"))
+NUM_PERM = 64
+_PRIME = (1 << 61) - 1
+# Fixed permutation coefficients so signatures stay comparable across runs
+_PERMS = [((i * 0x9E3779B1 + 1) % _PRIME, (i * 0x85EBCA77 + 7) % _PRIME) for i in range(NUM_PERM)]
+
+# Words that carry no topic identity in titles like "The science of why ..."
+FILLER_WORDS = {"science", "explained", "really", "actually", "video", "about"}
+
+
+def _stem(word):
+    """Tiny suffix stripper: moves/moved/moving/move -> mov, theories -> theory."""
+    if len(word) <= 3:
+        return word
+    if word.endswith("ies"):
+        return word[:-3] + "y"
+    for suffix in ("ing", "ed", "es", "s"):
+        if word.endswith(suffix) and not word.endswith("ss") and len(word) - len(suffix) >= 3:
+            word = word[: -len(suffix)]
+            break
+    if len(word) > 3 and word[-1] == word[-2] and word[-1] not in "aeiouls":
+        word = word[:-1]  # running -> run
+    return word[:-1] if word.endswith("e") and len(word) > 3 else word
+
+
+def canonical_terms(topic):
+    return sorted({_stem(t) for t in tokenize(topic) if t not in FILLER_WORDS})
+
+
+def canonical_topic(topic):
+    """Canonical slug for a topic, e.g. "why does time move forward?" -> "forward-mov-tim"."""
+    terms = canonical_terms(topic)
+    return slugify(" ".join(terms)) if terms else slugify(topic)
+
+
+def _shingles(topic):
+    """Word terms plus character trigrams, so near-spellings still overlap."""
+    terms = canonical_terms(topic)
+    text = " ".join(terms)
+    grams = {text[i:i + 3] for i in range(max(1, len(text) - 2))}
+    return set(terms) | grams
+
+
+def minhash(topic):
+    hashes = [zlib.crc32(s.encode("utf-8")) for s in _shingles(topic)] or [0]
+    return [min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMS]
+
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of two MinHash signatures."""
+    return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / len(sig_a)
+
+
+class TopicIndex:
+    """JSON-file index of researched topics and the artifacts produced for them.
+
+    Artifact paths are stored relative to the index file's directory; use resolve().
+    """
+
+    def __init__(self, path, threshold=DEFAULT_THRESHOLD):
+        self.path = path
+        self.threshold = threshold
+
+    def _load(self):
+        return load_json(self.path)
+
+    def resolve(self, path):
+        return os.path.join(os.path.dirname(os.path.abspath(self.path)), path)
+
+    def relative(self, path):
+        return os.path.relpath(os.path.abspath(path), os.path.dirname(os.path.abspath(self.path)))
+
+    def match(self, topic, kind, max_age=None):
+        """
+        Best previously seen topic with artifacts of `kind`, or None.
+
+        Returns {"topic", "canonical", "similarity", "paths", "meta", "updated_at"}.
+        """
+        canonical = canonical_topic(topic)
+        signature = minhash(topic)
+        best = None
+        now = time.time()
+        for key, entry in self._load().items():
+            artifact = entry.get("artifacts", {}).get(kind)
+            if not artifact:
+                continue
+            if max_age is not None and now - artifact.get("updated_at", 0) > max_age:
+                continue
+            score = 1.0 if key == canonical else similarity(signature, entry["signature"])
+            if score >= self.threshold and (best is None or score > best["similarity"]):
+                best = {
+                    "topic": entry["topic"],
+                    "canonical": key,
+                    "similarity": round(score, 3),
+                    "paths": artifact.get("paths", {}),
+                    "meta": artifact.get("meta", {}),
+                    "updated_at": artifact.get("updated_at"),
+                }
+        return best
+
+    def record(self, topic, kind, paths, meta=None):
+        """Remember that artifacts of `kind` for `topic` live at `paths`."""
+        canonical = canonical_topic(topic)
+        # Shared by every TopicIndex instance, thread and process using this file (file_lock.py);
+        # the re-read inside the lock keeps entries recorded by others meanwhile
+        with locked(self.path):
+            entries = self._load()
+            entry = entries.setdefault(canonical, {"topic": topic, "signature": minhash(topic), "artifacts": {}})
+            entry["artifacts"][kind] = {"paths": paths, "meta": meta or {}, "updated_at": time.time()}
+            write_json_atomic(self.path, entries)
+        return canonical
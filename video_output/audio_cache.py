@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache of synthesized TTS chunks.
+
+Each chunk is stored as <key>.mp3, where the key hashes everything that
+determines the audio: engine, voice id, model id, output format, voice
+settings and the chunk text. After an editor tweaks one paragraph of the
+script, only that paragraph misses and goes to ElevenLabs/Edge TTS; the rest
+is read back from disk. Neighbouring text (ElevenLabs previous_text /
+next_text) is deliberately not part of the key, so an edit does not
+invalidate the paragraphs around it. The directory is size-bounded and evicts
+the least recently used files first (file mtime is bumped on every hit).
+
+Usage:
+    cache = AudioCache("generated_tts/.audio_cache")
+    key = cache.key("elevenlabs", voice_id, model_id, output_format, settings, text)
+    audio = cache.get(key) or cache.put(key, synthesize(text))
+    print(cache.stats())
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+
+DEFAULT_MAX_BYTES = int(os.environ.get("TTS_CACHE_MAX_MB", "200")) * 1024 * 1024
+
+
+class AudioCache:
+    """Directory of MP3 chunks named by content key, with LRU eviction."""
+
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_BYTES):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    @staticmethod
+    def key(engine, voice, model=None, output_format=None, settings=None, text=""):
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        raw = json.dumps([engine, voice, model, output_format, settings or {}, text_hash], sort_keys=True)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """Cached audio bytes for `key`, or None."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)  # recency for LRU
+        except OSError:
+            self._count("misses")
+            return None
+        self._count("hits")
+        return data
+
+    def put(self, key, data):
+        """Store audio bytes (atomically) and evict old entries if over size; returns `data`."""
+        if not data or len(data) > self.max_bytes:
+            return data
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        self._evict()
+        return data
+
+    def stats(self):
+        """Hit/miss counters for this process, the reuse ratio and the current cache size."""
+        entries = self._entries()
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        return {
+            **stats,
+            "reuse_ratio": round(stats["hits"] / lookups, 3) if lookups else 0.0,
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+        }
+
+    def clear(self):
+        for path, _, _ in self._entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    # ------------------------------------------------------------------ #
+    # Internals
+    # ------------------------------------------------------------------ #
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.mp3")
+
+    def _entries(self):
+        """(path, size, mtime) of every cached chunk."""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".mp3"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((path, st.st_size, st.st_mtime))
+        return entries
+
+    def _evict(self):
+        """Drop least recently used chunks until the cache fits."""
+        with self._lock:
+            entries = self._entries()
+            total = sum(size for _, size, _ in entries)
+            if total <= self.max_bytes:
+                return
+            for path, size, _ in sorted(entries, key=lambda e: e[2]):
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                self._stats["evictions"] += 1
+                total -= size
+                if total <= self.max_bytes:
+                    break
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or clear the TTS chunk cache")
+    parser.add_argument("--cache-dir", default=os.path.join("generated_tts", ".audio_cache"))
+    parser.add_argument("--clear", action="store_true", help="Delete every cached chunk")
+    args = parser.parse_args()
+
+    cache = AudioCache(args.cache_dir)
+    if args.clear:
+        cache.clear()
+        print(f"🧹 Cleared {args.cache_dir}")
+        return 0
+    stats = cache.stats()
+    newest = max((mtime for _, _, mtime in cache._entries()), default=None)
+    age = f", last used {time.time() - newest:.0f}s ago" if newest else ""
+    print(f"🗂️ {args.cache_dir}: {stats['entries']} chunks, {stats['bytes'] / 1024 / 1024:.1f} MB{age}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Audio post-processing on decoded PCM (NumPy) before the avatar render.
+
+WaveSpeed render time and cost scale with audio length, and joined TTS chunks
+carry long pauses between paragraphs. The narration is decoded to mono PCM
+with ffmpeg and processed as arrays:
+
+1. silence detection: per-frame RMS level (10 ms frames) below a dBFS threshold;
+2. gap normalization: every silent run longer than `min_gap` is cut down to
+   `target_gap` (half kept on each side), leading/trailing silence to `edge_pad`;
+3. loudness normalization: gain so the RMS of the voiced frames hits the target
+   level, limited so peaks stay below `peak_db`.
+
+The result is re-encoded to MP3 and a report (seconds saved, gain, samples/s
+of the NumPy stage) is returned.
+
+Usage:
+    python3 audio_post.py generated_tts/output.mp3 --output generated_tts/output.mp3
+    python3 audio_post.py in.mp3 --output out.mp3 --threshold-db -45 --min-gap 0.35
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from mp3_frames import mp3_info
+
+SILENCE_THRESHOLD_DB = float(os.environ.get("AUDIO_SILENCE_THRESHOLD_DB", "-45"))
+MIN_GAP_SECONDS = float(os.environ.get("AUDIO_MIN_GAP_SECONDS", "0.35"))  # shorter pauses are left alone
+TARGET_GAP_SECONDS = float(os.environ.get("AUDIO_TARGET_GAP_SECONDS", "0.3"))
+EDGE_PAD_SECONDS = 0.1
+TARGET_LEVEL_DB = float(os.environ.get("AUDIO_TARGET_LEVEL_DB", "-18"))  # RMS of voiced audio, dBFS
+PEAK_DB = -1.0
+FRAME_MS = 10
+OUTPUT_BITRATE = "128k"
+
+
+def ffmpeg_available():
+    return shutil.which("ffmpeg") is not None
+
+
+def decode_pcm(path, sample_rate=None):
+    """Decode any audio file to mono float32 PCM in [-1, 1]; returns (samples, sample_rate)."""
+    if sample_rate is None:
+        with open(path, "rb") as f:
+            sample_rate = mp3_info(f.read())["sample_rate"] or 44100
+    result = subprocess.run(
+        ["ffmpeg", "-v", "error", "-i", path, "-f", "s16le", "-ac", "1", "-ar", str(sample_rate), "pipe:1"],
+        capture_output=True, check=True,
+    )
+    samples = np.frombuffer(result.stdout, dtype="<i2").astype(np.float32) / 32768.0
+    return samples, sample_rate
+
+
+def encode_mp3(samples, sample_rate, path, bitrate=OUTPUT_BITRATE):
+    """Encode mono float PCM to MP3 (written to a temp file, then moved into place)."""
+    pcm = (np.clip(samples, -1.0, 32767 / 32768) * 32768).astype("<i2").tobytes()
+    tmp = f"{path}.tmp.mp3"
+    subprocess.run(
+        ["ffmpeg", "-v", "error", "-y", "-f", "s16le", "-ac", "1", "-ar", str(sample_rate), "-i", "pipe:0",
+         "-b:a", bitrate, tmp],
+        input=pcm, capture_output=True, check=True,
+    )
+    os.replace(tmp, path)
+
+
+def frame_levels(samples, sample_rate, frame_ms=FRAME_MS):
+    """RMS level in dBFS of consecutive frames (the last partial frame is padded with silence)."""
+    frame = max(1, int(sample_rate * frame_ms / 1000))
+    count = -(-len(samples) // frame)
+    padded = np.zeros(count * frame, dtype=np.float32)
+    padded[:len(samples)] = samples
+    rms = np.sqrt(np.mean(padded.reshape(count, frame) ** 2, axis=1))
+    return 20 * np.log10(np.maximum(rms, 1e-10)), frame
+
+
+def silent_runs(silent):
+    """(starts, ends) frame indexes of runs of True in a boolean array (ends exclusive)."""
+    edges = np.diff(np.concatenate(([0], silent.astype(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def normalize_gaps(samples, sample_rate, silent, frame, min_gap=MIN_GAP_SECONDS, target_gap=TARGET_GAP_SECONDS,
+                   edge_pad=EDGE_PAD_SECONDS):
+    """Shorten long silent runs; returns (samples, number of gaps shortened)."""
+    starts, ends = silent_runs(silent)
+    starts, ends = starts * frame, np.minimum(ends * frame, len(samples))
+    lengths = ends - starts
+    keep = np.ones(len(samples), dtype=bool)
+    min_len = int(min_gap * sample_rate)
+    half_gap = int(target_gap * sample_rate / 2)
+    pad = int(edge_pad * sample_rate)
+    shortened = 0
+    for start, end, length in zip(starts, ends, lengths):
+        if start == 0:  # leading silence
+            keep[:max(0, end - pad)] = False
+        elif end >= len(samples):  # trailing silence
+            keep[start + pad:] = False
+        elif length > min_len:
+            keep[start + half_gap:end - half_gap] = False
+            shortened += 1
+    return samples[keep], shortened
+
+
+def normalize_loudness(samples, voiced, target_db=TARGET_LEVEL_DB, peak_db=PEAK_DB):
+    """Gain voiced RMS to target_db, capped so the peak stays under peak_db; returns (samples, gain_db)."""
+    if not voiced.any():
+        return samples, 0.0
+    rms = np.sqrt(np.mean(samples[voiced] ** 2))
+    peak = np.max(np.abs(samples))
+    if rms <= 0 or peak <= 0:
+        return samples, 0.0
+    gain_db = target_db - 20 * np.log10(rms)
+    gain_db = min(gain_db, peak_db - 20 * np.log10(peak))
+    return samples * np.float32(10 ** (gain_db / 20)), round(float(gain_db), 2)
+
+
+def process_audio(samples, sample_rate, threshold_db=SILENCE_THRESHOLD_DB, min_gap=MIN_GAP_SECONDS,
+                  target_gap=TARGET_GAP_SECONDS, target_db=TARGET_LEVEL_DB, normalize=True):
+    """Silence trimming/gap normalization and loudness normalization; returns (samples, report)."""
+    begin = time.perf_counter()
+    levels, frame = frame_levels(samples, sample_rate)
+    silent = levels < threshold_db
+    processed, shortened = normalize_gaps(samples, sample_rate, silent, frame, min_gap, target_gap)
+    gain_db = 0.0
+    if normalize:
+        levels, frame = frame_levels(processed, sample_rate)
+        voiced = np.repeat(levels >= threshold_db, frame)[:len(processed)]
+        processed, gain_db = normalize_loudness(processed, voiced, target_db)
+    elapsed = time.perf_counter() - begin
+    report = {
+        "sample_rate": sample_rate,
+        "original_seconds": round(len(samples) / sample_rate, 2),
+        "processed_seconds": round(len(processed) / sample_rate, 2),
+        "seconds_saved": round((len(samples) - len(processed)) / sample_rate, 2),
+        "gaps_shortened": shortened,
+        "gain_db": gain_db,
+        "processing_seconds": round(elapsed, 4),
+        "samples_per_second": int(len(samples) / elapsed) if elapsed else None,
+    }
+    return processed, report
+
+
+def postprocess_file(input_path, output_path=None, **options):
+    """Decode, process and re-encode an audio file (in place by default); returns the report."""
+    samples, sample_rate = decode_pcm(input_path)
+    processed, report = process_audio(samples, sample_rate, **options)
+    encode_mp3(processed, sample_rate, output_path or input_path)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Trim long pauses and normalize loudness of narration audio")
+    parser.add_argument("input", help="Audio file (e.g. generated_tts/output.mp3)")
+    parser.add_argument("--output", default=None, help="Output MP3 (default: overwrite the input)")
+    parser.add_argument("--threshold-db", type=float, default=SILENCE_THRESHOLD_DB, help="Silence level, dBFS")
+    parser.add_argument("--min-gap", type=float, default=MIN_GAP_SECONDS, help="Only pauses longer than this are cut")
+    parser.add_argument("--target-gap", type=float, default=TARGET_GAP_SECONDS, help="Pause length after cutting")
+    parser.add_argument("--target-db", type=float, default=TARGET_LEVEL_DB, help="Voiced RMS level, dBFS")
+    parser.add_argument("--no-normalize", action="store_true", help="Skip loudness normalization")
+    parser.add_argument("--report", default=None, help="Write the JSON report here")
+    args = parser.parse_args()
+
+    if not ffmpeg_available():
+        print("❌ ffmpeg not found (needed to decode/encode audio)")
+        return 1
+    report = postprocess_file(args.input, args.output, threshold_db=args.threshold_db, min_gap=args.min_gap,
+                              target_gap=args.target_gap, target_db=args.target_db,
+                              normalize=not args.no_normalize)
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+    print(f"✂️ Audio: {report['original_seconds']:.1f}s → {report['processed_seconds']:.1f}s "
+          f"(saved {report['seconds_saved']:.1f}s, {report['gaps_shortened']} pauses shortened, "
+          f"gain {report['gain_db']:+.1f} dB, {report['samples_per_second']:,} samples/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
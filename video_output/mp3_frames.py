@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+MPEG audio frame parsing and lossless MP3 concatenation and splitting.
+
+TTS chunks synthesized separately are joined at the frame level: ID3v2/ID3v1
+tags and the Xing/Info/VBRI header frame of every part are dropped and the
+remaining audio frames are concatenated as-is, so no decode/re-encode (and no
+ffmpeg) is needed. All parts must share sample rate and channel mode, which
+holds for chunks from the same TTS engine and output format.
+
+Usage:
+    data, info = concat_mp3([part1, part2, part3])
+    info = mp3_info(open("output.mp3", "rb").read())   # frames, seconds, sample_rate, bitrate
+    parts = split_mp3(data, [60.0, 120.0])
+"""
+
+import argparse
+import sys
+
+# Bitrates (kbps) by (MPEG-1?, layer)
+_BITRATES = {
+    (True, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (True, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (True, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (False, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (False, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (False, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+# Sample rates by version bits (0 = MPEG-2.5, 2 = MPEG-2, 3 = MPEG-1)
+_SAMPLE_RATES = {0: (11025, 12000, 8000), 2: (22050, 24000, 16000), 3: (44100, 48000, 32000)}
+
+
+def parse_header(data, offset):
+    """Decode the 4-byte frame header at `offset`; returns a dict or None if it is not a valid header."""
+    if offset + 4 > len(data) or data[offset] != 0xFF or data[offset + 1] & 0xE0 != 0xE0:
+        return None
+    b1, b2, b3 = data[offset + 1], data[offset + 2], data[offset + 3]
+    version = (b1 >> 3) & 0x3
+    layer = 4 - ((b1 >> 1) & 0x3)
+    bitrate_index = b2 >> 4
+    rate_index = (b2 >> 2) & 0x3
+    if version == 1 or layer == 4 or bitrate_index in (0, 15) or rate_index == 3:
+        return None  # reserved / free-format / bad values
+    mpeg1 = version == 3
+    bitrate = _BITRATES[(mpeg1, layer)][bitrate_index] * 1000
+    sample_rate = _SAMPLE_RATES[version][rate_index]
+    padding = (b2 >> 1) & 0x1
+    if layer == 1:
+        length = (12 * bitrate // sample_rate + padding) * 4
+        samples = 384
+    else:
+        samples = 1152 if (layer == 2 or mpeg1) else 576
+        length = (samples // 8) * bitrate // sample_rate + padding
+    return {
+        "version": version,
+        "layer": layer,
+        "bitrate": bitrate,
+        "sample_rate": sample_rate,
+        "channel_mode": b3 >> 6,
+        "samples": samples,
+        "length": length,
+    }
+
+
+def strip_id3(data):
+    """Audio bytes without a leading ID3v2 tag or a trailing ID3v1 tag."""
+    start, end = 0, len(data)
+    if data[:3] == b"ID3" and len(data) >= 10:
+        size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]  # synchsafe
+        footer = 10 if data[5] & 0x10 else 0
+        start = 10 + size + footer
+    if end - start >= 128 and data[end - 128:end - 125] == b"TAG":
+        end -= 128
+    return data[start:end]
+
+
+def _is_info_frame(data, offset, header):
+    """True for a Xing/Info/VBRI header frame (metadata, no audio)."""
+    mono = header["channel_mode"] == 3
+    if header["version"] == 3:
+        side_info = 17 if mono else 32
+    else:
+        side_info = 9 if mono else 17
+    tag = data[offset + 4 + side_info:offset + 8 + side_info]
+    return tag in (b"Xing", b"Info") or data[offset + 36:offset + 40] == b"VBRI"
+
+
+def iter_frames(data):
+    """Yield (offset, header) for every audio frame, resyncing over junk bytes."""
+    offset = 0
+    while offset + 4 <= len(data):
+        header = parse_header(data, offset)
+        if header is None or header["length"] <= 0 or offset + header["length"] > len(data):
+            offset += 1
+            continue
+        yield offset, header
+        offset += header["length"]
+
+
+def audio_frames(data):
+    """(concatenated audio frames, info) for one MP3 file's bytes, tags and info frames removed."""
+    data = strip_id3(data)
+    frames = []
+    info = {"frames": 0, "samples": 0, "sample_rate": None, "channel_mode": None, "bitrate": None}
+    for offset, header in iter_frames(data):
+        if not frames and _is_info_frame(data, offset, header):
+            continue
+        frames.append(data[offset:offset + header["length"]])
+        info["frames"] += 1
+        info["samples"] += header["samples"]
+        if info["sample_rate"] is None:
+            info.update(sample_rate=header["sample_rate"], channel_mode=header["channel_mode"],
+                        bitrate=header["bitrate"])
+    info["seconds"] = round(info["samples"] / info["sample_rate"], 3) if info["sample_rate"] else 0.0
+    return b"".join(frames), info
+
+
+def mp3_info(data):
+    return audio_frames(data)[1]
+
+
+def concat_mp3(parts):
+    """Join MP3 byte strings frame by frame (no re-encoding); returns (bytes, info)."""
+    chunks = []
+    total = {"frames": 0, "samples": 0, "sample_rate": None, "channel_mode": None, "bitrate": None, "parts": 0}
+    for part in parts:
+        frames, info = audio_frames(part)
+        if not info["frames"]:
+            continue
+        if total["sample_rate"] is None:
+            total.update(sample_rate=info["sample_rate"], channel_mode=info["channel_mode"], bitrate=info["bitrate"])
+        elif (info["sample_rate"], info["channel_mode"]) != (total["sample_rate"], total["channel_mode"]):
+            raise ValueError(
+                f"Cannot join MP3s without re-encoding: {info['sample_rate']} Hz/mode {info['channel_mode']} "
+                f"vs {total['sample_rate']} Hz/mode {total['channel_mode']}"
+            )
+        chunks.append(frames)
+        total["frames"] += info["frames"]
+        total["samples"] += info["samples"]
+        total["parts"] += 1
+    total["seconds"] = round(total["samples"] / total["sample_rate"], 3) if total["sample_rate"] else 0.0
+    return b"".join(chunks), total
+
+
+def split_mp3(data, cut_seconds):
+    """
+    Split MP3 bytes at the frame boundaries nearest to `cut_seconds` (no re-encoding); returns the parts.
+    Cut inside pauses: a frame may borrow bits from the previous one, which is inaudible in silence.
+    """
+    data = strip_id3(data)
+    cuts = sorted(cut_seconds)
+    parts, start, elapsed = [], None, 0.0
+    for offset, header in iter_frames(data):
+        if start is None:
+            if _is_info_frame(data, offset, header):
+                continue
+            start = offset
+        if cuts and elapsed >= cuts[0]:
+            parts.append(data[start:offset])
+            start = offset
+            while cuts and elapsed >= cuts[0]:
+                cuts.pop(0)
+        elapsed += header["samples"] / header["sample_rate"]
+    if start is not None:
+        parts.append(data[start:])
+    return [part for part in parts if part]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or losslessly concatenate MP3 files")
+    parser.add_argument("inputs", nargs="+", help="MP3 files")
+    parser.add_argument("--output", default=None, help="Concatenate the inputs into this file")
+    args = parser.parse_args()
+
+    parts = []
+    for path in args.inputs:
+        with open(path, "rb") as f:
+            parts.append(f.read())
+    if args.output:
+        data, info = concat_mp3(parts)
+        with open(args.output, "wb") as f:
+            f.write(data)
+        print(f"✅ Joined {info['parts']} files → {args.output} ({info['frames']} frames, {info['seconds']:.1f}s)")
+    else:
+        for path, part in zip(args.inputs, parts):
+            info = mp3_info(part)
+            print(f"{path}: {info['frames']} frames, {info['seconds']:.1f}s, "
+                  f"{info['sample_rate']} Hz, {(info['bitrate'] or 0) // 1000} kbps")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
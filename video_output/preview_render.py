@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Instant local preview video: the face image, the narration and burned-in captions.
+
+The WaveSpeed avatar render takes minutes; this renders a lightweight MP4
+with ffmpeg in seconds, fully offline, as soon as output.mp3 exists. The
+still image is encoded at 2 fps (libx264 ultrafast, stillimage tuning), so
+encoding cost is dominated by the audio. Captions are the script's
+sentences (final_5min_script.json, else the TTS text), each shown for a
+share of the narration proportional to its length, written as SRT and
+burned in with the subtitles filter (skipped if ffmpeg lacks libass).
+
+The backend serves the result as video_output/generated_video/preview.mp4
+until the avatar video replaces it.
+
+Usage:
+    python3 preview_render.py --audio generated_tts/output.mp3 --text ../research_outputs/tts.txt
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+
+from audio_post import ffmpeg_available
+from mp3_frames import mp3_info
+
+PREVIEW_NAME = "preview.mp4"
+PREVIEW_HEIGHT = 480
+PREVIEW_FPS = 2
+CAPTION_MAX_CHARS = 90
+CAPTION_STYLE = "FontName=DejaVu Sans,FontSize=16,Outline=2,Shadow=0,MarginV=24"
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def caption_texts(text_file):
+    """Caption lines: the structured script's sentences if available, else the plain TTS text's."""
+    structure_file = os.path.join(os.path.dirname(os.path.abspath(text_file)), "final_5min_script.json")
+    try:
+        with open(structure_file, 'r', encoding='utf-8') as f:
+            structure = json.load(f)
+        paragraphs = [p["text"] for section in structure["sections"] for p in section["paragraphs"]]
+    except (OSError, ValueError, KeyError, TypeError):
+        with open(text_file, 'r', encoding='utf-8') as f:
+            paragraphs = [p for p in f.read().split("\n\n") if p.strip()]
+    lines = []
+    for paragraph in paragraphs:
+        for sentence in _SENTENCE_END.split(" ".join(paragraph.split())):
+            lines += _wrap(sentence)
+    return [line for line in lines if line]
+
+
+def _wrap(sentence, limit=CAPTION_MAX_CHARS):
+    """Split a long sentence into caption-sized pieces on word boundaries."""
+    pieces, current = [], ""
+    for word in sentence.split():
+        if current and len(current) + len(word) + 1 > limit:
+            pieces.append(current)
+            current = word
+        else:
+            current = f"{current} {word}".strip()
+    return pieces + ([current] if current else [])
+
+
+def _timestamp(seconds):
+    ms = int(round(seconds * 1000))
+    return f"{ms // 3600000:02d}:{ms // 60000 % 60:02d}:{ms // 1000 % 60:02d},{ms % 1000:03d}"
+
+
+def build_srt(lines, duration):
+    """SRT where every line gets a share of `duration` proportional to its length."""
+    total = sum(len(line) for line in lines) or 1
+    entries, start = [], 0.0
+    for i, line in enumerate(lines, 1):
+        end = min(duration, start + duration * len(line) / total)
+        entries.append(f"{i}\n{_timestamp(start)} --> {_timestamp(end)}\n{line}\n")
+        start = end
+    return "\n".join(entries)
+
+
+def _encode(image_file, audio_file, output_file, subtitles=None):
+    video_filter = f"scale=-2:{PREVIEW_HEIGHT},format=yuv420p"
+    if subtitles:
+        # Relative name (ffmpeg runs in its directory): avoids filter-graph escaping of the path
+        video_filter += f",subtitles={os.path.basename(subtitles)}:force_style='{CAPTION_STYLE}'"
+    tmp = f"{output_file}.tmp.mp4"
+    subprocess.run(
+        ["ffmpeg", "-v", "error", "-y", "-loop", "1", "-framerate", str(PREVIEW_FPS), "-i", os.path.abspath(image_file),
+         "-i", os.path.abspath(audio_file), "-vf", video_filter, "-c:v", "libx264", "-preset", "ultrafast",
+         "-tune", "stillimage", "-r", str(PREVIEW_FPS), "-c:a", "aac", "-b:a", "96k", "-shortest",
+         "-movflags", "+faststart", os.path.abspath(tmp)],
+        capture_output=True, check=True, cwd=os.path.dirname(os.path.abspath(subtitles or output_file)),
+    )
+    os.replace(tmp, output_file)
+
+
+def render_preview(audio_file, image_file, text_file, output_file):
+    """Render the preview MP4 (atomically replaced); returns a report."""
+    begin = time.time()
+    with open(audio_file, "rb") as f:
+        duration = mp3_info(f.read())["seconds"]
+    lines = caption_texts(text_file) if text_file and os.path.exists(text_file) else []
+    os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+    subtitles = None
+    if lines:
+        subtitles = os.path.splitext(os.path.abspath(output_file))[0] + ".srt"
+        with open(subtitles, 'w', encoding='utf-8') as f:
+            f.write(build_srt(lines, duration))
+    captions = bool(subtitles)
+    try:
+        _encode(image_file, audio_file, output_file, subtitles)
+    except subprocess.CalledProcessError as e:
+        if not subtitles:
+            raise
+        print(f"⚠️ Captions could not be burned in ({e.stderr.decode(errors='replace').strip()[:200]}); "
+              "rendering without them")
+        _encode(image_file, audio_file, output_file)
+        captions = False
+    return {
+        "file": output_file,
+        "audio_seconds": duration,
+        "captions": len(lines) if captions else 0,
+        "render_seconds": round(time.time() - begin, 2),
+    }
+
+
+def main():
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Render a still-image + captions preview of the narration")
+    parser.add_argument("--audio", default=os.path.join(base_dir, "generated_tts", "output.mp3"))
+    parser.add_argument("--image", default=os.path.join(base_dir, "face", "veritasium_dreamworks.png"))
+    parser.add_argument("--text", default=os.path.join(base_dir, "..", "research_outputs", "tts.txt"),
+                        help="TTS text; final_5min_script.json next to it is used for captions if present")
+    parser.add_argument("--output", default=os.path.join(base_dir, "generated_video", PREVIEW_NAME))
+    args = parser.parse_args()
+
+    if not ffmpeg_available():
+        print("❌ ffmpeg not found")
+        return 1
+    report = render_preview(args.audio, args.image, args.text, args.output)
+    print(f"🎞️ Preview: {report['file']} ({report['audio_seconds']:.0f}s, {report['captions']} captions, "
+          f"rendered in {report['render_seconds']:.1f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Resumable, parallel HTTP range downloads for generated videos.
+
+- The size, range support and ETag come from a HEAD request; servers without
+  range support get a plain streamed download.
+- The file is fetched as `parts` byte ranges on separate connections with
+  1 MB reads, written in place into a preallocated `<output>.part`.
+- Progress per range is saved next to it (`<output>.part.json`). A rerun
+  after an interruption continues every range where it stopped. If-Range
+  guards against the file changing on the server meanwhile (a 200 instead
+  of 206 restarts the download).
+- Failed ranges are retried from their last byte. Timeouts apply to both
+  connecting and reading.
+- The result is checked against the expected size and optionally against a
+  SHA-256. The ETag is only compared as an MD5 for providers listed in
+  DOWNLOAD_MD5_ETAG_PROVIDERS (S3-style origins whose ETag is the content
+  MD5); other servers use opaque tags that merely look like one. Only then
+  is it renamed into place, so a partial or corrupt file never appears
+  under the output name.
+
+Usage:
+    report = download("https://.../video.mp4", "generated_video/x.mp4", parts=4)
+    python3 ranged_download.py URL --output x.mp4 --parts 4 --compare   # single vs parallel throughput
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "kestra"))
+from provider_limits import limited_request
+
+DOWNLOAD_PARTS = int(os.environ.get("DOWNLOAD_PARTS", "4"))
+MIN_PART_BYTES = 4 * 1024 * 1024  # smaller files are not worth splitting
+CHUNK_BYTES = 1024 * 1024
+TIMEOUT = (10, 60)  # connect, read
+PART_RETRIES = 3
+STATE_SAVE_BYTES = 8 * 1024 * 1024  # persist progress at most every 8 MB per range
+# Providers whose ETag is known to be the MD5 of the content (opt-in, comma-separated)
+MD5_ETAG_PROVIDERS = {p.strip() for p in os.environ.get("DOWNLOAD_MD5_ETAG_PROVIDERS", "").split(",") if p.strip()}
+
+_MD5_ETAG = re.compile(r'^"?([0-9a-f]{32})"?$')
+
+
+class DownloadError(Exception):
+    pass
+
+
+class _RangeIgnored(DownloadError):
+    pass
+
+
+def _probe(url, provider):
+    response = limited_request(requests, provider, "HEAD", url, allow_redirects=True, timeout=TIMEOUT)
+    if response.status_code >= 400:
+        return response.url, None, False, None
+    size = response.headers.get("Content-Length")
+    ranges = response.headers.get("Accept-Ranges", "").lower() == "bytes"
+    return response.url, int(size) if size and size.isdigit() else None, ranges, response.headers.get("ETag")
+
+
+def _file_digests(path):
+    md5, sha256 = hashlib.md5(), hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(CHUNK_BYTES), b""):
+            md5.update(block)
+            sha256.update(block)
+    return md5.hexdigest(), sha256.hexdigest()
+
+
+class _State:
+    """Per-range progress of one download, persisted as JSON next to the partial file."""
+
+    def __init__(self, path, size, etag, parts):
+        self.path = path
+        self._lock = threading.Lock()
+        self._unsaved = 0
+        saved = None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            pass
+        self.size, self.etag = size, etag
+        if saved and saved.get("size") == size and saved.get("etag") == etag:
+            self.ranges = saved["ranges"]
+            self.resumed = sum(r[2] for r in self.ranges)
+        else:
+            self.reset(parts)
+
+    def reset(self, parts):
+        """Fresh layout: `parts` equal ranges, nothing downloaded."""
+        step = -(-self.size // parts)
+        self.ranges = [[start, min(self.size, start + step) - 1, 0] for start in range(0, self.size, step)]
+        self.resumed = 0
+
+    def advance(self, index, nbytes):
+        with self._lock:
+            self.ranges[index][2] += nbytes
+            self._unsaved += nbytes
+            if self._unsaved >= STATE_SAVE_BYTES:
+                self._save()
+
+    def save(self):
+        with self._lock:
+            self._save()
+
+    def _save(self):
+        self._unsaved = 0
+        with open(self.path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"size": self.size, "etag": self.etag, "ranges": self.ranges}, f)
+        os.replace(self.path + ".tmp", self.path)
+
+
+def _fetch_range(url, part_file, state, index, etag, provider):
+    start, end, _ = state.ranges[index]
+    for attempt in range(PART_RETRIES):
+        done = state.ranges[index][2]
+        if start + done > end:
+            return
+        headers = {"Range": f"bytes={start + done}-{end}"}
+        if etag:
+            headers["If-Range"] = etag
+        try:
+            response = limited_request(requests, provider, "GET", url, headers=headers, stream=True, timeout=TIMEOUT)
+            if response.status_code == 200:
+                raise _RangeIgnored("server ignored the range (file changed?)")
+            response.raise_for_status()
+            with open(part_file, "r+b") as f:
+                f.seek(start + done)
+                for block in response.iter_content(chunk_size=CHUNK_BYTES):
+                    f.write(block)
+                    state.advance(index, len(block))
+            if start + state.ranges[index][2] > end:
+                return
+        except DownloadError:
+            raise
+        except requests.RequestException as e:
+            print(f"⚠️ Range {index + 1} interrupted (attempt {attempt + 1}/{PART_RETRIES}): {e}")
+            time.sleep(2 ** attempt)
+    raise DownloadError(f"range {index + 1} incomplete after {PART_RETRIES} attempts")
+
+
+def _stream(url, part_file, provider):
+    response = limited_request(requests, provider, "GET", url, stream=True, timeout=TIMEOUT)
+    response.raise_for_status()
+    with open(part_file, "wb") as f:
+        for block in response.iter_content(chunk_size=CHUNK_BYTES):
+            f.write(block)
+
+
+def download(url, output_file, parts=DOWNLOAD_PARTS, expected_sha256=None, provider="wavespeed",
+             verify_etag=None):
+    """
+    Download `url` to `output_file` (parallel ranges if the server supports them, resuming a previous
+    partial download). Returns a report with bytes, seconds, MB/s, ranges, resumed bytes and the SHA-256.
+    `verify_etag` (default: provider in MD5_ETAG_PROVIDERS) also checks an MD5-shaped ETag against the content.
+    """
+    if verify_etag is None:
+        verify_etag = provider in MD5_ETAG_PROVIDERS
+    begin = time.time()
+    part_file = f"{output_file}.part"
+    state_file = f"{part_file}.json"
+    os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+
+    final_url, size, ranges, etag = _probe(url, provider)
+    state = None
+    if ranges and size:
+        parts = max(1, min(parts, size // MIN_PART_BYTES or 1))
+        state = _State(state_file, size, etag, parts)
+        if state.resumed and (not os.path.exists(part_file) or os.path.getsize(part_file) != size):
+            state.reset(parts)  # progress without a matching partial file
+        if not state.resumed:
+            with open(part_file, "wb") as f:
+                f.truncate(size)
+        else:
+            print(f"⏯️ Resuming download: {state.resumed / 1e6:.1f} of {size / 1e6:.1f} MB already on disk")
+        try:
+            with ThreadPoolExecutor(max_workers=len(state.ranges)) as pool:
+                futures = [pool.submit(_fetch_range, final_url, part_file, state, i, etag, provider)
+                           for i in range(len(state.ranges))]
+                for future in futures:
+                    future.result()
+            state.save()
+        except _RangeIgnored:
+            # The file changed since the partial download (or ranges do not really work): start over
+            print("⚠️ Server ignored the range request; downloading the whole file again")
+            if os.path.exists(state_file):
+                os.remove(state_file)
+            state, size, etag = None, None, None  # the old size/ETag no longer describe the file
+            _stream(final_url, part_file, provider)
+        except BaseException:
+            state.save()
+            raise
+    else:
+        _stream(final_url, part_file, provider)
+
+    actual = os.path.getsize(part_file)
+    if size is not None and actual != size:
+        os.remove(part_file)
+        raise DownloadError(f"size mismatch: got {actual} bytes, expected {size}")
+    md5, sha256 = _file_digests(part_file)
+    etag_md5 = _MD5_ETAG.match(etag or "") if verify_etag else None
+    if etag_md5 and etag_md5.group(1) != md5:
+        os.remove(part_file)
+        raise DownloadError("checksum mismatch against the server's ETag")
+    if expected_sha256 and expected_sha256 != sha256:
+        os.remove(part_file)
+        raise DownloadError("SHA-256 mismatch")
+    os.replace(part_file, output_file)
+    if state is not None and os.path.exists(state_file):
+        os.remove(state_file)
+
+    seconds = time.time() - begin
+    downloaded = actual - (state.resumed if state else 0)
+    return {
+        "file": output_file,
+        "bytes": actual,
+        "seconds": round(seconds, 3),
+        "mb_per_second": round(downloaded / 1e6 / seconds, 2) if seconds else None,
+        "ranges": len(state.ranges) if state else 1,
+        "resumed_bytes": state.resumed if state else 0,
+        "verified": "etag-md5" if etag_md5 else ("sha256" if expected_sha256 else "size"),
+        "sha256": sha256,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel, resumable ranged download")
+    parser.add_argument("url")
+    parser.add_argument("--output", required=True)
+    parser.add_argument("--parts", type=int, default=DOWNLOAD_PARTS)
+    parser.add_argument("--sha256", default=None, help="Expected SHA-256 of the file")
+    parser.add_argument("--compare", action="store_true", help="Also time a single-connection download")
+    parser.add_argument("--verify-etag", action="store_true", help="The server's ETag is the content MD5")
+    args = parser.parse_args()
+
+    runs = [1, args.parts] if args.compare else [args.parts]
+    for parts in runs:
+        if os.path.exists(args.output):
+            os.remove(args.output)
+        report = download(args.url, args.output, parts=parts, expected_sha256=args.sha256, provider="default",
+                          verify_etag=args.verify_etag)
+        print(f"📥 {report['ranges']} range(s): {report['bytes'] / 1e6:.1f} MB in {report['seconds']:.2f}s "
+              f"({report['mb_per_second']} MB/s, verified by {report['verified']})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
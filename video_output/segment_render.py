@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Segment-parallel avatar rendering.
+
+A WaveSpeed render takes roughly as long as the clip, so a 5-minute narration
+submitted as one job means a 5-minute wait. Instead the audio is split into
+segments of about SEGMENT_SECONDS, each cut placed in the middle of the pause
+(silence detected on decoded PCM, as in audio_post.py) closest to the target
+length, so no word is cut. Segments are split at MP3 frame boundaries
+(mp3_frames.split_mp3, no re-encode), rendered as separate WaveSpeed jobs with
+at most MAX_PARALLEL in flight, and the returned MP4s are joined at the
+container level with ffmpeg's concat demuxer (-c copy), so the video is not
+re-encoded either.
+
+video_gen.py --segment-seconds 60 wires this into the pipeline; the report
+(generated_tts/segment_render_report.json) has every segment's render time and
+the wall-clock speedup over rendering them one after another.
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from audio_post import SILENCE_THRESHOLD_DB, decode_pcm, ffmpeg_available, frame_levels, silent_runs
+from mp3_frames import mp3_info, split_mp3
+
+SEGMENT_SECONDS = float(os.environ.get("WAVESPEED_SEGMENT_SECONDS", "0"))  # 0 = render as one job
+MAX_PARALLEL = int(os.environ.get("WAVESPEED_MAX_PARALLEL", "3"))
+MIN_PAUSE_SECONDS = 0.15  # shortest silence a cut may be placed in
+SEGMENTS_DIR_NAME = "segments"
+SEGMENT_NAME = "segment_{:02d}.mp3"
+
+
+def find_cut_points(samples, sample_rate, target_seconds, threshold_db=SILENCE_THRESHOLD_DB):
+    """
+    Cut times (seconds) for segments of about `target_seconds`: the middle of the pause closest to each
+    target, searched within ±50% of it. Falls back to a hard cut at the target if there is no pause.
+    """
+    levels, frame = frame_levels(samples, sample_rate)
+    starts, ends = silent_runs(levels < threshold_db)
+    frame_seconds = frame / sample_rate
+    long_enough = (ends - starts) * frame_seconds >= MIN_PAUSE_SECONDS
+    pauses = (starts[long_enough] + ends[long_enough]) / 2 * frame_seconds
+
+    duration = len(samples) / sample_rate
+    cuts, last = [], 0.0
+    while duration - last > target_seconds * 1.5:
+        target = last + target_seconds
+        window = pauses[(pauses > last + target_seconds / 2) & (pauses < target + target_seconds / 2)]
+        cut = float(window[np.argmin(np.abs(window - target))]) if len(window) else target
+        cuts.append(round(cut, 3))
+        last = cut
+    return cuts
+
+
+def split_audio(audio_file, target_seconds, output_dir):
+    """Split an MP3 into segment files at pauses; returns their paths (a single path if it is short)."""
+    samples, sample_rate = decode_pcm(audio_file)
+    cuts = find_cut_points(samples, sample_rate, target_seconds)
+    with open(audio_file, "rb") as f:
+        parts = split_mp3(f.read(), cuts)
+    os.makedirs(output_dir, exist_ok=True)
+    for name in os.listdir(output_dir):
+        if name.startswith("segment_"):
+            os.remove(os.path.join(output_dir, name))
+    paths = []
+    for i, part in enumerate(parts):
+        path = os.path.join(output_dir, SEGMENT_NAME.format(i))
+        with open(path, "wb") as f:
+            f.write(part)
+        paths.append(path)
+    return paths
+
+
+def segment_seconds(path):
+    with open(path, "rb") as f:
+        return mp3_info(f.read())["seconds"]
+
+
+def concat_mp4(paths, output_file):
+    """Join MP4s with identical codec parameters without re-encoding (ffmpeg concat demuxer, -c copy)."""
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as listing:
+        for path in paths:
+            listing.write(f"file '{os.path.abspath(path)}'\n")
+    try:
+        subprocess.run(
+            ["ffmpeg", "-v", "error", "-y", "-f", "concat", "-safe", "0", "-i", listing.name,
+             "-c", "copy", "-movflags", "+faststart", output_file],
+            capture_output=True, check=True,
+        )
+    finally:
+        os.remove(listing.name)
+    return output_file
+
+
+async def render_segments(manager, audio_urls, image_url, keys=None, max_parallel=MAX_PARALLEL):
+    """
+    Render every segment through a wavespeed_jobs.VideoJobManager, at most `max_parallel` at a time.
+    Returns [(video_url, render_seconds)] in segment order; raises if any segment fails.
+    """
+    semaphore = asyncio.Semaphore(max(1, max_parallel))
+    keys = keys or [None] * len(audio_urls)
+
+    async def render(i):
+        async with semaphore:
+            begin = time.time()
+            video_url = await manager.render(audio_urls[i], image_url, key=keys[i])
+            print(f"🎞️ Segment {i + 1}/{len(audio_urls)} rendered in {time.time() - begin:.1f}s")
+            return video_url, round(time.time() - begin, 2)
+
+    return await asyncio.gather(*(render(i) for i in range(len(audio_urls))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show where an MP3 would be split for segment rendering")
+    parser.add_argument("input", help="Narration MP3 (e.g. generated_tts/output_post.mp3)")
+    parser.add_argument("--segment-seconds", type=float, default=SEGMENT_SECONDS or 60)
+    parser.add_argument("--output-dir", default=None, help="Also write the segment files here")
+    args = parser.parse_args()
+
+    if not ffmpeg_available():
+        print("❌ ffmpeg not found (needed to decode audio)")
+        return 1
+    if args.output_dir:
+        for path in split_audio(args.input, args.segment_seconds, args.output_dir):
+            print(f"{path}: {segment_seconds(path):.1f}s")
+        return 0
+    samples, sample_rate = decode_pcm(args.input)
+    cuts = find_cut_points(samples, sample_rate, args.segment_seconds)
+    print(f"{len(samples) / sample_rate:.1f}s → {len(cuts) + 1} segments, cuts at "
+          f"{', '.join(f'{c:.1f}s' for c in cuts) or 'none'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
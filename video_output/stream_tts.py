@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Streaming TTS: synthesize sentences as they arrive and append the audio in order.
+
+The Director (ai-engine/director.py --stream-tts) feeds completed narration
+sentences into a StreamingSynthesizer while the script is still being
+generated. Sentences are synthesized concurrently on a background event loop
+(same per-engine limits, retries and audio cache as the paragraph-parallel
+path in video_gen.py, from tts_engines.py) and their MPEG frames are appended to output.mp3 strictly
+in speaking order, so the file is playable from the first sentence on and
+only ever grows. A manifest next to it records every appended chunk (byte
+offset, size, duration) and when the first audio became available.
+
+The ordered append and the manifest (OrderedAudioWriter) are also used by the
+paragraph-parallel path, so the backend can stream output.mp3 while either
+path is still synthesizing.
+
+Usage:
+    synth = StreamingSynthesizer("generated_tts/output.mp3", "edge_tts")
+    synth.submit("First sentence.")
+    ...
+    report = synth.close()
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+
+from mp3_frames import audio_frames
+from tts_engines import (
+    AUDIO_DIR_NAME, ELEVENLABS_API_KEY, ELEVENLABS_AVAILABLE, ENGINE_MP3_FORMATS, STREAM_MANIFEST_NAME,
+    TTS_CACHE_DIR_NAME, TTS_CHUNK_RETRIES, TTS_MAX_PARALLEL, ElevenLabs,
+    chunk_cache_key, synthesize_chunk_edge, synthesize_chunk_elevenlabs,
+)
+from audio_cache import AudioCache
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+OUTPUT_FILE = os.path.join(BASE_DIR, AUDIO_DIR_NAME, "output.mp3")
+
+
+class OrderedAudioWriter:
+    """
+    Appends synthesized MP3 chunks to output_file strictly in speaking order (thread-safe add()) and keeps
+    the stream manifest next to it current: the backend only sends the committed `audio_bytes`.
+
+    Chunks must share one MP3 format to be joined frame by frame. The reference is the known output
+    format of `engine` (ENGINE_MP3_FORMATS); `normalize(audio, reference)` converts chunks whose `source`
+    is another engine (a hedge) to it. The primary engine's and cached chunks are appended untouched.
+    """
+
+    def __init__(self, output_file, engine, normalize=None, debug=False):
+        self.output_file = output_file
+        self.normalize = normalize
+        self.debug = debug
+        self.manifest_file = os.path.join(os.path.dirname(os.path.abspath(output_file)), STREAM_MANIFEST_NAME)
+        self.reference = ENGINE_MP3_FORMATS.get(engine)
+        self.normalized = 0
+        self._ready = {}  # index -> (audio, text, cached, foreign) waiting for earlier chunks
+        self._next = 0
+        self._offset = 0
+        self._lock = threading.Lock()
+        self._started = time.time()
+        self.manifest = {
+            "engine": engine,
+            "status": "streaming",
+            "started_at": self._started,
+            "first_audio_seconds": None,
+            "audio_bytes": 0,
+            "audio_seconds": 0.0,
+            "chunks": [],
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+        # Start from an empty file so readers never see audio from a previous run
+        open(self.output_file, "wb").close()
+        self._write_manifest()
+
+    def add(self, index, audio, text, cached=False, source=None):
+        """
+        Hand over chunk `index`; it is appended as soon as every earlier chunk is in the file.
+        `source` is the engine that produced it (None: the writer's engine).
+        """
+        foreign = source not in (None, "cache", self.manifest["engine"])
+        with self._lock:
+            self._ready[index] = (audio, text, cached, foreign)
+            self._append_ready()
+
+    def close(self, error=None):
+        """Finalize the manifest ("complete", or "failed" with the error) and return it."""
+        with self._lock:
+            self.manifest["status"] = "failed" if error else "complete"
+            self.manifest["wall_seconds"] = round(time.time() - self._started, 2)
+            if error:
+                self.manifest["error"] = str(error)
+            self._write_manifest()
+            return self.manifest
+
+    def _append_ready(self):
+        appended = False
+        while self._next in self._ready:
+            audio, text, cached, foreign = self._ready.pop(self._next)
+            if foreign and self.normalize:
+                frames, info = audio_frames(self.normalize(audio, self.reference))
+                self.normalized += 1
+            else:
+                frames, info = audio_frames(audio)
+            with open(self.output_file, "ab") as f:
+                f.write(frames)
+            if self.manifest["first_audio_seconds"] is None and frames:
+                self.manifest["first_audio_seconds"] = round(time.time() - self._started, 2)
+                print(f"🔊 First audio after {self.manifest['first_audio_seconds']:.1f}s")
+            self.manifest["chunks"].append({
+                "index": self._next,
+                "text": text,
+                "offset": self._offset,
+                "bytes": len(frames),
+                "seconds": info["seconds"],
+                "cached": cached,
+            })
+            self._offset += len(frames)
+            self.manifest["audio_bytes"] = self._offset
+            self.manifest["audio_seconds"] = round(self.manifest["audio_seconds"] + info["seconds"], 3)
+            if self.debug:
+                print(f"DEBUG: appended chunk {self._next + 1} ({len(frames)} bytes)")
+            self._next += 1
+            appended = True
+        if appended:
+            self._write_manifest()
+
+    def _write_manifest(self):
+        tmp = self.manifest_file + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, self.manifest_file)
+
+
+class StreamingSynthesizer:
+    """Ordered, incremental TTS into a growing MP3 file (thread-safe submit())."""
+
+    def __init__(self, output_file=OUTPUT_FILE, tts_engine="elevenlabs", use_cache=True, debug=False):
+        if tts_engine not in ("elevenlabs", "edge_tts"):
+            raise ValueError("Unknown TTS engine")
+        if tts_engine == "elevenlabs":
+            if not ELEVENLABS_AVAILABLE:
+                raise ImportError("ElevenLabs package not installed.")
+            if not ELEVENLABS_API_KEY:
+                raise ValueError("❌ ELEVENLABS_API_KEY not found in environment or .env file")
+            self._client = ElevenLabs(api_key=ELEVENLABS_API_KEY)
+        else:
+            self._client = None
+        self.output_file = output_file
+        self.tts_engine = tts_engine
+        self.debug = debug
+        self.cache = AudioCache(os.path.join(BASE_DIR, TTS_CACHE_DIR_NAME)) if use_cache else None
+        self.writer = OrderedAudioWriter(output_file, tts_engine, debug=debug)
+        self.manifest = self.writer.manifest
+
+        self._texts = []
+        self._error = None
+
+        self._loop = asyncio.new_event_loop()
+        self._semaphore = None
+        self._tasks = []
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+
+    def submit(self, text):
+        """Queue one sentence for synthesis (returns immediately)."""
+        text = text.strip()
+        if not text:
+            return
+        index = len(self._texts)
+        self._texts.append(text)
+        future = asyncio.run_coroutine_threadsafe(self._synthesize(index, text), self._loop)
+        self._tasks.append(future)
+
+    def close(self, error=None):
+        """
+        Wait for every queued sentence, finalize the manifest and return it (raises if a chunk failed).
+        `error` is the producer's failure (e.g. the script stream broke off): the manifest is then "failed".
+        """
+        self._error = self._error or error
+        for future in self._tasks:
+            try:
+                future.result()
+            except Exception as e:
+                self._error = self._error or e
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self.writer.close(self._error)
+        if self._error:
+            raise RuntimeError(f"Streaming TTS failed: {self._error}")
+        return self.manifest
+
+    # ------------------------------------------------------------------ #
+    # Internals (run on the background loop)
+    # ------------------------------------------------------------------ #
+    async def _synthesize(self, index, text):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(max(1, TTS_MAX_PARALLEL.get(self.tts_engine, 2)))
+        key = chunk_cache_key(self.tts_engine, text)
+        audio = self.cache.get(key) if self.cache else None
+        cached = audio is not None
+        for attempt in range(TTS_CHUNK_RETRIES):
+            if audio is not None:
+                break
+            try:
+                async with self._semaphore:
+                    if self.tts_engine == "edge_tts":
+                        audio = await synthesize_chunk_edge(text)
+                    else:
+                        previous_text = self._texts[index - 1] if index > 0 else None
+                        audio = await asyncio.to_thread(synthesize_chunk_elevenlabs, self._client, text, previous_text)
+            except Exception as e:
+                print(f"⚠️ TTS sentence {index + 1} failed (attempt {attempt + 1}/{TTS_CHUNK_RETRIES}): {e}")
+                if attempt + 1 == TTS_CHUNK_RETRIES:
+                    raise
+                await asyncio.sleep(2 ** attempt)
+        if self.cache and not cached:
+            self.cache.put(key, audio)
+        self.writer.add(index, audio, text, cached)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Per-chunk TTS engines: one ElevenLabs or Edge TTS request, the voices and
+the per-engine concurrency limits.
+
+Shared by the paragraph-parallel path in video_gen.py and the sentence
+streaming path in stream_tts.py. It only needs the engine SDKs and the shared
+provider limiter, so the Director can stream TTS without importing the video
+pipeline (uploads, WaveSpeed, ffmpeg helpers).
+"""
+
+import os
+import sys
+
+import edge_tts
+from dotenv import load_dotenv
+
+from audio_cache import AudioCache
+
+# Try to import ElevenLabs, handle if missing
+try:
+    from elevenlabs import ElevenLabs
+    ELEVENLABS_AVAILABLE = True
+except ImportError:
+    ElevenLabs = None
+    ELEVENLABS_AVAILABLE = False
+    print("⚠️ ElevenLabs library not found. Install with: pip install elevenlabs")
+
+# Shared per-provider rate limiter / circuit breaker (lives next to the research agents)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "kestra"))
+from provider_limits import get_limiter, limited_call
+
+load_dotenv()
+
+ELEVENLABS_API_KEY = os.environ.get("ELEVENLABS_API_KEY")
+
+# Output layout (relative to video_output/)
+AUDIO_DIR_NAME = "generated_tts"
+TTS_CACHE_DIR_NAME = os.path.join(AUDIO_DIR_NAME, ".audio_cache")
+STREAM_MANIFEST_NAME = "stream_manifest.json"  # next to output.mp3: bytes appended so far and status
+
+# TTS voices/models (shared by the single-request and per-chunk paths)
+EDGE_TTS_VOICE = "en-AU-WilliamNeural"
+ELEVENLABS_VOICE_ID = "FRfK9ktUgII8Yh5EUCn1"  # Derek Muller style
+# Using 'eleven_multilingual_v2' as it is generally available on free tiers/standard plans
+ELEVENLABS_MODEL_ID = "eleven_multilingual_v2"
+ELEVENLABS_OUTPUT_FORMAT = "mp3_44100_128"
+ELEVENLABS_VOICE_SETTINGS = {
+    "stability": 0.5,
+    "similarity_boost": 0.75,
+    "style": 0.5,
+    "use_speaker_boost": True
+}
+# MP3 each engine returns (MPEG channel mode 3 = mono). Chunks from a hedge engine are re-encoded to the
+# primary engine's format so that all chunks can be joined frame by frame.
+ENGINE_MP3_FORMATS = {
+    "elevenlabs": {"sample_rate": 44100, "channel_mode": 3, "bitrate": 128000},  # ELEVENLABS_OUTPUT_FORMAT
+    "edge_tts": {"sample_rate": 24000, "channel_mode": 3, "bitrate": 48000},  # audio-24khz-48kbitrate-mono-mp3
+}
+
+# Concurrent requests per engine, retries of failed chunks
+TTS_MAX_PARALLEL = {
+    "elevenlabs": int(os.environ.get("TTS_PARALLEL_ELEVENLABS", "3")),
+    "edge_tts": int(os.environ.get("TTS_PARALLEL_EDGE_TTS", "4")),
+}
+TTS_CHUNK_RETRIES = 3
+
+
+def synthesize_chunk_elevenlabs(client, text, previous_text=None, next_text=None):
+    """One ElevenLabs request; neighbouring text keeps prosody continuous across chunks."""
+    # The SDK streams lazily, so drain it inside the limited call to catch mid-stream errors
+    return limited_call(
+        "elevenlabs",
+        lambda: b"".join(client.text_to_speech.convert(
+            voice_id=ELEVENLABS_VOICE_ID,
+            text=text,
+            model_id=ELEVENLABS_MODEL_ID,
+            output_format=ELEVENLABS_OUTPUT_FORMAT,
+            voice_settings=ELEVENLABS_VOICE_SETTINGS,
+            previous_text=previous_text,
+            next_text=next_text,
+        ))
+    )
+
+
+async def synthesize_chunk_edge(text):
+    """One Edge TTS request, collected in memory."""
+    limiter = get_limiter("edge_tts")
+    await limiter.acquire_async()
+    audio = bytearray()
+    try:
+        async for message in edge_tts.Communicate(text, EDGE_TTS_VOICE).stream():
+            if message["type"] == "audio":
+                audio.extend(message["data"])
+    except Exception:
+        limiter.record_failure()
+        raise
+    limiter.record_success()
+    return bytes(audio)
+
+
+def chunk_cache_key(tts_engine, text):
+    """Audio cache key: everything that changes the synthesized audio for this text."""
+    if tts_engine == "edge_tts":
+        return AudioCache.key("edge_tts", EDGE_TTS_VOICE, text=text)
+    return AudioCache.key("elevenlabs", ELEVENLABS_VOICE_ID, ELEVENLABS_MODEL_ID, ELEVENLABS_OUTPUT_FORMAT,
+                          ELEVENLABS_VOICE_SETTINGS, text)
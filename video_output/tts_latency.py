@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Persisted per-engine TTS latency/error stats and the adaptive hedge threshold.
+
+video_gen.py's hedged mode starts every chunk on the primary engine and only
+launches the secondary engine once the primary has run longer than
+threshold(): the configured percentile of the primary's recent latencies for
+chunks of a similar length. While an engine has too few samples a fixed
+default is used; if its recent error rate is high the hedge fires at once.
+Stats survive between runs in generated_tts/tts_latency.json, so the threshold
+follows the engine's actual behaviour.
+
+Usage:
+    stats = LatencyStats("generated_tts/tts_latency.json")
+    wait = stats.threshold("elevenlabs", chars=len(text))
+    stats.record("elevenlabs", len(text), seconds, ok=True)
+    stats.save()
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+
+HEDGE_PERCENTILE = float(os.environ.get("TTS_HEDGE_PERCENTILE", "90"))
+HEDGE_DEFAULT_SECONDS = float(os.environ.get("TTS_HEDGE_DEFAULT_SECONDS", "8"))  # until enough samples
+HEDGE_MIN_SECONDS = 1.0
+HEDGE_MIN_SAMPLES = 10
+HEDGE_ERROR_RATE = 0.5  # recent error rate at which the secondary starts immediately
+WINDOW = 200  # samples/outcomes kept per engine
+
+
+def percentile(values, p):
+    values = sorted(values)
+    if not values:
+        return None
+    k = min(len(values) - 1, max(0, int(round(p / 100.0 * (len(values) - 1)))))
+    return values[k]
+
+
+class LatencyStats:
+    """Rolling latency samples (chars, seconds), outcomes and hedge counters per engine."""
+
+    def __init__(self, path, window=WINDOW):
+        self.path = path
+        self.window = window
+        self._lock = threading.Lock()
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self.data = json.load(f)
+        except (OSError, ValueError):
+            self.data = {}
+
+    def _engine(self, engine):
+        return self.data.setdefault(engine, {"samples": [], "outcomes": [], "requests": 0, "errors": 0,
+                                             "hedged": 0, "hedge_wins": 0})
+
+    def record(self, engine, chars, seconds, ok=True):
+        with self._lock:
+            stats = self._engine(engine)
+            stats["requests"] += 1
+            stats["outcomes"] = (stats["outcomes"] + [1 if ok else 0])[-self.window:]
+            if ok:
+                stats["samples"] = (stats["samples"] + [[chars, round(seconds, 3)]])[-self.window:]
+            else:
+                stats["errors"] += 1
+
+    def count(self, engine, name):
+        with self._lock:
+            self._engine(engine)[name] += 1
+
+    def error_rate(self, engine):
+        outcomes = self.data.get(engine, {}).get("outcomes", [])
+        return 1 - sum(outcomes) / len(outcomes) if outcomes else 0.0
+
+    def threshold(self, engine, chars, p=HEDGE_PERCENTILE):
+        """Seconds to wait on `engine` before hedging a chunk of `chars` characters."""
+        with self._lock:
+            stats = self.data.get(engine, {})
+            samples = list(stats.get("samples", []))
+            outcomes = stats.get("outcomes", [])
+        if len(outcomes) >= HEDGE_MIN_SAMPLES and self.error_rate(engine) >= HEDGE_ERROR_RATE:
+            return 0.0
+        # Latency grows with text length: compare against chunks of a similar size when there are enough
+        similar = [s for c, s in samples if chars / 2 <= c <= chars * 2]
+        latencies = similar if len(similar) >= HEDGE_MIN_SAMPLES else [s for _, s in samples]
+        if len(latencies) < HEDGE_MIN_SAMPLES:
+            return HEDGE_DEFAULT_SECONDS
+        return max(HEDGE_MIN_SECONDS, percentile(latencies, p))
+
+    def summary(self):
+        """Per engine: requests, error rate, p50/p90 latency and hedge counters."""
+        result = {}
+        with self._lock:
+            for engine, stats in self.data.items():
+                latencies = [s for _, s in stats.get("samples", [])]
+                result[engine] = {
+                    "requests": stats.get("requests", 0),
+                    "error_rate": round(self.error_rate(engine), 3),
+                    "p50_seconds": percentile(latencies, 50),
+                    "p90_seconds": percentile(latencies, 90),
+                    "hedged": stats.get("hedged", 0),
+                    "hedge_wins": stats.get("hedge_wins", 0),
+                }
+        return result
+
+    def save(self):
+        with self._lock:
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.data, f)
+            os.replace(tmp, self.path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show persisted TTS latency stats")
+    parser.add_argument("--stats", default=os.path.join("generated_tts", "tts_latency.json"))
+    args = parser.parse_args()
+
+    stats = LatencyStats(args.stats)
+    for engine, summary in stats.summary().items():
+        print(f"{engine}: {summary['requests']} requests, {summary['error_rate']:.0%} errors, "
+              f"p50 {summary['p50_seconds']}s, p90 {summary['p90_seconds']}s, "
+              f"hedged {summary['hedged']} (won {summary['hedge_wins']}), "
+              f"hedge after {stats.threshold(engine, 600):.1f}s for 600 chars")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
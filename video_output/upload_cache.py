@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Content-hash keyed cache of public upload URLs.
+
+The avatar render needs public URLs for the face image and the narration.
+The face image never changes and the same narration is often rendered again,
+so every successful upload is remembered as sha256(file contents) -> URL plus
+the host's expiry time. A cached URL is reused while it stays valid for at
+least `min_remaining` seconds (WaveSpeed fetches the assets shortly after the
+job is submitted); expired entries are dropped. Stored in
+generated_tts/upload_cache.json next to the other run artifacts.
+
+Usage:
+    cache = UploadCache("generated_tts/upload_cache.json")
+    digest = file_digest("face/veritasium_dreamworks.png")
+    url = cache.get(digest) or upload(...)
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+
+MIN_REMAINING_SECONDS = float(os.environ.get("UPLOAD_CACHE_MIN_REMAINING_HOURS", "1")) * 3600
+
+
+def file_digest(path):
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+class UploadCache:
+    """sha256 -> {url, expires_at, name, size, uploaded_at}, persisted as JSON (thread-safe)."""
+
+    def __init__(self, path, min_remaining=MIN_REMAINING_SECONDS):
+        self.path = path
+        self.min_remaining = min_remaining
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def get(self, digest):
+        """Cached URL for this content if it is still valid long enough, else None."""
+        with self._lock:
+            entry = self.entries.get(digest)
+            if entry and entry["expires_at"] - time.time() >= self.min_remaining:
+                self.hits += 1
+                return entry["url"]
+            if entry:
+                del self.entries[digest]
+            self.misses += 1
+            return None
+
+    def put(self, digest, url, expires_at, name=None, size=None):
+        with self._lock:
+            self.entries[digest] = {
+                "url": url,
+                "expires_at": expires_at,
+                "name": name,
+                "size": size,
+                "uploaded_at": time.time(),
+            }
+
+    def invalidate(self, digest):
+        with self._lock:
+            self.entries.pop(digest, None)
+
+    def prune(self):
+        """Drop expired entries."""
+        now = time.time()
+        with self._lock:
+            for digest in [d for d, e in self.entries.items() if e["expires_at"] <= now]:
+                del self.entries[digest]
+
+    def save(self):
+        self.prune()
+        with self._lock:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, indent=2)
+            os.replace(tmp, self.path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show or clear cached public upload URLs")
+    parser.add_argument("--cache", default=os.path.join("generated_tts", "upload_cache.json"))
+    parser.add_argument("--clear", action="store_true", help="Forget every cached URL")
+    args = parser.parse_args()
+
+    cache = UploadCache(args.cache)
+    if args.clear:
+        cache.entries = {}
+        cache.save()
+        print("🧹 Upload cache cleared")
+        return 0
+    now = time.time()
+    for digest, entry in cache.entries.items():
+        hours = (entry["expires_at"] - now) / 3600
+        state = "valid" if hours * 3600 >= cache.min_remaining else "expiring"
+        print(f"{digest[:12]} {entry.get('name')}: {entry['url']} ({state}, {hours:.1f}h left)")
+    if not cache.entries:
+        print("Upload cache is empty")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,33 +1,69 @@
 import asyncio
 import edge_tts
 import os
+import re
+import shutil
+import subprocess
 import sys
+import threading
 import requests
 import json
 import time
 import argparse
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from dotenv import load_dotenv
 
-# Try to import ElevenLabs, handle if missing
-try:
-    from elevenlabs import ElevenLabs
-    ELEVENLABS_AVAILABLE = True
-except ImportError:
-    ELEVENLABS_AVAILABLE = False
-    print("⚠️ ElevenLabs library not found. Install with: pip install elevenlabs")
+from audio_cache import AudioCache
+from audio_post import ffmpeg_available, postprocess_file
+from upload_cache import UploadCache, file_digest
+from wavespeed_jobs import VideoJobManager
+from ranged_download import download as ranged_download
+from preview_render import PREVIEW_NAME, render_preview
+from segment_render import (
+    MAX_PARALLEL as SEGMENT_MAX_PARALLEL, SEGMENT_SECONDS, SEGMENTS_DIR_NAME,
+    concat_mp4, render_segments, segment_seconds as mp3_seconds, split_audio,
+)
+from stream_tts import OrderedAudioWriter
+from tts_latency import HEDGE_DEFAULT_SECONDS, HEDGE_PERCENTILE, LatencyStats
+from tts_engines import (
+    AUDIO_DIR_NAME, EDGE_TTS_VOICE, ELEVENLABS_API_KEY, ELEVENLABS_AVAILABLE, STREAM_MANIFEST_NAME,
+    TTS_CACHE_DIR_NAME, TTS_CHUNK_RETRIES, TTS_MAX_PARALLEL, ElevenLabs,
+    chunk_cache_key, synthesize_chunk_edge, synthesize_chunk_elevenlabs,
+)
+
+# Shared per-provider rate limiter / circuit breaker (lives next to the research agents)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "kestra"))
+from provider_limits import get_limiter, limited_request
 
 # Load environment variables
 load_dotenv()
 
+# Backend-served signed URLs for the render inputs (reads its settings from the environment loaded above)
+from signed_urls import signed_url, signing_configured
+
 # API Keys
 WAVESPEED_API_KEY = os.environ.get("WAVESPEED_API_KEY")
-ELEVENLABS_API_KEY = os.environ.get("ELEVENLABS_API_KEY")
+WAVESPEED_BASE_URL = os.environ.get("WAVESPEED_BASE_URL", "https://api.wavespeed.ai").rstrip("/")  # or a local stand-in
 
 # Configuration
 IMAGE_PATH = "face/veritasium_dreamworks.png"
-AUDIO_DIR_NAME = "generated_tts"
 VIDEO_DIR_NAME = "generated_video"
 
+# Paragraph-parallel TTS: chunk size (engine limits and retries live in tts_engines.py)
+TTS_CHUNK_MAX_CHARS = 1500
+# Hedged TTS: secondary engine started when the primary runs past its latency percentile
+TTS_HEDGE_ENGINE = os.environ.get("TTS_HEDGE_ENGINE") or None
+TTS_LATENCY_STATS_NAME = "tts_latency.json"  # next to output.mp3, like tts_report.json
+# Post-processed narration (shortened pauses, normalized loudness) uploaded for the avatar render
+AUDIO_POST_NAME = "output_post.mp3"
+AUDIO_POST = os.environ.get("AUDIO_POST", "true").lower() in ("1", "true", "yes")
+WAVESPEED_JOBS_NAME = "wavespeed_jobs.json"  # persisted prediction ids (wavespeed_jobs.py)
+PREVIEW_VIDEO = os.environ.get("PREVIEW_VIDEO", "true").lower() in ("1", "true", "yes")  # while WaveSpeed renders
+UPLOAD_CACHE_NAME = "upload_cache.json"  # content hash -> public URL + expiry (upload_cache.py)
+UPLOAD_EXPIRY_SECONDS = 14 * 24 * 3600  # matches the "2w" requested from file.io
+
 async def generate_audio_edge_tts(text_file, output_file, debug=False):
     """Generate audio using Edge TTS (Free fallback)"""
     try:
@@ -40,8 +76,15 @@ async def generate_audio_edge_tts(text_file, output_file, debug=False):
     if debug:
         print(f"DEBUG: Script text preview: {script_text[:200]}...")
     
-    communicate = edge_tts.Communicate(script_text, "en-AU-WilliamNeural")
-    await communicate.save(output_file)
+    limiter = get_limiter("edge_tts")
+    await limiter.acquire_async()
+    communicate = edge_tts.Communicate(script_text, EDGE_TTS_VOICE)
+    try:
+        await communicate.save(output_file)
+    except Exception:
+        limiter.record_failure()
+        raise
+    limiter.record_success()
     
     if debug:
         if os.path.exists(output_file):
@@ -71,31 +114,14 @@ def generate_audio_elevenlabs(text_file, output_file, debug=False):
         print(f"DEBUG: Script text preview: {script_text[:200]}...")
     
     client = ElevenLabs(api_key=ELEVENLABS_API_KEY)
-    voice_id = "FRfK9ktUgII8Yh5EUCn1"  # Derek Muller style
 
     try:
-        # Voice Settings
-        voice_settings = {
-            "stability": 0.5,
-            "similarity_boost": 0.75,
-            "style": 0.5,
-            "use_speaker_boost": True
-        }
-        
         # Generate audio
-        # Using 'eleven_multilingual_v2' as it is generally available on free tiers/standard plans
-        audio_generator = client.text_to_speech.convert(
-            voice_id=voice_id,
-            text=script_text,
-            model_id="eleven_multilingual_v2",
-            output_format="mp3_44100_128",
-            voice_settings=voice_settings
-        )
+        audio_bytes = synthesize_chunk_elevenlabs(client, script_text)
         
         # Save to file
         with open(output_file, 'wb') as f:
-            for chunk in audio_generator:
-                f.write(chunk)
+            f.write(audio_bytes)
         
         if debug:
             print(f"DEBUG: Audio saved, file size: {os.path.getsize(output_file)} bytes")
@@ -106,14 +132,320 @@ def generate_audio_elevenlabs(text_file, output_file, debug=False):
         print(f"❌ ElevenLabs API Error: {e}")
         raise
 
-def upload_file_to_public_host(file_path, debug=False):
-    """Upload file to a free public host (file.io)"""
+def split_tts_chunks(text, max_chars=TTS_CHUNK_MAX_CHARS):
+    """Paragraphs (blank-line separated); paragraphs over max_chars are split on sentence boundaries."""
+    chunks = []
+    for paragraph in re.split(r"\n\s*\n", text):
+        paragraph = " ".join(paragraph.split())
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_chars:
+            chunks.append(paragraph)
+            continue
+        current = ""
+        for sentence in re.split(r"(?<=[.!?])\s+", paragraph):
+            if current and len(current) + len(sentence) + 1 > max_chars:
+                chunks.append(current)
+                current = sentence
+            else:
+                current = f"{current} {sentence}".strip()
+        if current:
+            chunks.append(current)
+    return chunks
+
+
+def load_tts_chunks(text_file):
+    """
+    Chunks for the TTS text: the structured script's paragraphs when final_5min_script.json
+    next to it matches the text (same deterministic split the Director made), else blank-line paragraphs.
+    """
+    with open(text_file, 'r', encoding='utf-8') as f:
+        text = f.read()
+    structure_file = os.path.join(os.path.dirname(os.path.abspath(text_file)), "final_5min_script.json")
+    try:
+        with open(structure_file, 'r', encoding='utf-8') as f:
+            structure = json.load(f)
+        paragraphs = [p["text"] for section in structure["sections"] for p in section["paragraphs"]]
+        if "\n\n".join(paragraphs).strip() == text.strip():
+            return [c for p in paragraphs for c in split_tts_chunks(p)]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return split_tts_chunks(text)
+
+
+async def synthesize_chunks(chunks, tts_engine, debug=False, cache=None, hedge_engine=None, stats=None,
+                            on_chunk=None):
+    """
+    Synthesize chunks concurrently (bounded per engine); failed chunks alone are retried.
+    Chunks found in `cache` are reused and never sent to the engine.
+    `on_chunk(i, audio, source)` is called as soon as each chunk is available (in completion order).
+    With `hedge_engine`, a chunk whose primary request runs past the latency threshold from `stats`
+    is also sent to the hedge engine; the first to finish wins and the other is cancelled.
+    Returns (list of MP3 bytes in order, per-chunk latencies in seconds, per-chunk source:
+    "cache" or the engine that produced it).
+    """
+    engines = [tts_engine] + ([hedge_engine] if hedge_engine else [])
+    semaphores = {engine: asyncio.Semaphore(max(1, TTS_MAX_PARALLEL.get(engine, 2))) for engine in engines}
+    parts = [None] * len(chunks)
+    latencies = [0.0] * len(chunks)
+    sources = [None] * len(chunks)
+    if cache:
+        for i, chunk in enumerate(chunks):
+            parts[i] = cache.get(chunk_cache_key(tts_engine, chunk))
+            sources[i] = "cache" if parts[i] is not None else None
+            if parts[i] is not None and on_chunk:
+                on_chunk(i, parts[i], "cache")
+    pending = [i for i, part in enumerate(parts) if part is None]
+    if not pending:
+        return parts, latencies, sources
+    client = ElevenLabs(api_key=ELEVENLABS_API_KEY) if "elevenlabs" in engines else None
+    # Own pool, not the loop's default one: asyncio.run() would wait for a cancelled (hedged-out) request
+    executor = ThreadPoolExecutor(max_workers=max(1, TTS_MAX_PARALLEL.get("elevenlabs", 2)))
+    loop = asyncio.get_running_loop()
+
+    async def call(engine, i, started=None):
+        """One request to `engine` (after its concurrency slot); latency/outcome go to `stats`."""
+        async with semaphores[engine]:
+            if started is not None:
+                started.set()
+            begin = time.perf_counter()
+            try:
+                if engine == "edge_tts":
+                    data = await synthesize_chunk_edge(chunks[i])
+                else:
+                    previous_text = chunks[i - 1] if i > 0 else None
+                    next_text = chunks[i + 1] if i + 1 < len(chunks) else None
+                    data = await loop.run_in_executor(executor, partial(
+                        synthesize_chunk_elevenlabs, client, chunks[i], previous_text, next_text))
+            except asyncio.CancelledError:
+                # Lost a hedge race: its latency is at least this long, which keeps the percentile honest
+                if stats:
+                    stats.record(engine, len(chunks[i]), time.perf_counter() - begin)
+                raise
+            except Exception:
+                if stats:
+                    stats.record(engine, len(chunks[i]), time.perf_counter() - begin, ok=False)
+                raise
+            if stats:
+                stats.record(engine, len(chunks[i]), time.perf_counter() - begin)
+            if cache:
+                cache.put(chunk_cache_key(engine, chunks[i]), data)
+            return data
+
+    async def hedged(i):
+        """Primary first; the hedge engine joins once the primary is past its threshold (or failed)."""
+        started = asyncio.Event()
+        primary = asyncio.create_task(call(tts_engine, i, started))
+        # The threshold counts from when the request is sent, not from time spent queued for a slot
+        waiter = asyncio.create_task(started.wait())
+        await asyncio.wait({primary, waiter}, return_when=asyncio.FIRST_COMPLETED)
+        waiter.cancel()
+        threshold = stats.threshold(tts_engine, len(chunks[i])) if stats else HEDGE_DEFAULT_SECONDS
+        done, _ = await asyncio.wait({primary}, timeout=threshold)
+        if primary in done and not primary.exception():
+            return primary.result(), tts_engine
+        if stats:
+            stats.count(tts_engine, "hedged")
+        if debug:
+            print(f"DEBUG: chunk {i + 1} hedged to {hedge_engine} after {threshold:.1f}s")
+        tasks = {primary: tts_engine, asyncio.create_task(call(hedge_engine, i)): hedge_engine}
+        pending_tasks = set(tasks)
+        error = None
+        while pending_tasks:
+            done, pending_tasks = await asyncio.wait(pending_tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception():
+                    error = task.exception()
+                    continue
+                # ElevenLabs runs in a worker thread: cancelling stops waiting for it, the request itself finishes
+                for other in pending_tasks:
+                    other.cancel()
+                if tasks[task] == hedge_engine and stats:
+                    stats.count(tts_engine, "hedge_wins")
+                return task.result(), tasks[task]
+        raise error
+
+    async def synthesize(i):
+        start = time.perf_counter()
+        try:
+            if hedge_engine:
+                parts[i], sources[i] = await hedged(i)
+            else:
+                parts[i], sources[i] = await call(tts_engine, i), tts_engine
+        finally:
+            latencies[i] += time.perf_counter() - start
+        if debug:
+            print(f"DEBUG: chunk {i + 1}/{len(chunks)} done by {sources[i]} ({len(parts[i])} bytes)")
+        if on_chunk:
+            on_chunk(i, parts[i], sources[i])
+
+    try:
+        for attempt in range(TTS_CHUNK_RETRIES):
+            results = await asyncio.gather(*(synthesize(i) for i in pending), return_exceptions=True)
+            errors = {i: r for i, r in zip(pending, results) if isinstance(r, Exception)}
+            if not errors:
+                return parts, latencies, sources
+            pending = sorted(errors)
+            print(f"⚠️ {len(pending)} TTS chunk(s) failed (attempt {attempt + 1}/{TTS_CHUNK_RETRIES}): "
+                  f"{next(iter(errors.values()))}")
+            if attempt + 1 < TTS_CHUNK_RETRIES:
+                await asyncio.sleep(2 ** attempt)
+    finally:
+        executor.shutdown(wait=False)
+    raise RuntimeError(f"TTS failed for chunks {[i + 1 for i in pending]} after {TTS_CHUNK_RETRIES} attempts")
+
+
+def match_mp3_format(data, reference):
+    """Re-encode an MP3 (ffmpeg) to the reference's sample rate, channels and bitrate so frames can be joined."""
+    channels = 1 if reference["channel_mode"] == 3 else 2
+    result = subprocess.run(
+        ["ffmpeg", "-v", "error", "-i", "pipe:0", "-ar", str(reference["sample_rate"]), "-ac", str(channels),
+         "-b:a", f"{reference['bitrate'] // 1000}k", "-f", "mp3", "pipe:1"],
+        input=data, capture_output=True, check=True,
+    )
+    return result.stdout
+
+
+def generate_audio_parallel(text_file, output_file, tts_engine="elevenlabs", debug=False, cache=None,
+                            hedge_engine=None):
+    """
+    Paragraph-parallel TTS: synthesize chunks concurrently and append their MP3 frames to output_file in
+    speaking order as they finish (OrderedAudioWriter keeps the stream manifest current, so the backend
+    can stream the narration while later chunks are still being synthesized).
+    With an AudioCache, unchanged chunks are reused and only new/edited ones are synthesized.
+    With hedge_engine, slow primary requests are hedged to the second engine (see synthesize_chunks).
+    """
+    if tts_engine == "elevenlabs":
+        if not ELEVENLABS_AVAILABLE:
+            raise ImportError("ElevenLabs package not installed.")
+        if not ELEVENLABS_API_KEY:
+            raise ValueError("❌ ELEVENLABS_API_KEY not found in environment or .env file")
+    elif tts_engine != "edge_tts":
+        raise ValueError("Unknown TTS engine")
+    if hedge_engine == tts_engine:
+        hedge_engine = None
+    if hedge_engine == "elevenlabs" and not (ELEVENLABS_AVAILABLE and ELEVENLABS_API_KEY):
+        print("⚠️ TTS hedging disabled: ElevenLabs is not configured")
+        hedge_engine = None
+    if hedge_engine and not shutil.which("ffmpeg"):
+        # The engines produce different MP3 formats; a hedged chunk must be re-encoded to be joined
+        print("⚠️ TTS hedging disabled: ffmpeg is needed to join audio from different engines")
+        hedge_engine = None
+    stats = LatencyStats(os.path.join(os.path.dirname(os.path.abspath(output_file)), TTS_LATENCY_STATS_NAME))
+
+    try:
+        chunks = load_tts_chunks(text_file)
+    except Exception as e:
+        raise FileNotFoundError(f"Could not read text file: {text_file}. Error: {e}")
+    if not chunks:
+        raise ValueError(f"No text to synthesize in {text_file}")
+
+    limit = TTS_MAX_PARALLEL.get(tts_engine, 2)
+    hedge_note = f", hedged to {hedge_engine} past p{HEDGE_PERCENTILE:g} latency" if hedge_engine else ""
+    print(f"🎵 Generating audio ({tts_engine}) from {text_file}: {len(chunks)} chunks, {limit} in parallel"
+          f"{hedge_note}...")
+    start = time.perf_counter()
+    # Chunks from the hedge engine come in its own MP3 format; they are re-encoded to the primary engine's
+    writer = OrderedAudioWriter(output_file, tts_engine, normalize=match_mp3_format if hedge_engine else None,
+                                debug=debug)
+    try:
+        parts, latencies, sources = asyncio.run(synthesize_chunks(
+            chunks, tts_engine, debug=debug, cache=cache, hedge_engine=hedge_engine, stats=stats,
+            on_chunk=lambda i, audio, source: writer.add(i, audio, chunks[i], cached=source == "cache",
+                                                         source=source)))
+    except Exception as e:
+        writer.close(e)
+        raise
+    finally:
+        stats.save()
+    manifest = writer.close()
+    resampled = writer.normalized
+    wall = time.perf_counter() - start
+
+    # Serial estimate = what one request per chunk back-to-back would take (≈ the single-request path)
+    serial = sum(latencies)
+    report = {
+        "engine": tts_engine,
+        "chunks": len(chunks),
+        "parallel": limit,
+        "wall_seconds": round(wall, 2),
+        "serial_estimate_seconds": round(serial, 2),
+        "speedup": round(serial / wall, 2) if wall else None,
+        "audio_seconds": manifest["audio_seconds"],
+        "first_audio_seconds": manifest["first_audio_seconds"],
+    }
+    if hedge_engine:
+        won = sum(1 for src in sources if src == hedge_engine)
+        report["hedge"] = {
+            "engine": hedge_engine,
+            "percentile": HEDGE_PERCENTILE,
+            "won": won,
+            "resampled": resampled,
+            "latency": stats.summary(),
+        }
+        print(f"🏁 Hedging: {won}/{len(chunks)} chunks won by {hedge_engine}")
+    if cache:
+        reused = sum(1 for src in sources if src == "cache")
+        report["cache"] = {
+            "reused": reused,
+            "synthesized": len(chunks) - reused,
+            "reuse_ratio": round(reused / len(chunks), 3),
+            **{k: v for k, v in cache.stats().items() if k in ("evictions", "entries", "bytes")},
+        }
+        print(f"♻️ Audio cache: reused {reused}/{len(chunks)} chunks "
+              f"({report['cache']['reuse_ratio']:.0%}), synthesized {len(chunks) - reused}")
+    with open(os.path.join(os.path.dirname(os.path.abspath(output_file)), "tts_report.json"), 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"⚡ TTS: {len(chunks)} chunks in {wall:.1f}s (serial estimate {serial:.1f}s, "
+          f"{report['speedup']}x speedup), {manifest['audio_seconds']:.1f}s of audio, "
+          f"first audio after {manifest['first_audio_seconds']}s")
+    print(f"✅ Audio saved to {output_file}")
+    return output_file
+
+
+def streamed_audio_complete(audio_file):
+    """True if the streaming manifest next to audio_file says the streamed narration finished."""
+    manifest_file = os.path.join(os.path.dirname(os.path.abspath(audio_file)), STREAM_MANIFEST_NAME)
+    try:
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return (manifest.get("status") == "complete" and os.path.exists(audio_file)
+            and os.path.getsize(audio_file) == manifest.get("audio_bytes"))
+
+
+def _upload_expiry(data):
+    """Expiry of a file.io upload as a timestamp; None if the link is single-use (deleted after one download)."""
+    if data.get("autoDelete") or data.get("maxDownloads") == 1:
+        return None
+    try:
+        return datetime.fromisoformat(str(data["expires"]).replace("Z", "+00:00")).timestamp()
+    except (KeyError, ValueError):
+        return time.time() + UPLOAD_EXPIRY_SECONDS
+
+
+def upload_file_to_public_host(file_path, debug=False, cache=None):
+    """
+    Upload file to a free public host (file.io).
+    With an UploadCache, identical content is uploaded once and its URL reused until close to expiry;
+    cached uploads are kept for 2 weeks instead of being deleted after the first download.
+    """
     upload_url = "https://file.io"
+    digest = file_digest(file_path) if cache is not None else None
+    if cache is not None:
+        cached_url = cache.get(digest)
+        if cached_url:
+            print(f"♻️ Reusing uploaded {os.path.basename(file_path)}: {cached_url}")
+            return cached_url
     try:
         with open(file_path, 'rb') as f:
             files = {'file': (os.path.basename(file_path), f)}
-            # Expires after 1 download or 2 weeks to respect privacy/limits
-            response = requests.post(upload_url, files=files, data={"expires": "2w"}, timeout=30)
+            # Expires after 1 download or 2 weeks to respect privacy/limits (2 weeks only when the URL is cached)
+            form = {"expires": "2w"}
+            if cache is not None:
+                form["autoDelete"] = "false"
+            response = limited_request(requests, "fileio", "POST", upload_url, files=files, data=form, timeout=30)
         
         if debug:
             print(f"DEBUG: Public upload status: {response.status_code}")
@@ -122,6 +454,10 @@ def upload_file_to_public_host(file_path, debug=False):
             data = response.json()
             if not data.get("success"):
                  raise Exception(f"File.io error: {data}")
+            expires_at = _upload_expiry(data) if cache is not None else None
+            if expires_at:
+                cache.put(digest, data["link"], expires_at, name=os.path.basename(file_path),
+                          size=os.path.getsize(file_path))
             return data["link"]
         else:
             raise Exception(f"Public upload failed (status {response.status_code}): {response.text}")
@@ -129,83 +465,182 @@ def upload_file_to_public_host(file_path, debug=False):
         print(f"❌ Public upload error: {e}")
         raise
 
-def generate_video_wavespeed(audio_url, image_url, debug=False):
-    """Generate video using WaveSpeed AI API"""
+def generate_video_wavespeed(audio_url, image_url, debug=False, job_key=None, task_id=None):
+    """
+    Generate video using WaveSpeed AI API.
+    The prediction is tracked by wavespeed_jobs.VideoJobManager (adaptive polling, optional webhook,
+    deadline, persisted request id): with a `job_key` for the inputs, a rerun resumes a running job.
+    `task_id` tags the job with its backend task.
+    """
     if not WAVESPEED_API_KEY:
         raise ValueError("WAVESPEED_API_KEY is missing.")
 
-    generate_url = "https://api.wavespeed.ai/api/v3/wavespeed-ai/hunyuan-avatar"
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {WAVESPEED_API_KEY}",
-    }
-    payload = {
-        "audio": audio_url,
-        "image": image_url,
-        "resolution": "480p"
-    }
-    
     print("🎬 Starting WaveSpeed video generation...")
     if debug:
-        print(f"DEBUG: WaveSpeed Payload: {payload}")
-    
-    begin = time.time()
-    response = requests.post(generate_url, headers=headers, data=json.dumps(payload), timeout=30)
-    
-    if response.status_code != 200:
-        raise Exception(f"WaveSpeed request failed (status {response.status_code}): {response.text}")
-    
-    result = response.json().get("data", {})
-    request_id = result.get("id")
-    if not request_id:
-         raise Exception(f"No Request ID returned. Response: {response.text}")
-
-    print(f"Task submitted successfully. Request ID: {request_id}")
-    
-    # Poll for results
-    poll_url = f"https://api.wavespeed.ai/api/v3/predictions/{request_id}/result"
-    headers = {"Authorization": f"Bearer {WAVESPEED_API_KEY}"}
-    
-    while True:
-        response = requests.get(poll_url, headers=headers, timeout=30)
-        if response.status_code != 200:
-            raise Exception(f"Poll failed (status {response.status_code}): {response.text}")
-        
-        result = response.json().get("data", {})
-        status = result.get("status")
-        
-        if status == "completed":
-            end = time.time()
-            print(f"Task completed in {end - begin:.1f} seconds.")
-            outputs = result.get("outputs", [])
-            if outputs:
-                video_url = outputs[0]
-                print(f"✅ Video generated: {video_url}")
-                return video_url
-            else:
-                 raise Exception("Completed but no output video found.")
-        elif status == "failed":
-            raise Exception(result.get("error", "Generation failed"))
-        else:
-            if debug:
-                print(f"⏳ Status: {status}... Waiting 2s")
-            time.sleep(2)
+        print(f"DEBUG: WaveSpeed inputs: audio={audio_url} image={image_url}")
+    store = os.path.join(os.path.dirname(os.path.abspath(__file__)), AUDIO_DIR_NAME, WAVESPEED_JOBS_NAME)
+    manager = VideoJobManager(store, base_url=WAVESPEED_BASE_URL, api_key=WAVESPEED_API_KEY, task_id=task_id,
+                              debug=debug)
+    video_url = asyncio.run(manager.render(audio_url, image_url, key=job_key))
+    print(f"✅ Video generated: {video_url}")
+    return video_url
 
 def download_video_from_url(video_url, output_file, debug=False):
-    """Download video from URL"""
+    """Download video from URL (parallel byte ranges, resumable, verified; see ranged_download.py)"""
     print(f"📥 Downloading video from {video_url}...")
-    response = requests.get(video_url, stream=True)
-    response.raise_for_status()
-    
-    with open(output_file, 'wb') as f:
-        for chunk in response.iter_content(chunk_size=8192):
-            if chunk:
-                f.write(chunk)
+    report = ranged_download(video_url, output_file)
+    if debug:
+        print(f"DEBUG: Download report: {report}")
     
-    print(f"✅ Downloaded video to {output_file}")
+    print(f"✅ Downloaded video to {output_file} ({report['bytes'] / 1e6:.1f} MB in {report['seconds']:.1f}s, "
+          f"{report['mb_per_second']} MB/s over {report['ranges']} range(s))")
     return output_file
 
-def generate_video_pipeline(script_file, tts_engine="elevenlabs", debug=False):
+def prepare_render_audio(audio_file, debug=False):
+    """
+    Audio for the avatar render: output.mp3 with long pauses cut and loudness normalized
+    (audio_post.py), saved next to it as output_post.mp3. Render time scales with audio length.
+    Falls back to the original file if ffmpeg is missing or processing fails.
+    """
+    if not ffmpeg_available():
+        print("⚠️ ffmpeg not found; uploading narration without post-processing")
+        return audio_file
+    post_file = os.path.join(os.path.dirname(os.path.abspath(audio_file)), AUDIO_POST_NAME)
+    try:
+        report = postprocess_file(audio_file, post_file)
+    except Exception as e:
+        print(f"⚠️ Audio post-processing failed, using original audio: {e}")
+        return audio_file
+    with open(os.path.join(os.path.dirname(post_file), "audio_post_report.json"), 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"✂️ Audio post-processing: {report['original_seconds']:.1f}s → {report['processed_seconds']:.1f}s "
+          f"(saved {report['seconds_saved']:.1f}s, gain {report['gain_db']:+.1f} dB, "
+          f"{report['samples_per_second']:,} samples/s)")
+    if debug:
+        print(f"DEBUG: Audio post report: {report}")
+    return post_file
+
+
+def upload_render_assets(audio_file, image_file, debug=False, use_cache=True):
+    """Upload narration and face image concurrently (reusing cached URLs); returns (audio_url, image_url)."""
+    cache = UploadCache(os.path.join(os.path.dirname(os.path.abspath(audio_file)), UPLOAD_CACHE_NAME)) \
+        if use_cache else None
+    begin = time.time()
+    try:
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            audio_future = pool.submit(upload_file_to_public_host, audio_file, debug, cache)
+            image_future = pool.submit(upload_file_to_public_host, image_file, debug, cache)
+            audio_url, image_url = audio_future.result(), image_future.result()
+    finally:
+        if cache is not None:
+            cache.save()
+    reused = f", {cache.hits}/2 reused" if cache is not None else ""
+    print(f"📤 Assets ready in {time.time() - begin:.1f}s{reused}")
+    return audio_url, image_url
+
+
+def forget_render_assets(audio_file, image_file):
+    """Drop cached URLs for these files (e.g. the host deleted them and the render could not fetch them)."""
+    cache = UploadCache(os.path.join(os.path.dirname(os.path.abspath(audio_file)), UPLOAD_CACHE_NAME))
+    for path in (audio_file, image_file):
+        cache.invalidate(file_digest(path))
+    cache.save()
+
+
+def signed_render_assets(task_id, audio_file):
+    """
+    Signed backend URLs for the render inputs of `task_id` (see kestra/signed_urls.py and the backend's
+    /artifacts endpoint). No upload: the video API fetches the files straight from the backend.
+    """
+    audio_url = signed_url(f"{task_id}/{os.path.basename(audio_file)}")
+    image_url = signed_url(f"{task_id}/face.png")
+    print("🔏 Using signed backend URLs for the render inputs (no upload)")
+    return audio_url, image_url
+
+
+def generate_video_segmented(render_audio, image_file, segment_length, video_file, task_id=None, upload_cache=True,
+                             debug=False):
+    """
+    Render the narration as parallel WaveSpeed jobs of ~segment_length seconds (split in pauses) and join
+    the MP4s without re-encoding (segment_render.py). Returns the video path, or None if the audio is too
+    short to split. Writes segment_render_report.json with the wall-clock speedup.
+    """
+    audio_dir = os.path.dirname(os.path.abspath(render_audio))
+    begin = time.time()
+    segments = split_audio(render_audio, segment_length, os.path.join(audio_dir, SEGMENTS_DIR_NAME))
+    if len(segments) < 2:
+        return None
+    print(f"✂️ Rendering {len(segments)} segments of ~{segment_length:.0f}s ({SEGMENT_MAX_PARALLEL} at a time)...")
+
+    signed = bool(task_id) and signing_configured()
+    cache = None
+    if signed:
+        audio_urls = [signed_url(f"{task_id}/{os.path.basename(path)}") for path in segments]
+        image_url = signed_url(f"{task_id}/face.png")
+    else:
+        cache = UploadCache(os.path.join(audio_dir, UPLOAD_CACHE_NAME)) if upload_cache else None
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            urls = list(pool.map(lambda path: upload_file_to_public_host(path, debug, cache), segments + [image_file]))
+        if cache is not None:
+            cache.save()
+        audio_urls, image_url = urls[:-1], urls[-1]
+
+    image_digest = file_digest(image_file)
+    keys = [f"{file_digest(path)}:{image_digest}" for path in segments]
+    manager = VideoJobManager(os.path.join(audio_dir, WAVESPEED_JOBS_NAME), base_url=WAVESPEED_BASE_URL,
+                              api_key=WAVESPEED_API_KEY, task_id=task_id, debug=debug)
+    try:
+        results = asyncio.run(render_segments(manager, audio_urls, image_url, keys, SEGMENT_MAX_PARALLEL))
+    except Exception:
+        if cache is not None:
+            for path in segments + [image_file]:
+                cache.invalidate(file_digest(path))
+            cache.save()
+        raise
+
+    video_dir = os.path.dirname(os.path.abspath(video_file))
+    parts = [os.path.join(video_dir, SEGMENTS_DIR_NAME, f"segment_{i:02d}.mp4") for i in range(len(segments))]
+    os.makedirs(os.path.dirname(parts[0]), exist_ok=True)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(lambda args: download_video_from_url(*args, debug=debug), zip([u for u, _ in results], parts)))
+    concat_mp4(parts, video_file)
+
+    wall = time.time() - begin
+    serial = sum(seconds for _, seconds in results)
+    report = {
+        "segments": [
+            {"audio": os.path.basename(path), "audio_seconds": mp3_seconds(path), "render_seconds": seconds}
+            for path, (_, seconds) in zip(segments, results)
+        ],
+        "max_parallel": SEGMENT_MAX_PARALLEL,
+        "wall_seconds": round(wall, 2),
+        "serial_render_seconds": round(serial, 2),
+        "speedup": round(serial / wall, 2) if wall else None,
+    }
+    with open(os.path.join(audio_dir, "segment_render_report.json"), 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"⏱️ Segmented render: {wall:.1f}s wall vs {serial:.1f}s rendering segments one after another "
+          f"({report['speedup']:.1f}x)")
+    return video_file
+
+
+def start_preview_render(audio_file, image_file, text_file, output_file):
+    """Render the preview video (preview_render.py) on a background thread; returns the started thread."""
+    def run():
+        try:
+            report = render_preview(audio_file, image_file, text_file, output_file)
+            print(f"🎞️ Preview video ready: {report['file']} (rendered in {report['render_seconds']:.1f}s)")
+        except Exception as e:
+            print(f"⚠️ Preview render failed: {e}")
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+def generate_video_pipeline(script_file, tts_engine="elevenlabs", debug=False, tts_mode="parallel", tts_cache=True,
+                            tts_hedge=None, audio_post=AUDIO_POST, upload_cache=True, task_id=None,
+                            segment_length=SEGMENT_SECONDS, preview=PREVIEW_VIDEO):
     """
     Main orchestration function.
     FIXED: Explicit check for tts.txt - abort if not found to save API credits
@@ -231,20 +666,28 @@ def generate_video_pipeline(script_file, tts_engine="elevenlabs", debug=False):
     output_filename = "output.mp3"
     audio_file = os.path.join(audio_dir, output_filename)
 
-    if tts_engine == "elevenlabs":
-        audio_file = generate_audio_elevenlabs(script_file, audio_file, debug=debug)
-    elif tts_engine == "edge_tts":
-        audio_file = asyncio.run(generate_audio_edge_tts(script_file, audio_file, debug=debug))
+    stream_manifest = os.path.join(audio_dir, STREAM_MANIFEST_NAME)
+    if tts_mode == "streamed" and streamed_audio_complete(audio_file):
+        # director.py --stream-tts already synthesized the narration into output.mp3
+        print(f"♻️ Using streamed audio: {audio_file}")
     else:
-        raise ValueError("Unknown TTS engine")
+        if os.path.exists(stream_manifest):
+            # output.mp3 is about to be replaced; a leftover manifest would describe the wrong audio
+            os.remove(stream_manifest)
+        if tts_mode in ("parallel", "streamed"):
+            cache = AudioCache(os.path.join(base_dir, TTS_CACHE_DIR_NAME)) if tts_cache else None
+            audio_file = generate_audio_parallel(script_file, audio_file, tts_engine, debug=debug, cache=cache,
+                                                 hedge_engine=tts_hedge)
+        elif tts_engine == "elevenlabs":
+            audio_file = generate_audio_elevenlabs(script_file, audio_file, debug=debug)
+        elif tts_engine == "edge_tts":
+            audio_file = asyncio.run(generate_audio_edge_tts(script_file, audio_file, debug=debug))
+        else:
+            raise ValueError("Unknown TTS engine")
 
     # 3. Generate Video (Only if key exists)
     if WAVESPEED_API_KEY:
         try:
-            # Upload assets
-            print("📤 Uploading assets for video generation...")
-            audio_url = upload_file_to_public_host(audio_file, debug=debug)
-            
             # Check for image file
             # Looks for image in 'face' folder relative to script or CWD
             possible_image_paths = [
@@ -263,17 +706,55 @@ def generate_video_pipeline(script_file, tts_engine="elevenlabs", debug=False):
                 print(f"⚠️ Image not found at {IMAGE_PATH}. Skipping video generation.")
                 return audio_file
 
-            image_url = upload_file_to_public_host(real_image_path, debug=debug)
+            # Local still-image preview in the background: something to watch while the avatar renders
+            preview_thread = None
+            if preview:
+                if not ffmpeg_available():
+                    print("⚠️ ffmpeg not found; no preview video")
+                else:
+                    preview_thread = start_preview_render(audio_file, real_image_path, script_file,
+                                                          os.path.join(video_dir, PREVIEW_NAME))
+
+            try:
+                render_audio = prepare_render_audio(audio_file, debug=debug) if audio_post else audio_file
+                video_filename = f"generated_video_{int(time.time())}.mp4"
+                local_video_path = os.path.join(video_dir, video_filename)
+
+                # Long narration: render segments in parallel and stitch them (needs ffmpeg)
+                if segment_length > 0:
+                    if not ffmpeg_available():
+                        print("⚠️ ffmpeg not found; rendering the narration as one job")
+                    elif generate_video_segmented(render_audio, real_image_path, segment_length, local_video_path,
+                                                  task_id=task_id, upload_cache=upload_cache, debug=debug):
+                        return local_video_path
+
+                # Signed backend URLs when run for a backend task; otherwise upload
+                # (audio and image in parallel; unchanged files reuse their URL)
+                signed = bool(task_id) and signing_configured()
+                if signed:
+                    audio_url, image_url = signed_render_assets(task_id, render_audio)
+                else:
+                    print("📤 Uploading assets for video generation...")
+                    audio_url, image_url = upload_render_assets(render_audio, real_image_path, debug=debug,
+                                                                use_cache=upload_cache)
             
-            # Generate Video
-            video_url = generate_video_wavespeed(audio_url, image_url, debug=debug)
+                # Generate Video
+                try:
+                    job_key = f"{file_digest(render_audio)}:{file_digest(real_image_path)}"
+                    video_url = generate_video_wavespeed(audio_url, image_url, debug=debug, job_key=job_key,
+                                                         task_id=task_id)
+                except Exception:
+                    if upload_cache and not signed:
+                        forget_render_assets(render_audio, real_image_path)
+                    raise
             
-            # Download Video
-            video_filename = f"generated_video_{int(time.time())}.mp4"
-            local_video_path = os.path.join(video_dir, video_filename)
-            download_video_from_url(video_url, local_video_path, debug=debug)
+                # Download Video
+                download_video_from_url(video_url, local_video_path, debug=debug)
             
-            return local_video_path
+                return local_video_path
+            finally:
+                if preview_thread:
+                    preview_thread.join()
 
         except Exception as e:
             print(f"⚠️ Video generation failed (returning audio only): {e}")
@@ -287,6 +768,24 @@ if __name__ == "__main__":
     parser.add_argument("--debug", action="store_true", help="Enable debug logging")
     parser.add_argument("--tts", default="elevenlabs", choices=["elevenlabs", "edge_tts"], help="TTS engine to use")
     parser.add_argument("--file", type=str, help="Path to specific text file", default=None)
+    parser.add_argument("--tts-mode", default="parallel", choices=["parallel", "single", "streamed"],
+                        help="parallel: per-paragraph requests joined at MP3 frame level; single: one request; "
+                             "streamed: reuse audio from director.py --stream-tts (parallel if incomplete)")
+    parser.add_argument("--tts-hedge", default=TTS_HEDGE_ENGINE, choices=["elevenlabs", "edge_tts"],
+                        help="Secondary engine raced against slow primary requests (parallel mode; needs ffmpeg)")
+    parser.add_argument("--no-audio-post", action="store_true",
+                        help="Upload the narration as synthesized (no pause trimming / loudness normalization)")
+    parser.add_argument("--task-id", default=None,
+                        help="Backend task id: tags the WaveSpeed job, and the video API fetches audio/image via "
+                             "signed backend URLs (needs PUBLIC_BASE_URL and ARTIFACT_SIGNING_KEY)")
+    parser.add_argument("--segment-seconds", type=float, default=SEGMENT_SECONDS,
+                        help="Render the avatar video in parallel segments of about this length (0 = one job)")
+    parser.add_argument("--no-preview", action="store_true",
+                        help="Do not render the local still-image preview before the avatar video")
+    parser.add_argument("--no-upload-cache", action="store_true",
+                        help="Upload the image and audio every run instead of reusing unexpired URLs")
+    parser.add_argument("--no-tts-cache", action="store_true",
+                        help="Re-synthesize every paragraph instead of reusing cached audio")
     args = parser.parse_args()
 
     # Define the specific file you want to use
@@ -318,7 +817,12 @@ if __name__ == "__main__":
 
     if target_file:
         print(f"📄 Processing file: {target_file}")
-        output = generate_video_pipeline(target_file, tts_engine=args.tts, debug=args.debug)
+        output = generate_video_pipeline(target_file, tts_engine=args.tts, debug=args.debug, tts_mode=args.tts_mode,
+                                         tts_cache=not args.no_tts_cache, tts_hedge=args.tts_hedge,
+                                         audio_post=AUDIO_POST and not args.no_audio_post,
+                                         upload_cache=not args.no_upload_cache, task_id=args.task_id,
+                                         segment_length=args.segment_seconds,
+                                         preview=PREVIEW_VIDEO and not args.no_preview)
         print(f"🎉 Final Output: {output}")
     else:
         print(f"❌ Error: Could not find input file: '{specific_filename}'")
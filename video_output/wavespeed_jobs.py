@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Asyncio job manager for WaveSpeed avatar renders.
+
+Every prediction is tracked on one event loop, so many renders can be
+submitted and awaited concurrently without a blocked thread each:
+
+- polling adapts to the job: the interval grows with elapsed time (a render
+  takes minutes, early polls are wasted) and is doubled while WaveSpeed
+  reports the job as queued, bounded by POLL_MIN/POLL_MAX seconds; 429
+  responses back off through the shared provider limiter;
+- if WAVESPEED_WEBHOOK_URL is set (and ARTIFACT_SIGNING_KEY, which signs
+  it) it is passed on submit with a per-job token and HMAC signature
+  (kestra/signed_urls.py); the backend's webhook endpoint verifies them and
+  drops the result into generated_tts/wavespeed_events/;
+  the manager checks that local file every second and only polls the API
+  as a slow safety net;
+- every job has a deadline (WAVESPEED_JOB_DEADLINE_SECONDS);
+- request ids are persisted in generated_tts/wavespeed_jobs.json with a key
+  for the render inputs, so a rerun with the same inputs resumes the
+  running prediction instead of paying for a new one, and the backend
+  resumes orphaned jobs after a restart.
+
+Usage:
+    manager = VideoJobManager("generated_tts/wavespeed_jobs.json")
+    video_url = asyncio.run(manager.render(audio_url, image_url, key=digest))
+
+    python3 wavespeed_jobs.py --list
+    python3 wavespeed_jobs.py --resume
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+from urllib.parse import urlencode
+
+import requests
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "kestra"))
+from file_lock import load_json, locked, write_json_atomic
+from provider_limits import get_limiter
+
+load_dotenv()
+
+# Webhook signatures (reads ARTIFACT_SIGNING_KEY from the environment loaded above)
+from signed_urls import ARTIFACT_SIGNING_KEY, signed_params
+
+WAVESPEED_API_KEY = os.environ.get("WAVESPEED_API_KEY")
+WAVESPEED_BASE_URL = os.environ.get("WAVESPEED_BASE_URL", "https://api.wavespeed.ai").rstrip("/")
+WAVESPEED_MODEL = "wavespeed-ai/hunyuan-avatar"
+WAVESPEED_WEBHOOK_URL = os.environ.get("WAVESPEED_WEBHOOK_URL")  # e.g. {PUBLIC_BASE_URL}/webhooks/wavespeed
+JOB_DEADLINE_SECONDS = float(os.environ.get("WAVESPEED_JOB_DEADLINE_SECONDS", "1800"))
+POLL_MIN_SECONDS = float(os.environ.get("WAVESPEED_POLL_MIN_SECONDS", "2"))
+POLL_MAX_SECONDS = float(os.environ.get("WAVESPEED_POLL_MAX_SECONDS", "20"))
+WEBHOOK_POLL_SECONDS = 60.0  # API poll interval when a webhook is expected
+EVENT_CHECK_SECONDS = 1.0
+WEBHOOK_SIGNED_PATH = "wavespeed-webhook/{token}"  # what the callback's signature covers
+QUEUED_STATUSES = ("created", "queued", "pending")
+FINAL_STATUSES = ("completed", "failed", "timed_out")
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+JOB_STORE = os.path.join(BASE_DIR, "generated_tts", "wavespeed_jobs.json")
+EVENTS_DIR_NAME = "wavespeed_events"
+
+
+class VideoJobError(Exception):
+    pass
+
+
+def poll_interval(elapsed, status, webhook=False):
+    """Seconds until the next poll: ~10% of the elapsed time, doubled while queued, within min/max."""
+    if webhook:
+        return WEBHOOK_POLL_SECONDS
+    interval = max(POLL_MIN_SECONDS, min(POLL_MAX_SECONDS, elapsed / 10))
+    if status in QUEUED_STATUSES:
+        interval = min(POLL_MAX_SECONDS, interval * 2)
+    return interval
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except (OSError, TypeError):
+        return False
+    return True
+
+
+def record_webhook_event(store_path, payload):
+    """Persist a webhook delivery for the manager that owns the job (called by the backend)."""
+    data = payload.get("data", payload)
+    request_id = data.get("id")
+    if not request_id or "/" in request_id or request_id.startswith("."):
+        raise ValueError("Webhook payload without a valid prediction id")
+    events_dir = os.path.join(os.path.dirname(os.path.abspath(store_path)), EVENTS_DIR_NAME)
+    os.makedirs(events_dir, exist_ok=True)
+    path = os.path.join(events_dir, f"{request_id}.json")
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(path + ".tmp", path)
+    return request_id
+
+
+class VideoJobManager:
+    """Submit, persist and await WaveSpeed predictions on one event loop."""
+
+    def __init__(self, store_path=JOB_STORE, base_url=WAVESPEED_BASE_URL, api_key=WAVESPEED_API_KEY,
+                 webhook_url=WAVESPEED_WEBHOOK_URL, deadline=JOB_DEADLINE_SECONDS, signing_key=ARTIFACT_SIGNING_KEY,
+                 task_id=None, debug=False):
+        self.store_path = store_path
+        self.events_dir = os.path.join(os.path.dirname(os.path.abspath(store_path)), EVENTS_DIR_NAME)
+        self.base_url = base_url
+        self.api_key = api_key
+        self.signing_key = signing_key
+        if webhook_url and not signing_key:
+            # The backend rejects unsigned callbacks, so they would never arrive
+            print("⚠️ WAVESPEED_WEBHOOK_URL ignored: ARTIFACT_SIGNING_KEY is needed to sign it; polling instead")
+            webhook_url = None
+        self.webhook_url = webhook_url
+        self.deadline = deadline
+        self.task_id = task_id  # backend task the jobs belong to (reported again when they are resumed)
+        self.debug = debug
+        self.jobs = load_json(store_path)
+
+    # ------------------------------------------------------------------ #
+    # Public API
+    # ------------------------------------------------------------------ #
+    async def render(self, audio_url, image_url, key=None):
+        """Video URL for these inputs: resumes a running job with the same key, otherwise submits one."""
+        request_id = self.find(key) if key else None
+        if request_id:
+            print(f"♻️ Resuming WaveSpeed job {request_id}")
+        else:
+            request_id = await self.submit(audio_url, image_url, key)
+        return await self.wait(request_id)
+
+    async def submit(self, audio_url, image_url, key=None, resolution="480p"):
+        url = f"{self.base_url}/api/v3/{WAVESPEED_MODEL}"
+        token = uuid.uuid4().hex if self.webhook_url else None
+        params = {"webhook": self._signed_webhook(token)} if token else None
+        payload = {"audio": audio_url, "image": image_url, "resolution": resolution}
+        response = await self._request("POST", url, params=params, json=payload,
+                                       headers={"Authorization": f"Bearer {self.api_key}"})
+        if response.status_code != 200:
+            raise VideoJobError(f"WaveSpeed request failed (status {response.status_code}): {response.text}")
+        request_id = response.json().get("data", {}).get("id")
+        if not request_id:
+            raise VideoJobError(f"No Request ID returned. Response: {response.text}")
+        now = time.time()
+        self._update(request_id, key=key, status="created", submitted_at=now, deadline_at=now + self.deadline,
+                     webhook=bool(token), webhook_token=token, task_id=self.task_id, pid=os.getpid(), polls=0,
+                     outputs=[], error=None)
+        print(f"Task submitted successfully. Request ID: {request_id}")
+        return request_id
+
+    async def wait(self, request_id):
+        """Poll (or take the webhook result) until the job finishes; returns the first output URL."""
+        job = self.jobs[request_id]
+        self._update(request_id, pid=os.getpid())
+        next_poll = 0.0
+        while True:
+            now = time.time()
+            event = self._read_event(request_id)
+            if event is None and now >= next_poll:
+                event = await self._poll(request_id)
+                elapsed = time.time() - job["submitted_at"]
+                next_poll = time.time() + poll_interval(elapsed, event.get("status"), job.get("webhook"))
+            if event is not None:
+                result = self._finish(request_id, event)
+                if result is not None:
+                    return result
+            remaining = job["deadline_at"] - time.time()
+            if remaining <= 0:
+                self._update(request_id, status="timed_out", error="deadline exceeded")
+                raise VideoJobError(f"WaveSpeed job {request_id} exceeded its deadline")
+            delay = next_poll - time.time()
+            if job.get("webhook"):
+                delay = min(delay, EVENT_CHECK_SECONDS)
+            await asyncio.sleep(max(0.0, min(delay, remaining)))
+
+    async def wait_all(self, request_ids):
+        """Await several jobs concurrently; returns {request_id: url or exception}."""
+        results = await asyncio.gather(*(self.wait(r) for r in request_ids), return_exceptions=True)
+        return dict(zip(request_ids, results))
+
+    def find(self, key):
+        """Unfinished, unexpired job for this input key (not owned by another live process)."""
+        for request_id, job in self.jobs.items():
+            if job.get("key") == key and job["status"] not in FINAL_STATUSES and job["deadline_at"] > time.time():
+                if job.get("pid") == os.getpid() or not _pid_alive(job.get("pid")):
+                    return request_id
+        return None
+
+    def orphaned(self):
+        """Unfinished jobs whose owning process is gone (e.g. after a backend restart)."""
+        return [request_id for request_id, job in self.jobs.items()
+                if job["status"] not in FINAL_STATUSES and not _pid_alive(job.get("pid"))]
+
+    # ------------------------------------------------------------------ #
+    # Internals
+    # ------------------------------------------------------------------ #
+    def _signed_webhook(self, token):
+        """Callback URL carrying this job's token and an HMAC signature valid past its deadline."""
+        query = {"token": token, **signed_params(WEBHOOK_SIGNED_PATH.format(token=token), self.deadline + 300,
+                                                 self.signing_key)}
+        separator = "&" if "?" in self.webhook_url else "?"
+        return f"{self.webhook_url}{separator}{urlencode(query)}"
+
+    async def _request(self, method, url, **kwargs):
+        limiter = get_limiter("wavespeed")
+        await limiter.acquire_async()
+        try:
+            response = await asyncio.to_thread(requests.request, method, url, timeout=30, **kwargs)
+        except requests.RequestException:
+            limiter.record_failure()
+            raise
+        limiter.observe(response)
+        return response
+
+    async def _poll(self, request_id):
+        url = f"{self.base_url}/api/v3/predictions/{request_id}/result"
+        response = await self._request("GET", url, headers={"Authorization": f"Bearer {self.api_key}"})
+        self._update(request_id, polls=self.jobs[request_id].get("polls", 0) + 1)
+        if response.status_code == 429:
+            return {"status": self.jobs[request_id]["status"]}
+        if response.status_code != 200:
+            raise VideoJobError(f"Poll failed (status {response.status_code}): {response.text}")
+        result = response.json().get("data", {})
+        if self.debug:
+            print(f"⏳ Job {request_id}: {result.get('status')}")
+        return result
+
+    def _read_event(self, request_id):
+        path = os.path.join(self.events_dir, f"{request_id}.json")
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                event = json.load(f)
+        except (OSError, ValueError):
+            return None
+        os.remove(path)
+        print(f"📬 Webhook result for job {request_id}: {event.get('status')}")
+        return event
+
+    def _finish(self, request_id, result):
+        """Record a status update; returns the video URL when completed, raises when failed."""
+        status = result.get("status") or self.jobs[request_id]["status"]
+        if status == "completed":
+            outputs = result.get("outputs") or []
+            if not outputs:
+                self._update(request_id, status="failed", error="no output video")
+                raise VideoJobError("Completed but no output video found.")
+            job = self._update(request_id, status="completed", outputs=outputs, completed_at=time.time())
+            print(f"Task completed in {job['completed_at'] - job['submitted_at']:.1f} seconds "
+                  f"({job.get('polls', 0)} polls).")
+            return outputs[0]
+        if status == "failed":
+            self._update(request_id, status="failed", error=result.get("error") or "Generation failed")
+            raise VideoJobError(result.get("error") or "Generation failed")
+        self._update(request_id, status=status)
+        return None
+
+    def _update(self, request_id, **fields):
+        """Apply `fields` to one job in the store; other managers (backend, video_gen runs) share the file."""
+        with locked(self.store_path):
+            self.jobs = load_json(self.store_path)
+            job = self.jobs.setdefault(request_id, {"id": request_id})
+            job.update(fields)
+            write_json_atomic(self.store_path, self.jobs)
+            return job
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List or resume persisted WaveSpeed jobs")
+    parser.add_argument("--store", default=JOB_STORE)
+    parser.add_argument("--list", action="store_true", help="Show persisted jobs")
+    parser.add_argument("--resume", action="store_true", help="Await every orphaned unfinished job")
+    args = parser.parse_args()
+
+    manager = VideoJobManager(args.store)
+    if args.resume:
+        pending = manager.orphaned()
+        if not pending:
+            print("No unfinished jobs")
+            return 0
+        for request_id, result in asyncio.run(manager.wait_all(pending)).items():
+            mark = "❌" if isinstance(result, Exception) else "✅"
+            print(f"{mark} {request_id}: {result}")
+        return 0
+    for request_id, job in manager.jobs.items():
+        age = time.time() - job.get("submitted_at", time.time())
+        print(f"{request_id}: {job['status']} ({age / 60:.0f} min ago, {job.get('polls', 0)} polls) "
+              f"{(job.get('outputs') or [''])[0]}{job.get('error') or ''}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,66 +1,31 @@
 
+import asyncio
 import os
 import requests
-import json
-import time
 
 from dotenv import load_dotenv
 
 load_dotenv()
 
+from wavespeed_jobs import VideoJobError, VideoJobManager
+
 
 def main():
     print("Hello from WaveSpeedAI!")
     API_KEY = os.getenv("WAVESPEED_API_KEY")
     print(f"API_KEY: {API_KEY}")
 
-    url = "https://api.wavespeed.ai/api/v3/wavespeed-ai/hunyuan-avatar"
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {API_KEY}",
-    }
-    payload = {
-        "resolution": "480p",
-        "audio": "https://drive.google.com/file/d/1f2ipgW-Q20FOowIAUcySgDslGQmCEj2J/view?usp=sharing",
-        "image": "https://drive.google.com/file/d/1UxhZ4Jfahk4nMolY7BFUm86B3TThXUN1/view?usp=sharing"
-    }
+    audio = "https://drive.google.com/file/d/1f2ipgW-Q20FOowIAUcySgDslGQmCEj2J/view?usp=sharing"
+    image = "https://drive.google.com/file/d/1UxhZ4Jfahk4nMolY7BFUm86B3TThXUN1/view?usp=sharing"
 
-    begin = time.time()
-    response = requests.post(url, headers=headers, data=json.dumps(payload))
-    if response.status_code == 200:
-        result = response.json()["data"]
-        request_id = result["id"]
-        print(f"Task submitted successfully. Request ID: {request_id}")
-    else:
-        print(f"Error: {response.status_code}, {response.text}")
+    # Submit and poll with adaptive backoff (see wavespeed_jobs.py) instead of a 0.1s loop
+    manager = VideoJobManager(api_key=API_KEY, debug=True)
+    try:
+        url = asyncio.run(manager.render(audio, image))
+    except (VideoJobError, requests.RequestException) as e:
+        print(f"Task failed: {e}")
         return
-
-    url = f"https://api.wavespeed.ai/api/v3/predictions/{request_id}/result"
-    headers = {"Authorization": f"Bearer {API_KEY}"}
-
-    # Poll for results
-    while True:
-        response = requests.get(url, headers=headers)
-        if response.status_code == 200:
-            result = response.json()["data"]
-            status = result["status"]
-
-            if status == "completed":
-                end = time.time()
-                print(f"Task completed in {end - begin} seconds.")
-                url = result["outputs"][0]
-                print(f"Task completed. URL: {url}")
-                break
-            elif status == "failed":
-                print(f"Task failed: {result.get('error')}")
-                break
-            else:
-                print(f"Task still processing. Status: {status}")
-        else:
-            print(f"Error: {response.status_code}, {response.text}")
-            break
-
-        time.sleep(0.1)
+    print(f"Task completed. URL: {url}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the WaveSpeed avatar API, for checking how render inputs are delivered.
+
+Implements the two endpoints video_gen.py uses:
+    POST /api/v3/wavespeed-ai/hunyuan-avatar   fetches the "audio" and "image" URLs like WaveSpeed would
+                                               (?webhook=URL: the result is POSTed there when done)
+    GET  /api/v3/predictions/{id}/result       "processing" for --render-seconds, then "completed" with a
+                                               placeholder video if both fetches worked, "failed" otherwise
+plus GET/HEAD /videos/{id}.mp4 (the placeholder; --video-mb makes it that large, served with byte ranges,
+an MD5 ETag and --throttle-mbps per connection, for download benchmarks) and GET /fetches (every input
+fetch and the poll count per job).
+
+Usage:
+    python3 wavespeed_standin.py --port 8090
+    WAVESPEED_BASE_URL=http://localhost:8090 WAVESPEED_API_KEY=test python3 video_gen.py --task-id <id>
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import requests
+
+PLACEHOLDER_VIDEO = b"\x00\x00\x00\x18ftypmp42\x00\x00\x00\x00mp42isom"
+RENDER_SECONDS = 3.0
+THROTTLE_BYTES_PER_SECOND = None  # per connection
+VIDEO = PLACEHOLDER_VIDEO
+VIDEO_ETAG = f'"{hashlib.md5(VIDEO).hexdigest()}"'
+
+jobs = {}
+fetches = []
+polls = {}
+
+
+def fetch(url):
+    """GET a render input; returns the fetch record."""
+    record = {"url": url, "status": None, "bytes": 0, "content_type": None, "error": None}
+    try:
+        response = requests.get(url, timeout=30)
+        record.update(status=response.status_code, bytes=len(response.content),
+                      content_type=response.headers.get("content-type"))
+        if response.status_code != 200 or not response.content:
+            record["error"] = f"HTTP {response.status_code}"
+    except requests.RequestException as e:
+        record["error"] = str(e)
+    fetches.append(record)
+    mark = "✅" if not record["error"] else "❌"
+    print(f"{mark} fetched {url.split('?')[0]}: {record['status']} ({record['bytes']} bytes)")
+    return record
+
+
+def job_result(request_id, host):
+    job = jobs[request_id]
+    if time.time() - job["created_at"] < RENDER_SECONDS:
+        return {"id": request_id, "status": "processing"}
+    if job["errors"]:
+        return {"id": request_id, "status": "failed", "error": "; ".join(job["errors"])}
+    return {"id": request_id, "status": "completed", "outputs": [f"http://{host}/videos/{request_id}.mp4"]}
+
+
+def deliver_webhook(request_id, url, host):
+    try:
+        response = requests.post(url, json={"data": job_result(request_id, host)}, timeout=10)
+        print(f"📬 webhook for {request_id}: {response.status_code}")
+    except requests.RequestException as e:
+        print(f"❌ webhook for {request_id} failed: {e}")
+
+
+class Handler(BaseHTTPRequestHandler):
+    def _json(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        path, _, query = self.path.partition("?")
+        if path != "/api/v3/wavespeed-ai/hunyuan-avatar":
+            return self._json(404, {"error": "not found"})
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        request_id = uuid.uuid4().hex
+        errors = [r["error"] for r in (fetch(payload.get("audio", "")), fetch(payload.get("image", ""))) if r["error"]]
+        jobs[request_id] = {"errors": errors, "created_at": time.time()}
+        webhook = parse_qs(query).get("webhook")
+        if webhook:
+            timer = threading.Timer(RENDER_SECONDS, deliver_webhook,
+                                    (request_id, webhook[0], self.headers.get("Host", "localhost")))
+            timer.daemon = True
+            timer.start()
+        self._json(200, {"data": {"id": request_id, "status": "created"}})
+
+    def do_GET(self):
+        if self.path == "/fetches":
+            return self._json(200, {"fetches": fetches, "polls": polls})
+        if self.path.startswith("/api/v3/predictions/") and self.path.endswith("/result"):
+            request_id = self.path.split("/")[4]
+            if request_id not in jobs:
+                return self._json(404, {"error": "unknown request"})
+            polls[request_id] = polls.get(request_id, 0) + 1
+            return self._json(200, {"data": job_result(request_id, self.headers.get("Host", "localhost"))})
+        if self.path.startswith("/videos/"):
+            return self._video()
+        self._json(404, {"error": "not found"})
+
+    def do_HEAD(self):
+        if self.path.startswith("/videos/"):
+            return self._video(body=False)
+        self.send_response(404)
+        self.end_headers()
+
+    def _video(self, body=True):
+        """Serve VIDEO honouring Range/If-Range, throttled per connection."""
+        start, end = 0, len(VIDEO) - 1
+        match = re.fullmatch(r"bytes=(\d*)-(\d*)", self.headers.get("Range", ""))
+        if_range = self.headers.get("If-Range")
+        partial = bool(match) and (not if_range or if_range == VIDEO_ETAG)
+        if partial:
+            first, last = match.groups()
+            if first:
+                start, end = int(first), min(end, int(last)) if last else end
+            else:
+                start = max(0, len(VIDEO) - int(last))
+        self.send_response(206 if partial else 200)
+        self.send_header("Content-Type", "video/mp4")
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", VIDEO_ETAG)
+        self.send_header("Content-Length", str(end - start + 1))
+        if partial:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(VIDEO)}")
+        self.end_headers()
+        if not body:
+            return
+        block = 64 * 1024
+        for offset in range(start, end + 1, block):
+            self.wfile.write(VIDEO[offset:min(end + 1, offset + block)])
+            if THROTTLE_BYTES_PER_SECOND:
+                time.sleep(block / THROTTLE_BYTES_PER_SECOND)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    global RENDER_SECONDS, THROTTLE_BYTES_PER_SECOND, VIDEO, VIDEO_ETAG
+    parser = argparse.ArgumentParser(description="Local stand-in for the WaveSpeed avatar API")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--render-seconds", type=float, default=RENDER_SECONDS,
+                        help="How long each job reports 'processing'")
+    parser.add_argument("--video-mb", type=float, default=0, help="Size of the served video (default: tiny)")
+    parser.add_argument("--throttle-mbps", type=float, default=0, help="Per-connection download limit, MB/s")
+    args = parser.parse_args()
+
+    RENDER_SECONDS = args.render_seconds
+    if args.video_mb:
+        VIDEO = random.Random(0).randbytes(int(args.video_mb * 1e6))
+        VIDEO_ETAG = f'"{hashlib.md5(VIDEO).hexdigest()}"'
+    if args.throttle_mbps:
+        THROTTLE_BYTES_PER_SECOND = args.throttle_mbps * 1e6
+    print(f"🎭 WaveSpeed stand-in on http://localhost:{args.port}")
+    ThreadingHTTPServer(("", args.port), Handler).serve_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())